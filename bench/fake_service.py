@@ -0,0 +1,194 @@
+# Fake session/service/frontend objects that replay recorded getAll(True) dicts.
+import json
+import os
+
+from enigma import eServiceReference, iFrontendInformation, iServiceInformation
+
+from fixtures import lamedbEntries
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SERVICE_INFO = {
+    iServiceInformation.sSID: 0x283D,
+    iServiceInformation.sTSID: 0x03FB,
+    iServiceInformation.sONID: 0x0001,
+    iServiceInformation.sNamespace: 0x00C00000,
+    iServiceInformation.sVideoPID: 0x1401,
+    iServiceInformation.sAudioPID: 0x1402,
+    iServiceInformation.sPCRPID: 0x1401,
+    iServiceInformation.sPMTPID: 0x0064,
+    iServiceInformation.sTXTPID: 0x1404,
+    iServiceInformation.sIsCrypted: 1,
+}
+FRONTEND_INFO = {
+    iFrontendInformation.bitErrorRate: "tuner_bit_error_rate",
+    iFrontendInformation.signalPower: "tuner_signal_power",
+    iFrontendInformation.signalQuality: "tuner_signal_quality",
+    iFrontendInformation.signalQualitydB: "tuner_signal_quality_db",
+    iFrontendInformation.lockState: "tuner_locked",
+}
+SERVICE_CAIDS = [0x0D95, 0x1830, 0x0963, 0x0500, 0x098C, 0x09C4, 0x1702, 0x4AEE]
+
+
+def loadFrontendSamples():
+    with open(os.path.join(FIXTURES, "frontend.json")) as f:
+        return json.load(f)
+
+
+class FakeFrontendInfo(object):
+    def __init__(self, service):
+        self.service = service
+
+    def getAll(self, original):
+        self.service.calls += 1
+        return dict(self.service.current())
+
+    def getFrontendStatus(self):
+        self.service.calls += 1
+        return dict((k, v) for k, v in self.service.current().items() if k.startswith("tuner_"))
+
+    def getFrontendInfo(self, what):
+        self.service.calls += 1
+        key = FRONTEND_INFO.get(what)
+        return self.service.current().get(key, 0) if key else 0
+
+    def getFrontendData(self):
+        return self.getFrontendStatus()
+
+    def getTransponderData(self, original):
+        self.service.calls += 1
+        # enigma2 keeps tuner_type in the transponder data, the rest of tuner_* is status
+        return dict((k, v) for k, v in self.service.current().items() if not k.startswith("tuner_") or k == "tuner_type")
+
+
+class FakeServiceInfo(object):
+    def __init__(self, service):
+        self.service = service
+
+    def getName(self):
+        self.service.calls += 1
+        return "Das Erste HD"
+
+    def getInfoString(self, what):
+        self.service.calls += 1
+        return "ARD"
+
+    def getInfo(self, what):
+        self.service.calls += 1
+        return SERVICE_INFO.get(what, -1)
+
+    def getInfoObject(self, what):
+        self.service.calls += 1
+        if what == iServiceInformation.sCAIDs:
+            return list(SERVICE_CAIDS)
+        return None
+
+
+class FakeService(object):
+    def __init__(self, samples):
+        self.samples = samples
+        self.index = 0
+        self.calls = 0
+
+    def current(self):
+        return self.samples[self.index % len(self.samples)]
+
+    def advance(self):
+        self.index += 1
+
+    def info(self):
+        self.calls += 1
+        return FakeServiceInfo(self)
+
+    def frontendInfo(self):
+        self.calls += 1
+        return FakeFrontendInfo(self)
+
+    def stream(self):
+        # No demux to tap off-box
+        return None
+
+
+class FakeNavigation(object):
+    def __init__(self, service):
+        self.service = service
+        self.event = []
+
+    def getCurrentService(self):
+        self.service.calls += 1
+        return self.service
+
+    def getCurrentlyPlayingServiceReference(self):
+        return PLAYING_REF
+
+
+class FakeSession(object):
+    def __init__(self, samples=None):
+        self.service = FakeService(samples or loadFrontendSamples())
+        self.nav = FakeNavigation(self.service)
+        self.dialogs = []
+
+    def open(self, screen, *args, **kwargs):
+        dialog = screen(self, *args, **kwargs)
+        self.dialogs.append(dialog)
+        return dialog
+
+
+class FakeServiceRef(eServiceReference):
+    # A DVB service reference: data = (type, sid, tsid, onid, namespace)
+    def __init__(self, data, name, flags=0):
+        self.args = ()
+        self.type = self.idDVB
+        self.flags = flags
+        self.data = data
+        self.name = name
+
+    def getUnsignedData(self, index):
+        return self.data[index]
+
+    def toString(self):
+        return "1:%d:1:%X:%X:%X:%X:0:0:0:" % self.data
+
+
+_INVALID = eServiceReference()
+PLAYING_REF = FakeServiceRef((1, 0x283D, 0x03FB, 0x0001, 0x00C00000), "Das Erste HD")
+
+
+class FakeServiceList(object):
+    def __init__(self, refs):
+        self.refs = refs
+
+    def getNext(self):
+        return next(self.refs, _INVALID)
+
+
+class FakeStaticInfo(object):
+    # No sTransponderData, so the report falls back to the lamedb transponder line
+    def getName(self, ref):
+        return ref.name
+
+    def getInfoObject(self, ref, what):
+        return None
+
+
+class FakeServiceCenter(object):
+    # Every bouquet holds the first `size` lamedb fixture services, with a
+    # marker every 100 entries; references are generated lazily like getNext()
+    def __init__(self, size=5000):
+        self.size = size
+        self.static_info = FakeStaticInfo()
+
+    def bouquetRefs(self):
+        count = 0
+        for (namespace, tsid, onid, frequency, pol), group in lamedbEntries(self.size):
+            for sid, service_type, name, provider, caids in group:
+                if count % 100 == 0:
+                    yield FakeServiceRef((0, 0, 0, 0, 0), f"--- {count} ---", eServiceReference.isMarker)
+                yield FakeServiceRef((service_type, sid, tsid, onid, namespace), name)
+                count += 1
+
+    def list(self, ref):
+        return FakeServiceList(self.bouquetRefs())
+
+    def info(self, ref):
+        return self.static_info
@@ -0,0 +1,203 @@
+# Synthetic, realistically sized satellites.xml and ecm.info fixtures.
+import os
+import struct
+
+ECM_INFO = """caid: 0x098D
+pid: 0x1771
+prov: 0x000000
+chid: 0x0000
+reader: sky_de
+from: 192.168.1.10
+protocol: newcamd525
+hops: 1
+ecm time: 0.231
+"""
+
+
+def writeSatellitesXml(path, satellites=120, transponders=150):
+    # ~120 positions x 150 transponders is about the size of a full
+    # satellites.xml from a settings package (several MB, ~18k transponders)
+    step = 3600 // satellites
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<satellites>\n')
+        for n in range(satellites):
+            position = -1800 + n * step
+            if n == satellites // 2:
+                position = 192
+            f.write(f'\t<sat name="{abs(position) / 10.0:.1f}{"W" if position < 0 else "E"} Test Satellite {n}" flags="1" position="{position}">\n')
+            for t in range(transponders):
+                frequency = 10700000 + t * 12500
+                f.write(f'\t\t<transponder frequency="{frequency}" symbol_rate="{(22000, 27500, 30000)[t % 3]}000" '
+                        f'polarization="{t % 2}" fec_inner="{1 + t % 9}" system="{t % 2}" modulation="{1 + t % 2}" />\n')
+            if position == 192:
+                # The fake service's transponder, with an outdated FEC as settings lists often have
+                f.write('\t\t<transponder frequency="11494000" symbol_rate="22000000" polarization="0" fec_inner="3" '
+                        'system="1" modulation="2" pls_mode="0" pls_code="1" />\n')
+            f.write('\t</sat>\n')
+        f.write('</satellites>\n')
+
+
+def writeEcmInfo(path):
+    with open(path, "w") as f:
+        f.write(ECM_INFO)
+
+
+def lamedbEntries(services=20000, per_transponder=12):
+    # Yields (transponder, [services]) with the fake current service (SID 0x283D
+    # on TSID 0x03FB/ONID 0x0001, namespace 0x00C00000) in the first group and a
+    # DVB-T multiplex (namespace 0xEEEE0000, frequency in Hz) in the second
+    for t in range(0, services, per_transponder):
+        namespace, tsid, onid = (0x00C00000, 0x03FB, 0x0001) if t == 0 else (0x00C00000 + (t % 97) * 0x10000, 0x1000 + t, 0x0001 + t % 7)
+        frequency = 10700000 + (t % 1600) * 1250
+        if t == per_transponder:
+            namespace, frequency = TERRESTRIAL_NAMESPACE, 586000000
+        transponder = (namespace, tsid, onid, frequency, (t // 12) % 2)
+        group = []
+        for n in range(per_transponder):
+            sid = 0x283D if t == 0 and n == 0 else 0x100 + n
+            caids = ("0d95", "1830") if n % 3 else ()
+            group.append((sid, (1, 25, 2)[n % 3], f"Service {t + n}", "Provider", caids))
+        yield transponder, group
+
+
+TERRESTRIAL_NAMESPACE = 0xEEEE0000
+
+
+def transponderParams(namespace, frequency, pol):
+    if namespace == TERRESTRIAL_NAMESPACE:
+        # frequency:bandwidth:code_rate_hp:code_rate_lp:constellation:transmission_mode:guard:hierarchy:inversion:flags:system:plp_id
+        return f"t {frequency}:8000000:2:0:4:5:6:0:2:0:1:0"
+    return f"s {frequency}:27500000:{pol}:3:192:2:0:1:2:0:2"
+
+
+def writeLamedb(path, services=20000):
+    with open(path, "w") as f:
+        f.write("eDVB services /4/\ntransponders\n")
+        for (namespace, tsid, onid, frequency, pol), group in lamedbEntries(services):
+            f.write(f"{namespace:08x}:{tsid:04x}:{onid:04x}\n")
+            f.write(f"\t{transponderParams(namespace, frequency, pol)}\n/\n")
+        f.write("end\nservices\n")
+        for (namespace, tsid, onid, frequency, pol), group in lamedbEntries(services):
+            for sid, service_type, name, provider, caids in group:
+                f.write(f"{sid:04x}:{namespace:08x}:{tsid:04x}:{onid:04x}:{service_type}:0:0\n{name}\n")
+                f.write(",".join([f"p:{provider}", "c:001401"] + [f"C:{caid}" for caid in caids]) + "\n")
+        f.write("end\nHave a lot of bugs!\n")
+
+
+def writeLamedb5(path, services=20000):
+    with open(path, "w") as f:
+        f.write("eDVB services /5/\n")
+        for (namespace, tsid, onid, frequency, pol), group in lamedbEntries(services):
+            f.write(f"t:{namespace:08x}:{tsid:04x}:{onid:04x},{transponderParams(namespace, frequency, pol).replace(' ', ':', 1)}\n")
+        for (namespace, tsid, onid, frequency, pol), group in lamedbEntries(services):
+            for sid, service_type, name, provider, caids in group:
+                data = ",".join([f"p:{provider}", "c:001401"] + [f"C:{caid}" for caid in caids])
+                f.write(f's:{sid:04x}:{namespace:08x}:{tsid:04x}:{onid:04x}:{service_type}:0:0,"{name}",{data}\n')
+
+
+# Constant-rate mux written by writeTransportStream: (pid, packets per 100) slots,
+# null packets pad up to the mux rate
+TS_SCHEDULE = ((0x1401, 60), (0x1402, 4), (0x1404, 1), (0x0064, 1), (0x0000, 1), (0x0011, 1), (0x0010, 1), (0x1FFF, 31))
+TS_BITRATE = 62000000
+TS_PCR_PID = 0x1401
+# Dropped video packets (CC errors) and corrupted ones (TEI), by packet index
+TS_CC_GAPS = (10001, 30001, 50001)
+TS_TEI = (20001,)
+
+
+def mpegCrc32(data):
+    # Bitwise on purpose, independent of the plugin's table-driven version
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) & 0xFFFFFFFF if crc & 0x80000000 else (crc << 1) & 0xFFFFFFFF
+    return crc
+
+
+def section(table_id, extension, version, body):
+    length = 5 + len(body) + 4
+    data = bytes((table_id, 0xB0 | length >> 8, length & 0xFF, extension >> 8, extension & 0xFF,
+        0xC1 | version << 1, 0, 0)) + body
+    return data + struct.pack(">I", mpegCrc32(data))
+
+
+def descriptor(tag, body):
+    return bytes((tag, len(body))) + body
+
+
+def caDescriptor(caid, ecm_pid, private=b""):
+    return descriptor(0x09, struct.pack(">HH", caid, 0xE000 | ecm_pid) + private)
+
+
+def psiSections(version):
+    # PAT/PMT/SDT/NIT of the fake current service (SID 0x283D, TSID 0x03FB, ONID 0x0001);
+    # PMT version 2 moves the Videoguard ECM PID
+    program_info = (caDescriptor(0x0500, 0x1771, descriptor(0x14, b"\x03\x28\x30"))
+        + caDescriptor(0x1830, 0x1772, b"\x00\x01\x01")
+        + caDescriptor(0x098D, 0x1773 if version == 1 else 0x1775))
+    streams = (struct.pack(">BHH", 0x1B, 0xE000 | 0x1401, 0xF000 | 6) + caDescriptor(0x0D95, 0x1774)
+        + struct.pack(">BHH", 0x04, 0xE000 | 0x1402, 0xF000 | 6) + descriptor(0x0A, b"deu\x00")
+        + struct.pack(">BHH", 0x06, 0xE000 | 0x1404, 0xF000 | 7) + descriptor(0x56, b"deu\x09\x00"))
+    pmt = struct.pack(">HH", 0xE000 | 0x1401, 0xF000 | len(program_info)) + program_info + streams
+    service = descriptor(0x48, b"\x19\x03ARD\x0cDas Erste HD")
+    sdt = struct.pack(">HBHBH", 0x0001, 0xFF, 0x283D, 0xFC, 0x8000 | len(service)) + service
+    delivery = descriptor(0x43, bytes((0x01, 0x14, 0x93, 0x75, 0x01, 0x92, 0x86, 0x02, 0x20, 0x00, 0x02)))
+    network = descriptor(0x40, b"ASTRA 19.2E")
+    transport = struct.pack(">HHH", 0x03FB, 0x0001, 0xF000 | len(delivery)) + delivery
+    nit = (struct.pack(">H", 0xF000 | len(network)) + network
+        + struct.pack(">H", 0xF000 | len(transport)) + transport)
+    return {
+        0x0000: section(0x00, 0x03FB, 1, struct.pack(">HHHH", 0x0000, 0xE000 | 0x0010, 0x283D, 0xE000 | 0x0064)),
+        0x0064: section(0x02, 0x283D, version, pmt),
+        0x0011: section(0x42, 0x03FB, 1, sdt),
+        0x0010: section(0x40, 0x0001, 1, nit),
+    }
+
+
+def writeTransportStream(path, seconds=2.0, bitrate=TS_BITRATE):
+    # PCR every ~30 ms on the video PID, exact for the packet's position at `bitrate`;
+    # each PSI/SI slot repeats its table, one section per packet
+    slots = [pid for pid, share in TS_SCHEDULE for _ in range(share)]
+    count = int(bitrate * seconds / (188 * 8))
+    pcr_every = int(0.03 * bitrate / (188 * 8))
+    next_pcr = 0
+    counters = {}
+    tables = psiSections(1)
+    with open(path, "wb") as f:
+        for index in range(count):
+            if index == count // 2:
+                tables = psiSections(2)
+            pid = slots[index % len(slots)]
+            cc = counters.get(pid, 0)
+            if pid == 0x1401 and index in TS_CC_GAPS:
+                cc += 1
+            counters[pid] = cc + 1
+            header = bytes((0x47, (0x80 if index in TS_TEI else 0) | (pid >> 8), pid & 0xFF))
+            if pid in tables:
+                payload = b"\x00" + tables[pid]
+                f.write(bytes((0x47, 0x40 | (pid >> 8), pid & 0xFF, 0x10 | (cc & 0x0F))) + payload + b"\xff" * (184 - len(payload)))
+            elif pid == TS_PCR_PID and index >= next_pcr:
+                next_pcr = index + pcr_every
+                base, ext = divmod(index * 188 * 8 * 27000000 // bitrate, 300)
+                adaptation = bytes((7, 0x10)) + struct.pack(">IH", base >> 1, ((base & 1) << 15) | 0x7E00 | ext)
+                f.write(header + bytes((0x30 | (cc & 0x0F),)) + adaptation + b"\xff" * (184 - len(adaptation)))
+            else:
+                f.write(header + bytes((0x10 | (cc & 0x0F),)) + b"\xff" * 184)
+
+
+def createFixtures(directory):
+    paths = {
+        "satellites": os.path.join(directory, "satellites.xml"),
+        "ecm": os.path.join(directory, "ecm.info"),
+        "lamedb": os.path.join(directory, "lamedb"),
+        "lamedb5": os.path.join(directory, "lamedb5"),
+        "cache": os.path.join(directory, "cache"),
+        "ts": os.path.join(directory, "mux.ts"),
+    }
+    writeSatellitesXml(paths["satellites"])
+    writeEcmInfo(paths["ecm"])
+    writeLamedb(paths["lamedb"])
+    writeLamedb5(paths["lamedb5"])
+    writeTransportStream(paths["ts"])
+    return paths
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+# Offline benchmark for SatelliteAnalyzer on a plain Linux build machine.
+#
+# The enigma2 runtime is replaced by the stubs in bench/stubs and a fake
+# session that replays recorded frontend dicts (bench/fixtures/frontend.json).
+# Synthetic satellites.xml/ecm.info fixtures are generated in a temp dir.
+#
+#   python3 bench/run_bench.py [-n ITERATIONS] [-o bench_output.txt]
+import argparse
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+from time import perf_counter, sleep
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+STUBS = os.path.join(HERE, "stubs")
+PYTHON_DIR = os.path.join(ROOT, "usr", "lib", "enigma2", "python")
+sys.path[:0] = [STUBS, PYTHON_DIR, HERE]
+
+from fake_service import FakeServiceCenter, FakeSession, loadFrontendSamples  # noqa: E402
+from fixtures import createFixtures  # noqa: E402
+
+PLUGIN = "Plugins.Extensions.SatelliteAnalyzer"
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def measure(fn, iterations, setup=None):
+    # Latency per call plus tracemalloc allocation figures
+    for _ in range(min(10, iterations)):
+        if setup:
+            setup()
+        fn()
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = perf_counter()
+        fn()
+        timings.append(perf_counter() - start)
+
+    # Peak traced memory above the starting point, i.e. transient allocations per call
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(min(50, iterations)):
+        if setup:
+            setup()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        fn()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {
+        "min": min(timings),
+        "p50": percentile(timings, 0.5),
+        "p95": percentile(timings, 0.95),
+        "mean": sum(timings) / len(timings),
+        "alloc": allocated // min(50, iterations),
+    }
+
+
+def importTime(module, runs=5, after=""):
+    code = (
+        "import sys, time\n"
+        f"sys.path[:0] = [{STUBS!r}, {PYTHON_DIR!r}]\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        f"{after}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(' '.join(sorted(name for name in sys.modules if name.startswith({PLUGIN!r} + '.'))))\n"
+        "print(elapsed)\n"
+    )
+    best = None
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=HERE)
+        modules, elapsed = output.decode().strip().splitlines()[-2:]
+        elapsed = float(elapsed)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, modules.split()
+
+
+class FakeRequest(object):
+    # The parts of twisted.web's Request a leaf resource touches
+    def __init__(self, path):
+        self.path = path
+        self.code = 200
+        self.headers = {}
+
+    def setResponseCode(self, code):
+        self.code = code
+
+    def setHeader(self, name, value):
+        self.headers[name] = value
+
+
+def formatRow(name, result):
+    return "%-32s %9.1f %9.1f %9.1f %9.1f %10d" % (
+        name, result["min"] * 1e6, result["p50"] * 1e6, result["p95"] * 1e6,
+        result["mean"] * 1e6, result["alloc"])
+
+
+def run(iterations):
+    workdir = tempfile.mkdtemp(prefix="satanalyzer-bench-")
+    try:
+        return runIn(workdir, iterations)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def runIn(workdir, iterations):
+    paths = createFixtures(workdir)
+    lines = []
+
+    lines.append("Import time (ms, best of 5, fresh interpreter):")
+    startup = (
+        # What enigma2 does for every plugin at GUI start
+        ("plugin.py + Plugins()", f"{PLUGIN}.plugin", f"{PLUGIN}.plugin.Plugins()"),
+        ("SatelliteAnalyzer screen", f"{PLUGIN}.SatelliteAnalyzer", ""),
+    )
+    for name, module, after in startup:
+        elapsed, modules = importTime(module, after=after)
+        lines.append("   %-28s %8.2f  (%d plugin modules loaded)" % (name, elapsed * 1e3, len(modules)))
+    lines.append("")
+
+    import enigma
+    from Plugins.Extensions.SatelliteAnalyzer import Cache, FadeDetector, Lamedb, SatelliteIndex, SignalLog
+    from Plugins.Extensions.SatelliteAnalyzer.Decoders import decodeFrontend
+    from Plugins.Extensions.SatelliteAnalyzer.Metrics import MetricsCollector, MetricsResource
+    from Plugins.Extensions.SatelliteAnalyzer.BouquetReport import BouquetReport
+    from Plugins.Extensions.SatelliteAnalyzer.SiTables import SiTables
+    from Plugins.Extensions.SatelliteAnalyzer.TsAnalyzer import TsAnalyzer, TsFileSource, numpy
+    from Plugins.Extensions.SatelliteAnalyzer.SatelliteAnalyzer import SatelliteAnalyzer
+    from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+    from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+    from Plugins.Extensions.SatelliteAnalyzer.Snapshot import takeSnapshot
+    from Plugins.Extensions.SatelliteAnalyzer.Worker import Worker
+
+    Cache.CACHE_DIR = paths["cache"]
+    SatelliteIndex.SATELLITES_XML = paths["satellites"]
+    Lamedb.LAMEDB_FILES = (paths["lamedb"],)
+    FadeDetector.EVENT_LOG = os.path.join(workdir, "events.log")
+
+    # Synchronous rows below; the background path is timed separately
+    settings.background_io.value = False
+    session = FakeSession()
+    sampler = getSampler(session.nav)
+    sampler.ecm.path = paths["ecm"]
+    screen = SatelliteAnalyzer(session)
+    screen.show()
+    sampler.tick()
+
+    # Setups drop the previous index too, so freeing it is not timed
+    def coldParse():
+        SatelliteIndex._stamp = None
+        SatelliteIndex._index = {}
+        shutil.rmtree(paths["cache"], ignore_errors=True)
+
+    def diskCache():
+        SatelliteIndex._stamp = None
+        SatelliteIndex._index = {}
+
+    def transpondersCold():
+        SatelliteIndex._transponder_stamp = None
+        SatelliteIndex._transponders = {}
+        SatelliteIndex._tables = {}
+        shutil.rmtree(paths["cache"], ignore_errors=True)
+
+    def transpondersDisk():
+        SatelliteIndex._transponder_stamp = None
+        SatelliteIndex._transponders = {}
+        SatelliteIndex._tables = {}
+
+    def diskCacheLamedb():
+        Lamedb._stamp = None
+        Lamedb._index = ({}, {})
+
+    def lamedbCold(path):
+        def setup():
+            Lamedb.LAMEDB_FILES = (path,)
+            Lamedb._stamp = None
+            Lamedb._index = ({}, {})
+            shutil.rmtree(paths["cache"], ignore_errors=True)
+        return setup
+
+    def nextSample():
+        session.service.advance()
+
+    def zapCold():
+        # The previous lookup must be done before its index is dropped
+        while not sampler.worker.idle:
+            sleep(0.001)
+        coldParse()
+        sampler.service = None
+
+    def bouquetReport(fmt, size=5000):
+        def report():
+            enigma.eServiceCenter.instance = FakeServiceCenter(size)
+            BouquetReport(enigma.eServiceReference("bouquet"), fmt, os.path.join(workdir, "report." + fmt)).run()
+        return report
+
+    def analyzeTs(vectorized):
+        return lambda: readTs(TsAnalyzer(vectorized))
+
+    def readTs(consumer):
+        source = TsFileSource(paths["ts"])
+        while True:
+            batch = source.read()
+            if batch is None:
+                break
+            consumer.feed(*batch)
+        source.close()
+
+    # Reassembled sections of the fixture, replayed into a fresh table cache (every
+    # version new) and into a warm one (every version complete, dropped on the header)
+    sections = []
+    probe = SiTables()
+    readTs(probe)
+    collector = SiTables()
+    collector.wanted = probe.wanted
+    collector.addSection = sections.append
+    readTs(collector)
+    si_warm = SiTables()
+    for section in sections:
+        si_warm.addSection(section)
+
+    # An hour of 5 s samples with a 4 dB fade in the middle
+    fade_samples = [(12.0 - (4.0 if 300 <= i < 360 else 0.0) + 0.2 * (i % 3), 100) for i in range(720)]
+
+    def fadeRun():
+        detector = FadeDetector.FadeDetector(5, 2.0, 1.0)
+        return [detector.update(snr_db, ber) for snr_db, ber in fade_samples]
+
+    collected = screen.collectServiceInfo()
+    worker = Worker("bench")
+
+    def backgroundTick():
+        # What the GUI thread still does per refresh: hand the job over, swap the result in
+        worker.submit("service", tuple)
+        screen.applyServiceInfo(collected)
+
+    metrics = MetricsCollector(session)
+    metrics.sample(sampler.read())
+    metrics_resource = MetricsResource(metrics)
+    scrape = FakeRequest(b"/metrics")
+
+    # A week of 10 s samples in 256 KB segments
+    log_dir = os.path.join(workdir, "signal")
+    log_start = 1760000000
+    recorder = SignalLog.SignalRecorder(log_dir, segment_size=256 * 1024)
+    for i in range(7 * 8640):
+        recorder.add(log_start + 10 * i, 12.0 - (i % 97) / 50.0, 80, 63, i % 7, 1, 0x03FB, 0x283D)
+    recorder.flush()
+    log_hour = (log_start + 3 * 86400, log_start + 3 * 86400 + 3599)
+    log_day = (log_start + 3 * 86400, log_start + 4 * 86400 - 1)
+    bench_recorder = SignalLog.SignalRecorder(os.path.join(workdir, "signal-bench"))
+
+    def logSample():
+        bench_recorder.add(log_start + bench_recorder.written + bench_recorder.pending, 12.3, 80, 63, 0, 1, 0x03FB, 0x283D)
+
+    # Transponder data of the first sample of each tuner type in the fixture
+    transponders = {}
+    for sample in loadFrontendSamples():
+        transponders.setdefault(sample["tuner_type"], dict((k, v) for k, v in sample.items() if not k.startswith("tuner_") or k == "tuner_type"))
+
+    snapshot = takeSnapshot(session)
+    benchmarks = (
+        ("satellites.xml cold parse", lambda: SatelliteIndex.getSatelliteName(192), coldParse, max(5, iterations // 50)),
+        ("satellites.xml disk cache", lambda: SatelliteIndex.getSatelliteName(192), diskCache, iterations),
+        ("satellites.xml warm lookup", lambda: SatelliteIndex.getSatelliteName(192), None, iterations),
+        ("transponder index cold parse", lambda: SatelliteIndex.matchTransponder(192, 0, 11494000), transpondersCold, max(5, iterations // 50)),
+        ("transponder index disk cache", lambda: SatelliteIndex.matchTransponder(192, 0, 11494000), transpondersDisk, iterations),
+        ("transponder match (bisect)", lambda: SatelliteIndex.matchTransponder(192, 0, 11494000), None, iterations),
+        ("lamedb v4 parse (20k services)", lambda: Lamedb.getTransponderServices(0x00C00000, 1, 0x03FB), lamedbCold(paths["lamedb"]), max(5, iterations // 50)),
+        ("lamedb v5 parse (20k services)", lambda: Lamedb.getTransponderServices(0x00C00000, 1, 0x03FB), lamedbCold(paths["lamedb5"]), max(5, iterations // 50)),
+        ("lamedb disk cache", lambda: Lamedb.getTransponderServices(0x00C00000, 1, 0x03FB), diskCacheLamedb, iterations),
+        ("lamedb warm lookup", lambda: Lamedb.getTransponderServices(0x00C00000, 1, 0x03FB), None, iterations),
+        ("takeSnapshot", lambda: takeSnapshot(session), nextSample, iterations),
+        ("decodeFrontend DVB-S", lambda: decodeFrontend(transponders["DVB-S"]), None, iterations),
+        ("decodeFrontend DVB-T2", lambda: decodeFrontend(transponders["DVB-T"]), None, iterations),
+        ("decodeFrontend DVB-C", lambda: decodeFrontend(transponders["DVB-C"]), None, iterations),
+        ("getBasicInfo", lambda: screen.getBasicInfo(snapshot), None, iterations),
+        ("getAdvancedInfo", lambda: screen.getAdvancedInfo(snapshot), None, iterations),
+        ("sampler read", sampler.read, nextSample, iterations),
+        ("sampler zap, satellites.xml cold", sampler.read, zapCold, max(5, iterations // 50)),
+        ("sampleSignal (screen subscriber)", lambda: screen.sampleSignal(sampler.read()), nextSample, iterations),
+        ("updateAllInfo, GUI thread only", screen.updateAllInfo, nextSample, iterations),
+        ("collectServiceInfo (worker)", screen.collectServiceInfo, nextSample, iterations),
+        ("submit + apply (GUI, background)", backgroundTick, None, iterations),
+        ("sampleAlignment", screen.sampleAlignment, nextSample, iterations),
+        ("fade detector, 720 samples", fadeRun, None, iterations),
+        ("metrics prebuild", lambda: metrics.sample(sampler.sample), nextSample, iterations),
+        ("signal log add (batched write)", logSample, None, iterations * 10),
+        ("signal log query, 1 h of 1 week", lambda: sum(1 for _ in SignalLog.iterRange(*log_hour, directory=log_dir)), None, iterations),
+        ("signal log CSV export, 1 day", lambda: SignalLog.exportCsv(os.path.join(workdir, "signal.csv"), *log_day, directory=log_dir), None, max(5, iterations // 20)),
+        ("metrics scrape", lambda: metrics_resource.render_GET(scrape), None, iterations),
+        ("bouquet report CSV (5k services)", bouquetReport("csv"), None, max(5, iterations // 50)),
+        ("bouquet report JSON (5k services)", bouquetReport("json"), None, max(5, iterations // 50)),
+        ("TS 2 s @ 62 Mbit/s, Python", analyzeTs(False), None, max(5, iterations // 20)),
+        ("PSI/SI 2 s mux, PID filter + all", lambda: readTs(SiTables()), None, max(5, iterations // 20)),
+        (f"{len(sections)} sections, no version cache", lambda: [SiTables().addSection(section) for section in sections], None, max(5, iterations // 20)),
+        (f"{len(sections)} sections, versions known", lambda: [si_warm.addSection(section) for section in sections], None, max(5, iterations // 20)),
+    )
+    if numpy is not None:
+        benchmarks += (("TS 2 s @ 62 Mbit/s, NumPy", analyzeTs(True), None, max(5, iterations // 20)),
+            ("signal log NumPy load, 1 week", lambda: SignalLog.loadNumpy(directory=log_dir), None, max(5, iterations // 20)))
+    else:
+        lines.append("NumPy not installed, vectorized TS analysis not measured")
+
+    lines.append("%-32s %9s %9s %9s %9s %10s" % ("Per call (us)", "min", "p50", "p95", "mean", "peak B"))
+    for name, fn, setup, count in benchmarks:
+        lines.append(formatRow(name, measure(fn, count, setup)))
+    lines.append("")
+
+    # Streaming output: peak memory should not grow with the bouquet size
+    peaks = [measure(bouquetReport("csv", size), 3)["alloc"] for size in (1000, 5000, 20000)]
+    lines.append("Bouquet report peak memory 1k/5k/20k services (B): %d / %d / %d" % tuple(peaks))
+    # One frequency per tuner type, all in MHz whatever unit the transponder data uses
+    bouquetReport("csv", 100)()
+    with open(os.path.join(workdir, "report.csv"), newline="") as f:
+        frequencies = dict((row["satellite"], row["frequency"]) for row in csv.DictReader(f))
+    lines.append("Bouquet report frequency (MHz): " + ", ".join(f"{source} {frequency}" for source, frequency in sorted(frequencies.items())))
+
+    si_once = SiTables()
+    for section in sections:
+        si_once.addSection(section)
+    lines.append(f"PSI/SI sections: {si_once.sections}, skipped unchanged: {si_once.skipped}, CRC errors: {si_once.crc_errors}")
+    events = [(i, event) for i, event in enumerate(fadeRun()) if event is not None]
+    lines.append("Fade detector events (sample, event): " + ", ".join(f"{i} {event}" for i, event in events))
+    worker.stop()
+    # stop() while a job runs, then a new submit: the old job must not count against the new thread
+    gate = threading.Event()
+    worker = Worker("bench-restart")
+    worker.submit("service", gate.wait)
+    sleep(0.02)
+    worker.stop()
+    worker.submit("service", tuple)
+    gate.set()
+    sleep(0.05)
+    threads = sum(1 for thread in threading.enumerate() if thread.name == "bench-restart")
+    lines.append(f"Worker restarted during a job: idle {worker.idle}, results {sorted(worker.mailbox.take())}, threads {threads}")
+    worker.stop()
+    segments = SignalLog.listSegments(log_dir)
+    lines.append("Signal log: %d records in %d segments, %d B on disk (%d B/record)" % (recorder.written, len(segments),
+        sum(os.path.getsize(path) for path in segments), SignalLog.RECORD.size))
+    # One record per segment, two kept: after the clock steps back the newest records must survive pruning
+    step_recorder = SignalLog.SignalRecorder(os.path.join(workdir, "signal-step"), batch=1,
+        segment_size=SignalLog.HEADER.size + SignalLog.RECORD.size, segments=2)
+    for offset in (100, 200, 50, 60):
+        step_recorder.add(log_start + offset, 12.3, 80, 63, 0, 1, 0x03FB, 0x283D)
+    kept = [record[0] - log_start for record in SignalLog.iterRange(directory=step_recorder.directory)]
+    lines.append(f"Signal log after a clock step back, kept: {kept}")
+    calls = session.service.calls
+    for _ in range(10):
+        metrics_resource.render_GET(scrape)
+    lines.append(f"Driver calls per 10 metrics scrapes: {session.service.calls - calls}")
+    calls = session.service.calls
+    screen.updateAllInfo()
+    lines.append(f"Driver calls per updateAllInfo: {session.service.calls - calls}")
+    calls = session.service.calls
+    sampler.tick()
+    lines.append(f"Driver calls per sampler tick, screen only: {session.service.calls - calls}")
+    # An infobar skin with a dozen converter widgets next to the screen and the monitors
+    from Components.Converter.SatelliteAnalyzerInfo import SatelliteAnalyzerInfo
+    converters = [SatelliteAnalyzerInfo(kind) for kind in ("SnrDb", "Snr", "Agc", "Ber", "Lock", "Caid",
+        "CaName", "EcmTime", "Satellite", "Snr", "Agc", "SnrDb")]
+    calls = session.service.calls
+    metrics.start()
+    lines.append(f"Driver calls per metrics start: {session.service.calls - calls}")
+    FadeDetector.startMonitor(session)
+    calls = session.service.calls
+    sampler.tick()
+    texts = [converter.text for converter in converters]
+    lines.append(f"Driver calls per sampler tick, screen + {len(converters)} converters + 2 monitors: {session.service.calls - calls}")
+    lines.append("Converters: " + " | ".join(texts))
+    for converter in converters:
+        converter.destroy()
+    metrics.stop()
+    FadeDetector.stopMonitor()
+    calls = session.service.calls
+    screen.sampleAlignment()
+    lines.append(f"Driver calls per sampleAlignment: {session.service.calls - calls}")
+    # Yellow key twice: the screen leaves the sampler while aligning and comes back after
+    def screenSubscribed():
+        return any(subscriber.callback == screen.sampleSignal for subscriber in sampler.subscribers)
+    screen.toggleAlignment()
+    aligning = screenSubscribed()
+    sampler.tick()
+    screen.sampleAlignment()
+    screen.toggleAlignment()
+    lines.append(f"Screen subscribed to the sampler while aligning: {aligning}, after: {screenSubscribed()}")
+    # A minute of 1 s refreshes: what actually reached the widgets
+    widgets = screen.widgets
+    performed, skipped = widgets.performed, widgets.skipped
+    panes = (screen.basic_pane, screen.signal_pane, screen.ids_pane)
+    filled, reused = sum(pane.filled for pane in panes), sum(pane.reused for pane in panes)
+    for _ in range(60):
+        nextSample()
+        screen.sampleSignal(sampler.read())
+        screen.updateTime()
+        screen.updateCenter()
+        screen.applyServiceInfo(screen.collectServiceInfo())
+    lines.append("Widget writes per 60 refreshes: %d performed, %d skipped" % (widgets.performed - performed,
+        widgets.skipped - skipped))
+    lines.append("Template lines per 60 refreshes: %d re-filled, %d reused" % (
+        sum(pane.filled for pane in panes) - filled, sum(pane.reused for pane in panes) - reused))
+    # A refresh task that raises must leave the single-shot timer armed for the others
+    from Plugins.Extensions.SatelliteAnalyzer.Scheduler import RefreshScheduler
+    scheduler = RefreshScheduler()
+    scheduler.add("broken", 1000, lambda: 1 / 0)
+    scheduler.add("clock", 1000, tuple)
+    scheduler.start()
+    lines.append(f"Scheduler after a failing task: timer active {scheduler.timer.active}")
+    scheduler.stop()
+    screen.openSetup()
+    setup = session.dialogs[-1]
+    lines.append(f"Setup screen: {len(setup['config'].list)} entries, unset: {[label for label, element in setup['config'].list if element is None]}")
+    setup.keyCancel()
+    screen.close()
+    lines.append(f"Sampler subscribers after close: {len(sampler)}")
+    # The only subscriber subscribing again must not hook service events twice
+    sampler.subscribe(screen.sampleSignal, 500)
+    sampler.subscribe(screen.sampleSignal, 500)
+    hooks = session.nav.event.count(sampler.serviceEvent)
+    sampler.unsubscribe(screen.sampleSignal)
+    lines.append(f"Service event hooks, re-subscribed: {hooks}, after unsubscribe: {session.nav.event.count(sampler.serviceEvent)}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline SatelliteAnalyzer benchmark")
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    parser.add_argument("-o", "--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    lines = run(args.iterations)
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
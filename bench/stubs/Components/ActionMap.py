@@ -0,0 +1,4 @@
+class ActionMap(object):
+    def __init__(self, contexts=None, actions=None, prio=0):
+        self.contexts = contexts or []
+        self.actions = actions or {}
@@ -0,0 +1,19 @@
+class ConfigList(object):
+    def __init__(self, entries, session=None):
+        self.list = entries
+
+    def getCurrent(self):
+        return self.list[0] if self.list else None
+
+
+class ConfigListScreen(object):
+    def __init__(self, entries, session=None, on_change=None):
+        self["config"] = ConfigList(entries, session)
+
+    def keySave(self):
+        for entry in self["config"].list:
+            entry[1].save()
+        self.close()
+
+    def keyCancel(self):
+        self.close()
@@ -0,0 +1,7 @@
+from Components.Element import Element
+
+
+class Converter(Element):
+    def __init__(self, arguments):
+        Element.__init__(self)
+        self.converter_arguments = arguments
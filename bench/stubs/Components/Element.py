@@ -0,0 +1,18 @@
+def cached(f):
+    return f
+
+
+class Element(object):
+    CHANGED_DEFAULT, CHANGED_ALL, CHANGED_CLEAR, CHANGED_SPECIFIC, CHANGED_POLL = range(5)
+
+    def __init__(self):
+        self.downstream_elements = []
+        self.source = None
+        self.suspended = False
+
+    def changed(self, what):
+        for element in self.downstream_elements:
+            element.changed(what)
+
+    def destroy(self):
+        self.downstream_elements = []
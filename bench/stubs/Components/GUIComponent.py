@@ -0,0 +1,10 @@
+class GUIComponent(object):
+    def __init__(self):
+        self.instance = None
+        self.visible = True
+
+    def show(self):
+        self.visible = True
+
+    def hide(self):
+        self.visible = False
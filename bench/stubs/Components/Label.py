@@ -0,0 +1,15 @@
+from Components.GUIComponent import GUIComponent
+
+
+class Label(GUIComponent):
+    def __init__(self, text=""):
+        GUIComponent.__init__(self)
+        self.text = text
+        self.set_count = 0
+
+    def setText(self, text):
+        self.text = text
+        self.set_count += 1
+
+    def getText(self):
+        return self.text
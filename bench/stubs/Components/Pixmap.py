@@ -0,0 +1,5 @@
+from Components.GUIComponent import GUIComponent
+
+
+class Pixmap(GUIComponent):
+    pass
@@ -0,0 +1,15 @@
+from Components.GUIComponent import GUIComponent
+
+
+class ProgressBar(GUIComponent):
+    def __init__(self):
+        GUIComponent.__init__(self)
+        self.value = 0
+        self.set_count = 0
+
+    def setValue(self, value):
+        self.value = value
+        self.set_count += 1
+
+    def getValue(self):
+        return self.value
@@ -0,0 +1,9 @@
+from Components.Label import Label
+
+
+class ScrollLabel(Label):
+    def pageUp(self):
+        pass
+
+    def pageDown(self):
+        pass
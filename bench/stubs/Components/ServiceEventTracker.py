@@ -0,0 +1,4 @@
+class ServiceEventTracker(object):
+    def __init__(self, screen, eventmap):
+        self.screen = screen
+        self.eventmap = eventmap
@@ -0,0 +1,3 @@
+# Lets real modules under usr/lib/enigma2/python/Components (the skin converter) import next to the stubs
+from pkgutil import extend_path
+__path__ = extend_path(__path__, __name__)
@@ -0,0 +1,32 @@
+class ConfigElement(object):
+    def __init__(self, default=None, **kwargs):
+        self.default = default
+        self.value = default
+        self.notifiers = []
+
+    def addNotifier(self, notifier, initial_call=True, immediate_feedback=True):
+        self.notifiers.append(notifier)
+        if initial_call:
+            notifier(self)
+
+    def save(self):
+        pass
+
+
+class ConfigSubsection(object):
+    pass
+
+
+ConfigSelection = ConfigYesNo = ConfigInteger = ConfigNumber = ConfigText = ConfigIP = ConfigElement
+
+
+def ConfigSelectionNumber(min=0, max=0, stepwidth=1, default=0, **kwargs):
+    return ConfigElement(default)
+
+
+def getConfigListEntry(*args):
+    return args
+
+
+config = ConfigSubsection()
+config.plugins = ConfigSubsection()
@@ -0,0 +1,12 @@
+class PluginDescriptor(object):
+    WHERE_PLUGINMENU = 1
+    WHERE_EXTENSIONSMENU = 2
+    WHERE_SESSIONSTART = 3
+    WHERE_AUTOSTART = 4
+
+    def __init__(self, name="Plugin", where=None, description="", icon=None, fnc=None, **kwargs):
+        self.name = name
+        self.where = where if isinstance(where, list) else [where]
+        self.description = description
+        self.icon = icon
+        self.fnc = fnc
@@ -0,0 +1,5 @@
+class MessageBox(object):
+    TYPE_YESNO, TYPE_INFO, TYPE_WARNING, TYPE_ERROR = range(4)
+
+    def __init__(self, session, text, type=1, timeout=-1, **kwargs):
+        self.text = text
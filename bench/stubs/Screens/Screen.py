@@ -0,0 +1,25 @@
+class Screen(dict):
+    def __init__(self, session):
+        dict.__init__(self)
+        self.session = session
+        self.onClose = []
+        self.onLayoutFinish = []
+        self.onShow = []
+        self.onHide = []
+        self.onExecBegin = []
+        self.onExecEnd = []
+
+    def setTitle(self, title):
+        self.title = title
+
+    def show(self):
+        for f in self.onShow:
+            f()
+
+    def hide(self):
+        for f in self.onHide:
+            f()
+
+    def close(self, *retval):
+        for f in self.onClose:
+            f()
@@ -0,0 +1,12 @@
+import os
+
+SCOPE_PLUGINS = "plugins"
+SCOPE_CONFIG = "config"
+
+
+def fileExists(path, mode="r"):
+    return os.path.exists(path)
+
+
+def resolveFilename(scope, base=""):
+    return base
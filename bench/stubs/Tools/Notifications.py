@@ -0,0 +1,9 @@
+notifications = []
+
+
+def AddPopup(text, type, timeout, id=None, **kwargs):
+    notifications.append((text, type, timeout, id))
+
+
+def AddNotification(screen, *args, **kwargs):
+    notifications.append((screen, args, kwargs))
@@ -0,0 +1,83 @@
+# Minimal stand-in for the enigma2 C++ module, enough to import and drive
+# SatelliteAnalyzer off-box. Timers never fire on their own; the benchmark
+# calls the screen methods directly.
+
+
+class iServiceInformation:
+    (sIsCrypted, sAspect, sFrameRate, sProgressive, sVideoPID, sAudioPID, sPCRPID,
+     sPMTPID, sTXTPID, sSID, sONID, sTSID, sNamespace, sProvider, sDescription,
+     sServiceref, sTimeCreate, sFileSize, sCAIDs, sCAIDPIDs, sVideoType,
+     sTags, sDVBState, sVideoHeight, sVideoWidth, sTransponderData) = range(26)
+
+
+class iPlayableService:
+    (evStart, evEnd, evTunedIn, evTuneFailed, evUpdatedEventInfo, evUpdatedInfo,
+     evSeekableStatusChanged, evEOF, evSOF, evCuesheetChanged) = range(10)
+
+
+class iFrontendInformation:
+    (bitErrorRate, signalPower, signalQuality, lockState, syncState,
+     frontendNumber, signalQualitydB, frontendStatus) = range(8)
+
+
+class eTimer(object):
+    def __init__(self):
+        self.callback = []
+        self.active = False
+
+    def start(self, msec, singleShot=False):
+        self.active = True
+
+    def startLongTimer(self, seconds):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+
+class eServiceReference(object):
+    idInvalid, idStructure, idDVB = -1, 0, 1
+    isDirectory, isMarker = 7, 64
+
+    def __init__(self, *args):
+        self.args = args
+        self.type = self.idStructure if args else self.idInvalid
+        self.flags = self.isDirectory if args else 0
+
+    def valid(self):
+        return self.type != self.idInvalid
+
+    def getPath(self):
+        return ""
+
+    def toString(self):
+        return str(self.args[0]) if self.args else ""
+
+
+class eServiceCenter(object):
+    instance = None
+
+    @classmethod
+    def getInstance(cls):
+        return cls.instance
+
+
+class ePoint(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class eSize(object):
+    def __init__(self, width, height):
+        self.w = width
+        self.h = height
+
+    def width(self):
+        return self.w
+
+    def height(self):
+        return self.h
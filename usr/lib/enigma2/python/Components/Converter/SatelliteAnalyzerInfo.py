@@ -0,0 +1,122 @@
+# SatelliteAnalyzerInfo.py
+# Skin converter over the SatelliteAnalyzer shared sampler, e.g. for the infobar:
+#   <widget source="session.CurrentService" render="Label" ...>
+#       <convert type="SatelliteAnalyzerInfo">SnrDb</convert>
+#   </widget>
+# Every converter instance subscribes to the same sampler, so any number of
+# widgets cost one frontend read per tick. Types: SnrDb, Snr, Agc, Ber, Lock,
+# Caid, CaName, EcmTime, Satellite; Snr and Agc also drive progress bars.
+from Components.Converter.Converter import Converter
+from Components.Element import cached
+
+from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+
+# Refresh rate of the widgets (ms)
+CONVERTER_INTERVAL = 1000
+
+
+class SatelliteAnalyzerInfo(Converter, object):
+    SNR_DB, SNR, AGC, BER, LOCK, CAID, CA_NAME, ECM_TIME, SATELLITE = range(9)
+
+    TYPES = {
+        "snrdb": SNR_DB,
+        "snr": SNR,
+        "agc": AGC,
+        "ber": BER,
+        "lock": LOCK,
+        "caid": CAID,
+        "caname": CA_NAME,
+        "ecmtime": ECM_TIME,
+        "satellite": SATELLITE,
+    }
+
+    def __init__(self, type):
+        Converter.__init__(self, type)
+        self.type = self.TYPES.get(type.strip().lower(), self.SNR_DB)
+        self.sampler = getSampler()
+        self.subscribed = False
+        self.subscribe()
+
+    def subscribe(self):
+        if not self.subscribed:
+            self.sampler.subscribe(self.sampled, CONVERTER_INTERVAL)
+            self.subscribed = True
+
+    def unsubscribe(self):
+        if self.subscribed:
+            self.sampler.unsubscribe(self.sampled)
+            self.subscribed = False
+
+    def sampled(self, sample):
+        Converter.changed(self, (self.CHANGED_POLL,))
+
+    def doSuspend(self, suspended):
+        # Hidden widgets (infobar off screen) do not keep the sampler running
+        if suspended:
+            self.unsubscribe()
+        else:
+            self.subscribe()
+            Converter.changed(self, (self.CHANGED_POLL,))
+
+    def destroy(self):
+        self.unsubscribe()
+        Converter.destroy(self)
+
+    @cached
+    def getText(self):
+        sample = self.sampler.sample
+        if sample is None or sample.service is None:
+            return ""
+        kind = self.type
+        if kind == self.SATELLITE:
+            return sample.satellite
+        if kind == self.CA_NAME:
+            return sample.caName
+        if kind == self.CAID:
+            caid = sample.caid
+            return f"{caid:04X}" if caid is not None else ""
+        if kind == self.ECM_TIME:
+            if sample.ecm is None or sample.ecm.ecm_time is None:
+                return ""
+            return f"{sample.ecm.ecm_time} ms"
+        if kind == self.LOCK:
+            return "LOCK" if sample.locked else "NO LOCK"
+        if sample.signal is None:
+            return ""
+        snr_db, snr_percent, agc, ber = sample.signal
+        if kind == self.SNR_DB:
+            return f"{snr_db:.2f} dB"
+        if kind == self.SNR:
+            return f"{snr_percent} %"
+        if kind == self.AGC:
+            return f"{agc} %"
+        return str(ber)
+
+    text = property(getText)
+
+    @cached
+    def getValue(self):
+        sample = self.sampler.sample
+        if sample is None or sample.signal is None:
+            return 0
+        snr_db, snr_percent, agc, ber = sample.signal
+        if self.type == self.AGC:
+            return agc
+        if self.type == self.BER:
+            return ber
+        return snr_percent
+
+    value = property(getValue)
+
+    range = 100
+
+    @cached
+    def getBoolean(self):
+        sample = self.sampler.sample
+        if sample is None:
+            return False
+        if self.type == self.CA_NAME or self.type == self.CAID:
+            return sample.caid is not None
+        return sample.locked
+
+    boolean = property(getBoolean)
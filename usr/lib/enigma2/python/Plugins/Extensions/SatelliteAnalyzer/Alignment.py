@@ -0,0 +1,49 @@
+# Alignment.py
+# Dish alignment meter: EWMA-smoothed quality/SNR with peak hold.
+# Kept deliberately small, it runs 10-20 times per second on the GUI thread.
+from enigma import iFrontendInformation
+
+# Sampling period in alignment mode (ms), ~15 Hz
+ALIGN_INTERVAL = 66
+# EWMA weight of the newest sample
+ALIGN_ALPHA = 0.3
+
+
+class AlignmentMeter(object):
+    __slots__ = ("alpha", "quality", "snr_db", "locked", "peak_quality", "peak_snr_db", "samples")
+
+    def __init__(self, alpha=ALIGN_ALPHA):
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.quality = None
+        self.snr_db = None
+        self.locked = False
+        self.peak_quality = 0.0
+        self.peak_snr_db = 0.0
+        self.samples = 0
+
+    def update(self, quality, snr_db, locked):
+        alpha = self.alpha
+        if self.quality is None:
+            self.quality = quality
+            self.snr_db = snr_db
+        else:
+            self.quality += alpha * (quality - self.quality)
+            self.snr_db += alpha * (snr_db - self.snr_db)
+        self.locked = locked
+        self.samples += 1
+        # Peaks follow the smoothed values so a single noisy sample can't set them
+        if self.quality > self.peak_quality:
+            self.peak_quality = self.quality
+        if self.snr_db > self.peak_snr_db:
+            self.peak_snr_db = self.snr_db
+
+
+def readAlignment(frontendInfo):
+    # Three single-value reads instead of a full status dict: (quality %, SNR dB, locked)
+    quality = frontendInfo.getFrontendInfo(iFrontendInformation.signalQuality)
+    snr_db = frontendInfo.getFrontendInfo(iFrontendInformation.signalQualitydB)
+    locked = frontendInfo.getFrontendInfo(iFrontendInformation.lockState)
+    return min(100.0, quality / 655.35), snr_db / 100.0, bool(locked)
@@ -0,0 +1,172 @@
+# BouquetReport.py
+# Tuning parameters and CAIDs for every service of a bouquet, without zapping.
+# Services are pulled from eServiceCenter one at a time and pushed straight to
+# the output file through generators; only the decoded columns of each transponder
+# are kept, a few hundred bytes per transponder whatever the bouquet size.
+import csv
+import json
+import os
+
+from enigma import eServiceCenter, eServiceReference, iServiceInformation
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+from Plugins.Extensions.SatelliteAnalyzer.Decoders import decodeFrontend, frequencyMHz, getCaName, getSatelliteNameFromXML
+from Plugins.Extensions.SatelliteAnalyzer.Lamedb import getLamedbIndex, parseTransponderParams
+
+# Written as REPORT_FILE + ".csv" / ".json"
+REPORT_FILE = "/tmp/SatelliteAnalyzer_bouquet"
+# Used when the channel list is not available (e.g. no InfoBar yet)
+ALL_TV_BOUQUETS = '1:7:1:0:0:0:0:0:0:0:FROM BOUQUET "bouquets.tv" ORDER BY bouquet'
+# Services handled per step, so the GUI stays responsive between steps
+REPORT_CHUNK = 100
+# Bouquets of bouquets are followed this deep
+MAX_DEPTH = 4
+
+REPORT_FIELDS = ("name", "provider", "sid", "tsid", "onid", "satellite", "frequency", "polarization",
+    "symbol_rate", "system", "modulation", "fec", "caids")
+
+
+def getCurrentBouquet():
+    try:
+        from Screens.InfoBar import InfoBar
+        root = InfoBar.instance.servicelist.getRoot()
+    except Exception:
+        root = None
+    if root is None or not root.valid():
+        root = eServiceReference(ALL_TV_BOUQUETS)
+    return root
+
+
+def iterServices(serviceHandler, bouquet, depth=0):
+    # DVB service references of a bouquet, nested bouquets included; markers and
+    # streams (no transponder) are skipped
+    services = serviceHandler.list(bouquet)
+    if services is None:
+        return
+    while True:
+        ref = services.getNext()
+        if not ref.valid():
+            return
+        if ref.flags & eServiceReference.isDirectory:
+            if depth < MAX_DEPTH:
+                yield from iterServices(serviceHandler, ref, depth + 1)
+        elif not ref.flags & eServiceReference.isMarker and ref.type == eServiceReference.idDVB and not ref.getPath():
+            yield ref
+
+
+def resolveTransponder(info, ref, params):
+    # Decoded transponder columns; enigma2's own transponder data is preferred,
+    # the lamedb parameter line is the fallback
+    data = info.getInfoObject(ref, iServiceInformation.sTransponderData)
+    if not data:
+        data = parseTransponderParams(params) if params else {}
+    params = decodeFrontend(data)
+    if params.tuner_type == "DVB-S":
+        satellite = getSatelliteNameFromXML(params.orbital_position)
+        polarization = params.polarization
+    else:
+        satellite = params.tuner_type
+        polarization = ""
+    return (
+        satellite,
+        frequencyMHz(params.tuner_type, data.get("frequency", 0)),
+        polarization,
+        data.get("symbol_rate", 0) // 1000,
+        params["system"],
+        params["modulation"],
+        params["fec"],
+    )
+
+
+def findService(services, sid):
+    # (provider, caids) of a lamedb service entry; a transponder carries a few dozen at most
+    for entry in services:
+        if entry[0] == sid:
+            return entry[3], entry[4]
+    return "", ()
+
+
+def formatCaids(caids):
+    if not caids:
+        return "FTA"
+    return ", ".join(f"{getCaName(caid) or 'CAID'} (0x{caid:04X})" for caid in sorted(set(caids)))
+
+
+def iterRecords(serviceHandler, refs):
+    # One tuple per service, in REPORT_FIELDS order
+    lamedb_transponders, lamedb_services = getLamedbIndex()
+    transponders = {}
+    for ref in refs:
+        try:
+            info = serviceHandler.info(ref)
+            if info is None:
+                continue
+            sid, tsid, onid = ref.getUnsignedData(1), ref.getUnsignedData(2), ref.getUnsignedData(3)
+            key = (ref.getUnsignedData(4), onid, tsid)
+            columns = transponders.get(key)
+            if columns is None:
+                columns = transponders[key] = resolveTransponder(info, ref, lamedb_transponders.get(key))
+            provider, caids = findService(lamedb_services.get(key, ()), sid)
+            yield (info.getName(ref), provider, f"0x{sid:04X}", f"0x{tsid:04X}", f"0x{onid:04X}") + columns + (formatCaids(caids),)
+        except Exception as e:
+            log.warning("Bouquet report: skipping %s: %s", ref.toString(), e)
+
+
+def writeCsv(f, records):
+    # Yields the running row count after each row
+    writer = csv.writer(f)
+    writer.writerow(REPORT_FIELDS)
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+        yield count
+
+
+def writeJson(f, records):
+    # A JSON array written element by element, never built in memory
+    f.write("[")
+    count = 0
+    for record in records:
+        f.write(",\n" if count else "\n")
+        f.write(json.dumps(dict(zip(REPORT_FIELDS, record)), ensure_ascii=False))
+        count += 1
+        yield count
+    f.write("\n]\n")
+
+
+WRITERS = {"csv": writeCsv, "json": writeJson}
+
+
+class BouquetReport(object):
+    def __init__(self, bouquet, fmt="csv", path=None):
+        self.path = path or f"{REPORT_FILE}.{fmt}"
+        self.count = 0
+        self.file = open(self.path + ".tmp", "w", newline="", encoding="utf-8")
+        serviceHandler = eServiceCenter.getInstance()
+        records = iterRecords(serviceHandler, iterServices(serviceHandler, bouquet))
+        self.steps = WRITERS[fmt](self.file, records)
+
+    def step(self, limit=REPORT_CHUNK):
+        # Returns True while there is more to do; the file is complete once it returns False
+        done = 0
+        for self.count in self.steps:
+            done += 1
+            if done >= limit:
+                return True
+        self.file.close()
+        os.replace(self.path + ".tmp", self.path)
+        return False
+
+    def run(self):
+        while self.step():
+            pass
+        return self.count
+
+    def abort(self):
+        self.steps.close()
+        self.file.close()
+        try:
+            os.unlink(self.path + ".tmp")
+        except OSError:
+            pass
@@ -0,0 +1,41 @@
+# Cache.py
+# Small on-disk cache for indexes built from large files (satellites.xml, ...).
+# Every entry is bound to (mtime, size) of its source file and is dropped as soon as that changes.
+import marshal
+import os
+
+CACHE_DIR = "/etc/enigma2/SatelliteAnalyzer"
+
+
+def fileStamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def loadCache(name, stamp, version):
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        with open(path, "rb") as f:
+            cached_version, cached_stamp, payload = marshal.loads(f.read())
+    except Exception:
+        return None
+    if cached_version != version or tuple(cached_stamp) != tuple(stamp):
+        return None
+    return payload
+
+
+def saveCache(name, stamp, version, payload):
+    path = os.path.join(CACHE_DIR, name)
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(marshal.dumps((version, tuple(stamp), payload)))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # Imported here: Debug pulls in Settings, which the cache must not depend on
+        from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+        log.warning("Cannot write cache %s: %s", path, e)
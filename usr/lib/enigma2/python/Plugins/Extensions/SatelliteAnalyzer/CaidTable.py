@@ -0,0 +1,167 @@
+# CaidTable.py
+# CAID -> CA system name lookup: exact overrides first, then vendor ranges
+# searched with bisect. Built-in tables are compiled once at import, an optional
+# user database is compiled on first use and cached in binary form.
+import re
+from bisect import bisect_right
+
+from Plugins.Extensions.SatelliteAnalyzer.Cache import fileStamp, loadCache, saveCache
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+
+# One entry per line: "0500 Viaccess", "0x1830=Nagravision", "0900-09FF: NDS Videoguard"
+CAID_DATABASE = "/etc/tuxbox/caid.db"
+
+_CACHE_NAME = "caid.idx"
+_CACHE_VERSION = 1
+
+_LINE = re.compile(r"^(?:0x)?([0-9a-f]{1,4})(?:\s*-\s*(?:0x)?([0-9a-f]{1,4}))?\s*[:=|\s]\s*(.+?)$", re.I)
+
+_BUILTIN_EXACT = {
+    0x0500: "Viaccess",
+    0x0600: "Seca Mediaguard",
+    0x0900: "NDS Videoguard",
+    0x0E00: "PowerVu",
+    0x1700: "Drecrypt",
+    0x1800: "Tandberg",
+    0x1856: "Nagra Ma",
+    0x183E: "Nagra Ma",
+    0x1803: "Nagra Ma",
+    0x1861: "Nagra Ma",
+    0x181D: "Nagra Ma",
+    0x186C: "Nagra Ma",
+    0x1870: "Nagra Ma",
+    0x2600: "Biss",
+    0x2700: "Bulcrypt",
+    0x0D96: "Irdeto",
+    0x4AEE: "Bulcrypt",
+    0x5581: "Bulcrypt",
+    0x1EC0: "CryptoGuard",
+    0x0100: "Seca/ Mediaguard",
+}
+
+# DVB CA_system_id allocations (ETR 162) and later vendor blocks
+_BUILTIN_RANGES = (
+    (0x0100, 0x01FF, "Seca Mediaguard"),
+    (0x0200, 0x02FF, "CCETT"),
+    (0x0500, 0x05FF, "Viaccess"),
+    (0x0600, 0x06FF, "Irdeto"),
+    (0x0700, 0x07FF, "DigiCipher 2"),
+    (0x0800, 0x08FF, "Matra"),
+    (0x0900, 0x09FF, "NDS Videoguard"),
+    (0x0A00, 0x0AFF, "Nokia"),
+    (0x0B00, 0x0BFF, "Conax"),
+    (0x0C00, 0x0CFF, "NTL"),
+    (0x0D00, 0x0DFF, "Cryptoworks"),
+    (0x0E00, 0x0EFF, "PowerVu"),
+    (0x0F00, 0x0FFF, "Sony"),
+    (0x1000, 0x10FF, "Tandberg"),
+    (0x1100, 0x11FF, "Thomson"),
+    (0x1200, 0x12FF, "TV/Com"),
+    (0x1700, 0x17FF, "Betacrypt"),
+    (0x1800, 0x18FF, "Nagravision"),
+    (0x2200, 0x22FF, "Codicrypt"),
+    (0x2600, 0x26FF, "Biss"),
+    (0x4A20, 0x4A2F, "AlphaCrypt"),
+    (0x4AD0, 0x4AD1, "XCrypt"),
+    (0x4AE0, 0x4AE1, "DRE-Crypt"),
+    (0x4B00, 0x4B02, "Tongfang"),
+    (0x5601, 0x5604, "Verimatrix"),
+)
+
+
+def compileRanges(ranges):
+    # Flatten possibly overlapping (start, end, name) ranges into sorted,
+    # non-overlapping segments; later ranges override earlier ones.
+    bounds = sorted({start for start, end, name in ranges} | {end + 1 for start, end, name in ranges})
+    starts, ends, names = [], [], []
+    for lo, hi in zip(bounds, bounds[1:]):
+        name = None
+        for start, end, candidate in ranges:
+            if start <= lo and hi - 1 <= end:
+                name = candidate
+        if name is None:
+            continue
+        if names and names[-1] == name and ends[-1] + 1 == lo:
+            ends[-1] = hi - 1
+        else:
+            starts.append(lo)
+            ends.append(hi - 1)
+            names.append(name)
+    return tuple(starts), tuple(ends), tuple(names)
+
+
+class CaidTable(object):
+    __slots__ = ("exact", "starts", "ends", "names")
+
+    def __init__(self, exact, starts, ends, names):
+        self.exact = exact
+        self.starts = starts
+        self.ends = ends
+        self.names = names
+
+    @classmethod
+    def fromRanges(cls, exact, ranges):
+        return cls(dict(exact), *compileRanges(ranges))
+
+    def lookup(self, caid):
+        name = self.exact.get(caid)
+        if name is not None:
+            return name
+        index = bisect_right(self.starts, caid) - 1
+        if index >= 0 and caid <= self.ends[index]:
+            return self.names[index]
+        return None
+
+
+_builtin = CaidTable.fromRanges(_BUILTIN_EXACT, _BUILTIN_RANGES)
+_user = None
+_user_stamp = None
+
+
+def parseCaidDatabase(path):
+    exact = {}
+    ranges = []
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            match = _LINE.match(line)
+            if not match:
+                continue
+            start = int(match.group(1), 16)
+            name = match.group(3).strip()
+            if match.group(2):
+                ranges.append((start, int(match.group(2), 16), name))
+            else:
+                exact[start] = name
+    return CaidTable.fromRanges(exact, ranges)
+
+
+def loadCaidDatabase(path=CAID_DATABASE):
+    # Cheap to call often: only a stat() unless the database changed
+    global _user, _user_stamp
+    stamp = fileStamp(path)
+    if stamp == _user_stamp:
+        return
+    _user_stamp = stamp
+    if stamp is None:
+        _user = None
+        return
+    cached = loadCache(_CACHE_NAME, stamp, _CACHE_VERSION)
+    if cached is not None:
+        _user = CaidTable(*cached)
+        return
+    try:
+        _user = parseCaidDatabase(path)
+    except Exception as e:
+        log.error("Cannot read CAID database %s: %s", path, e)
+        _user = None
+        return
+    saveCache(_CACHE_NAME, stamp, _CACHE_VERSION, (_user.exact, _user.starts, _user.ends, _user.names))
+
+
+def lookupCaid(caid):
+    if _user is not None:
+        name = _user.lookup(caid)
+        if name is not None:
+            return name
+    return _builtin.lookup(caid)
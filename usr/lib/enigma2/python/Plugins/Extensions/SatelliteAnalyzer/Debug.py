@@ -0,0 +1,133 @@
+# Debug.py
+# Level-gated, rate-limited logging and a cheap per-stage profiler for the refresh path.
+from array import array
+from time import monotonic, perf_counter, strftime
+
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+LOG_PREFIX = "[SatelliteAnalyzer]"
+LOG_LEVELS = {"error": 0, "warning": 1, "info": 2, "debug": 3}
+
+# The same message is printed at most once per interval (seconds)
+LOG_INTERVAL = 60
+
+# Refresh stages, in pipeline order
+STAGES = ("service", "frontend", "sample", "xml", "decode", "ecm", "ts", "si", "format", "widgets")
+
+PROFILE_DUMP = "/tmp/SatelliteAnalyzer_profile.txt"
+
+# Histogram buckets are powers of two in microseconds: <1us, <2us, ..., >= 2^23us (~8s)
+_BUCKETS = 24
+
+
+class RateLimitedLogger(object):
+    def __init__(self, level="info", interval=LOG_INTERVAL):
+        self.level = LOG_LEVELS[level]
+        self.interval = interval
+        # format string -> [last print time, suppressed count]
+        self.seen = {}
+
+    def setLevel(self, level):
+        self.level = LOG_LEVELS.get(level, 2)
+
+    def log(self, level, fmt, *args):
+        if LOG_LEVELS[level] > self.level:
+            return
+        now = monotonic()
+        entry = self.seen.get(fmt)
+        if entry is not None and now - entry[0] < self.interval:
+            entry[1] += 1
+            return
+        suppressed = entry[1] if entry is not None else 0
+        self.seen[fmt] = [now, 0]
+        message = fmt % args if args else fmt
+        if suppressed:
+            message += f" ({suppressed} similar suppressed)"
+        print(f"{LOG_PREFIX} {message}")
+
+    def error(self, fmt, *args):
+        self.log("error", fmt, *args)
+
+    def warning(self, fmt, *args):
+        self.log("warning", fmt, *args)
+
+    def info(self, fmt, *args):
+        self.log("info", fmt, *args)
+
+    def debug(self, fmt, *args):
+        if self.level >= 3:
+            self.log("debug", fmt, *args)
+
+
+class Histogram(object):
+    __slots__ = ("buckets", "count", "total", "maximum")
+
+    def __init__(self):
+        self.buckets = array("L", bytes(array("L").itemsize * _BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        micros = int(seconds * 1000000)
+        self.buckets[min(_BUCKETS - 1, micros.bit_length())] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the requested rank, in seconds
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= rank:
+                return min(self.maximum, (1 << index) / 1000000.0)
+        return self.maximum
+
+
+class Profiler(object):
+    def __init__(self):
+        self.enabled = True
+        self.histograms = dict((stage, Histogram()) for stage in STAGES)
+
+    def record(self, stage, start):
+        # Usage: start = perf_counter(); ...; profiler.record("stage", start)
+        if self.enabled:
+            self.histograms[stage].add(perf_counter() - start)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.__init__()
+
+    def report(self):
+        lines = ["PROFILE (us)  calls   avg   p50   p95   max"]
+        for stage in STAGES:
+            histogram = self.histograms[stage]
+            if not histogram.count:
+                continue
+            avg = histogram.total / histogram.count
+            lines.append("   %-8s %7d %5d %5d %5d %5d" % (
+                stage, histogram.count, avg * 1e6, histogram.percentile(0.5) * 1e6,
+                histogram.percentile(0.95) * 1e6, histogram.maximum * 1e6))
+        return lines
+
+    def dump(self, path=PROFILE_DUMP, extra=()):
+        try:
+            with open(path, "a") as f:
+                f.write(f"--- {strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+                f.write("\n".join(self.report() + list(extra)))
+                f.write("\n")
+        except OSError as e:
+            log.error("Cannot write profile to %s: %s", path, e)
+            return False
+        return True
+
+
+log = RateLimitedLogger()
+settings.log_level.addNotifier(lambda configElement: log.setLevel(configElement.value))
+
+profiler = Profiler()
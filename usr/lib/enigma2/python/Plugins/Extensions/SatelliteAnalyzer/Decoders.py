@@ -0,0 +1,214 @@
+# Decoders.py
+# Frontend parameter -> display string helpers, shared by the screen and the
+# bouquet report so both print the same names for the same values. Each
+# delivery system is a table of fields compiled once at import; a transponder
+# data dict is decoded into a FrontendParams record in a single pass.
+from time import perf_counter
+
+from Plugins.Extensions.SatelliteAnalyzer.CaidTable import lookupCaid
+from Plugins.Extensions.SatelliteAnalyzer.Debug import profiler
+from Plugins.Extensions.SatelliteAnalyzer.SatelliteIndex import getSatelliteName
+
+
+def getCaName(caid):
+    return lookupCaid(caid)
+
+
+class _Table(dict):
+    # Value -> display name; values missing from enigma2's enum show as N/A
+    __slots__ = ()
+
+    def __missing__(self, value):
+        return "N/A"
+
+
+# enigma2 enums (lib/dvb/frontendparms.h), as returned by getTransponderData(True)
+POLARIZATION = _Table({0: "H", 1: "V", 2: "L", 3: "R"})
+INVERSION = _Table({0: "Off", 1: "On", 2: "Auto"})
+# Satellite and cable share one FEC enum
+FEC = _Table({0: "Auto", 1: "1/2", 2: "2/3", 3: "3/4", 4: "5/6", 5: "7/8", 6: "8/9", 7: "3/5", 8: "4/5",
+    9: "9/10", 10: "6/7", 15: "None"})
+SATELLITE_MODULATION = _Table({0: "Auto", 1: "QPSK", 2: "8PSK", 3: "16QAM", 4: "16APSK", 5: "32APSK"})
+SATELLITE_SYSTEM = _Table({0: "DVB-S", 1: "DVB-S2"})
+ROLLOFF = _Table({0: "0.35", 1: "0.25", 2: "0.20", 3: "Auto"})
+PILOT = _Table({0: "Off", 1: "On", 2: "Auto"})
+PLS_MODE = _Table({0: "Root", 1: "Gold", 2: "Combo"})
+CABLE_MODULATION = _Table({0: "Auto", 1: "16QAM", 2: "32QAM", 3: "64QAM", 4: "128QAM", 5: "256QAM"})
+CABLE_SYSTEM = _Table({0: "DVB-C Annex A", 1: "DVB-C Annex C"})
+# Terrestrial has its own code rate enum, Auto is 5
+CODE_RATE = _Table({0: "1/2", 1: "2/3", 2: "3/4", 3: "5/6", 4: "7/8", 5: "Auto", 6: "6/7", 7: "8/9", 8: "3/5", 9: "4/5"})
+CONSTELLATION = _Table({0: "QPSK", 1: "16QAM", 2: "64QAM", 3: "Auto", 4: "256QAM"})
+TRANSMISSION_MODE = _Table({0: "2K", 1: "8K", 2: "Auto", 3: "4K", 4: "1K", 5: "16K", 6: "32K"})
+GUARD_INTERVAL = _Table({0: "1/32", 1: "1/16", 2: "1/8", 3: "1/4", 4: "Auto", 5: "1/128", 6: "19/128", 7: "19/256"})
+HIERARCHY = _Table({0: "None", 1: "1", 2: "2", 3: "4", 4: "Auto"})
+TERRESTRIAL_SYSTEM = _Table({0: "DVB-T", 1: "DVB-T2", 2: "DVB-T/T2"})
+ATSC_MODULATION = _Table({0: "Auto", 1: "16QAM", 2: "32QAM", 3: "64QAM", 4: "128QAM", 5: "256QAM", 6: "8VSB", 7: "16VSB"})
+ATSC_SYSTEM = _Table({0: "ATSC", 1: "DVB-C Annex B"})
+
+
+def formatKHz(value):
+    return f"{value / 1000:g} MHz"
+
+
+def formatHz(value):
+    return f"{value / 1000000:g} MHz"
+
+
+def formatSymbolRate(value):
+    return f"{value // 1000}k"
+
+
+def formatOptional(value):
+    return str(value) if value >= 0 else "N/A"
+
+
+def formatOptionalHex(value):
+    return f"0x{value:X}" if value >= 0 else "N/A"
+
+
+# Display fields per delivery system: (attribute, label, transponder data key, default, formatter).
+# A formatter is a _Table or a function; a new delivery system only needs its table here.
+FRONTEND_SCHEMAS = {
+    "DVB-S": (
+        ("frequency", "Frequency", "frequency", 0, formatKHz),
+        ("polarization", "Polarization", "polarization", -1, POLARIZATION),
+        ("symbol_rate", "Symbol Rate", "symbol_rate", 0, formatSymbolRate),
+        ("fec", "FEC", "fec_inner", -1, FEC),
+        ("modulation", "Modulation", "modulation", -1, SATELLITE_MODULATION),
+        ("system", "SYSTEM", "system", -1, SATELLITE_SYSTEM),
+        ("rolloff", "Roll-off", "rolloff", -1, ROLLOFF),
+        ("pilot", "Pilot", "pilot", -1, PILOT),
+        ("is_id", "INPUT STREAM", "is_id", -1, formatOptional),
+        ("pls_mode", "PLS MODE", "pls_mode", -1, PLS_MODE),
+        ("pls_code", "PLS CODE", "pls_code", -1, formatOptional),
+        ("t2mi_plp_id", "T2MI PLP ID", "t2mi_plp_id", -1, formatOptional),
+        ("t2mi_pid", "T2MI PID", "t2mi_pid", -1, formatOptionalHex),
+    ),
+    "DVB-C": (
+        ("frequency", "Frequency", "frequency", 0, formatKHz),
+        ("symbol_rate", "Symbol Rate", "symbol_rate", 0, formatSymbolRate),
+        ("fec", "FEC", "fec_inner", -1, FEC),
+        ("modulation", "Modulation", "modulation", -1, CABLE_MODULATION),
+        ("system", "SYSTEM", "system", -1, CABLE_SYSTEM),
+        ("inversion", "Inversion", "inversion", -1, INVERSION),
+    ),
+    "DVB-T": (
+        ("frequency", "Frequency", "frequency", 0, formatHz),
+        ("system", "SYSTEM", "system", -1, TERRESTRIAL_SYSTEM),
+        ("bandwidth", "Bandwidth", "bandwidth", 0, formatHz),
+        ("code_rate_hp", "Code Rate HP", "code_rate_hp", -1, CODE_RATE),
+        ("code_rate_lp", "Code Rate LP", "code_rate_lp", -1, CODE_RATE),
+        ("modulation", "Constellation", "constellation", -1, CONSTELLATION),
+        ("transmission_mode", "Transmission Mode", "transmission_mode", -1, TRANSMISSION_MODE),
+        ("guard_interval", "Guard Interval", "guard_interval", -1, GUARD_INTERVAL),
+        ("hierarchy", "Hierarchy", "hierarchy_information", -1, HIERARCHY),
+        ("plp_id", "PLP ID", "plp_id", -1, formatOptional),
+    ),
+    "ATSC": (
+        ("frequency", "Frequency", "frequency", 0, formatHz),
+        ("modulation", "Modulation", "modulation", -1, ATSC_MODULATION),
+        ("system", "SYSTEM", "system", -1, ATSC_SYSTEM),
+        ("inversion", "Inversion", "inversion", -1, INVERSION),
+    ),
+}
+# Some drivers report the second generation as its own tuner type
+FRONTEND_SCHEMAS["DVB-S2"] = FRONTEND_SCHEMAS["DVB-S"]
+FRONTEND_SCHEMAS["DVB-T2"] = FRONTEND_SCHEMAS["DVB-T"]
+FRONTEND_SCHEMAS["DVB-C2"] = FRONTEND_SCHEMAS["DVB-C"]
+
+
+def _compileSchema(schema):
+    # -> ((attribute, key, default, formatter), ...) with tables reduced to their bound lookup
+    return tuple((attribute, key, default, formatter.__getitem__ if isinstance(formatter, _Table) else formatter)
+        for attribute, label, key, default, formatter in schema)
+
+
+_DECODERS = dict((tuner_type, _compileSchema(schema)) for tuner_type, schema in FRONTEND_SCHEMAS.items())
+_ATTRIBUTES = tuple(sorted(set(entry[0] for schema in FRONTEND_SCHEMAS.values() for entry in schema)))
+
+
+class FrontendParams(object):
+    # Display strings of one transponder; attributes the tuner type has no field for read as N/A
+    __slots__ = ("tuner_type", "orbital_position") + _ATTRIBUTES
+
+    def __getitem__(self, name):
+        # Mapping access, so a FrontendParams can fill a line template directly
+        return getattr(self, name, "N/A")
+
+
+# Transponder data frequency unit per tuner type: kHz for satellite/cable, Hz for terrestrial/ATSC
+_FREQUENCY_DIVISORS = dict((tuner_type, 1000000 if (formatHz, "frequency") in ((entry[4], entry[0]) for entry in schema) else 1000)
+    for tuner_type, schema in FRONTEND_SCHEMAS.items())
+
+
+def frequencyMHz(tuner_type, frequency):
+    # Whole MHz as an int, otherwise rounded to kHz
+    mhz = frequency / _FREQUENCY_DIVISORS.get(tuner_type, 1000)
+    return int(mhz) if mhz.is_integer() else round(mhz, 3)
+
+
+def frontendLabels(tuner_type):
+    # -> ((attribute, label), ...) in display order
+    return tuple((entry[0], entry[1]) for entry in FRONTEND_SCHEMAS.get(tuner_type, ()))
+
+
+def decodeFrontend(data):
+    # Transponder data dict -> FrontendParams, one pass over the tuner type's fields
+    params = FrontendParams()
+    params.tuner_type = tuner_type = data.get("tuner_type", "")
+    params.orbital_position = data.get("orbital_position", 0)
+    decoder = _DECODERS.get(tuner_type, ())
+    get = data.get
+    try:
+        for attribute, key, default, formatter in decoder:
+            setattr(params, attribute, formatter(get(key, default)))
+    except (TypeError, ValueError):
+        # A driver returned something odd (None, a string); decode field by field
+        for attribute, key, default, formatter in decoder:
+            try:
+                setattr(params, attribute, formatter(get(key, default)))
+            except (TypeError, ValueError):
+                setattr(params, attribute, "N/A")
+    return params
+
+
+def getFec(fec):
+    return FEC[fec]
+
+
+def getModulation(mod):
+    return SATELLITE_MODULATION[mod]
+
+
+_SYSTEMS = {"DVB-S": SATELLITE_SYSTEM, "DVB-C": CABLE_SYSTEM, "DVB-T": TERRESTRIAL_SYSTEM, "ATSC": ATSC_SYSTEM}
+
+
+def getSystem(tuner_type, sys):
+    table = _SYSTEMS.get(tuner_type)
+    return table[sys] if table is not None else "N/A"
+
+
+def getPolarization(pol):
+    return POLARIZATION[pol]
+
+
+def getSatelliteNameFromXML(orbital_position):
+    start = perf_counter()
+    name = getSatelliteName(convertOrbitalPos(orbital_position))
+    profiler.record("xml", start)
+    return name or formatOrbitalPos(orbital_position)
+
+
+def convertOrbitalPos(pos):
+    if pos > 1800:
+        return pos - 3600
+    else:
+        return pos
+
+
+def formatOrbitalPos(pos):
+    pos = convertOrbitalPos(pos)
+    if pos < 0:
+        return f"{abs(pos) / 10.0:.1f}W"
+    else:
+        return f"{pos / 10.0:.1f}E"
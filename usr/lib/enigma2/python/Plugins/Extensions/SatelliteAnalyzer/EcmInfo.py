@@ -0,0 +1,177 @@
+# EcmInfo.py
+# Watches /tmp/ecm.info with stat() only and reparses it when the softcam rewrites it.
+# Understands the OSCam/NCam, CCcam, mgcamd and wicardd flavours of the file.
+import os
+import re
+from collections import OrderedDict, deque
+
+ECM_INFO = "/tmp/ecm.info"
+
+# Bounded latency history: samples per reader and number of readers kept
+LATENCY_SAMPLES = 64
+LATENCY_READERS = 16
+
+# "===== Viaccess ECM on CaID 0x0500, pid 0x06af =====" (mgcamd and friends)
+_ECM_ON_CAID = re.compile(r"(?:=+\s*)?(?:(.*?)\s+)?ECM on CaID\s+(0x[0-9a-fA-F]+),\s*pid\s+(0x[0-9a-fA-F]+)", re.I)
+_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+# Different softcams, different names for the same thing
+_KEYS = {
+    "caid": "caid",
+    "pid": "pid",
+    "prov": "prov",
+    "provid": "prov",
+    "provider": "provider",
+    "chid": "chid",
+    "system": "system",
+    "reader": "reader",
+    "from": "source",
+    "source": "source",
+    "address": "source",
+    "protocol": "protocol",
+    "using": "protocol",
+    "decode": "protocol",
+    "hops": "hops",
+    "ecm time": "ecm_time",
+    "msec": "ecm_time",
+    "response time": "ecm_time",
+}
+
+
+class EcmRecord(object):
+    __slots__ = ("caid", "pid", "prov", "provider", "chid", "system", "reader",
+                 "source", "protocol", "hops", "ecm_time")
+
+    def __init__(self):
+        self.caid = None
+        self.pid = None
+        self.prov = None
+        self.provider = ""
+        self.chid = None
+        self.system = ""
+        self.reader = ""
+        self.source = ""
+        self.protocol = ""
+        self.hops = None
+        # Milliseconds
+        self.ecm_time = None
+
+
+def _parseHex(value):
+    value = value.split()
+    try:
+        return int(value[0], 16)
+    except (IndexError, ValueError):
+        return None
+
+
+def _parseEcmTime(key, value):
+    match = _NUMBER.search(value)
+    if not match:
+        return None
+    number = float(match.group())
+    # msec: 352 / ecm time: 352 ms are already in ms, everything else is in seconds
+    if key == "msec" or "ms" in value.lower():
+        return int(number)
+    return int(number * 1000)
+
+
+def parseEcmInfo(text):
+    record = EcmRecord()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _ECM_ON_CAID.search(line)
+        if match:
+            if match.group(1):
+                record.system = match.group(1).strip("= ").strip()
+            record.caid = _parseHex(match.group(2))
+            record.pid = _parseHex(match.group(3))
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip().lower()
+        value = value.strip()
+        field = _KEYS.get(key)
+        if field is None:
+            continue
+        if field in ("caid", "pid", "prov", "chid"):
+            # mgcamd writes "prov: 032830, ..." without the 0x prefix
+            number = _parseHex(value.split(",")[0])
+            if number is not None:
+                setattr(record, field, number)
+        elif field == "hops":
+            match = _NUMBER.search(value)
+            record.hops = int(match.group()) if match else None
+        elif field == "ecm_time":
+            record.ecm_time = _parseEcmTime(key, value)
+        elif field == "source":
+            # OSCam: "source: net (cccam at 1.2.3.4:12000)"
+            record.source = value
+        else:
+            setattr(record, field, value)
+    if record.caid is None:
+        return None
+    return record
+
+
+class EcmMonitor(object):
+    def __init__(self, path=ECM_INFO):
+        self.path = path
+        self.stamp = None
+        self.record = None
+        self.latency = OrderedDict()
+
+    def poll(self):
+        # Returns True when the file changed since the last poll
+        changed = self.read()
+        if changed is None:
+            return False
+        return self.apply(*changed)
+
+    def read(self):
+        # (stamp, record) when the file changed, else None; touches no state, so it
+        # can run off the GUI thread with apply() called on it afterwards
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_ino, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self.stamp:
+            return None
+        if stamp is None:
+            return None, None
+        try:
+            with open(self.path, "r", errors="replace") as f:
+                record = parseEcmInfo(f.read())
+        except OSError:
+            record = None
+        return stamp, record
+
+    def apply(self, stamp, record):
+        if stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        self.record = record
+        if record is not None and record.ecm_time is not None:
+            self.addLatency(record.reader or record.source or "?", record.ecm_time)
+        return True
+
+    def addLatency(self, reader, ecm_time):
+        samples = self.latency.get(reader)
+        if samples is None:
+            if len(self.latency) >= LATENCY_READERS:
+                self.latency.popitem(last=False)
+            samples = self.latency[reader] = deque(maxlen=LATENCY_SAMPLES)
+        else:
+            self.latency.move_to_end(reader)
+        samples.append(ecm_time)
+
+    def percentiles(self, reader):
+        samples = sorted(self.latency.get(reader, ()))
+        if not samples:
+            return None
+        last = len(samples) - 1
+        return samples[last // 2], samples[(last * 95 + 50) // 100], len(samples)
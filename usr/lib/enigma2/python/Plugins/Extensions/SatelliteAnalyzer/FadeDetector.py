@@ -0,0 +1,189 @@
+# FadeDetector.py
+# Streaming signal degradation (rain fade) detection: slow EWMA baselines of
+# SNR dB and log10 BER, and a one-sided CUSUM on each that accumulates only
+# deviations beyond half the configured drop. A fade is declared when either
+# sum crosses FADE_CUSUM_H drops; constant work and memory per sample.
+from math import exp, log10
+from time import strftime
+import os
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+EVENT_LOG = "/etc/enigma2/SatelliteAnalyzer/events.log"
+# The log is rotated to EVENT_LOG + ".1" at this size
+EVENT_LOG_MAX = 64 * 1024
+
+# Baseline time constant (s); slower changes are followed, not reported
+FADE_BASELINE_TAU = 300.0
+# Samples before the baseline is trusted
+FADE_WARMUP = 12
+# Decision threshold in units of the configured drop
+FADE_CUSUM_H = 3
+# Consecutive in-range samples that end a fade
+FADE_RECOVER_SAMPLES = 3
+
+FADE_START = "fade"
+FADE_END = "recovered"
+
+
+class FadeDetector(object):
+    __slots__ = ("alpha", "snr_drop", "ber_rise", "snr_base", "ber_base", "snr_cusum", "ber_cusum",
+        "samples", "faded", "calm", "snr_db", "ber")
+
+    def __init__(self, interval, snr_drop, ber_rise):
+        self.alpha = 1.0 - exp(-interval / FADE_BASELINE_TAU)
+        self.snr_drop = snr_drop
+        self.ber_rise = ber_rise
+        self.reset()
+
+    def reset(self):
+        self.snr_base = None
+        self.ber_base = None
+        self.snr_cusum = 0.0
+        self.ber_cusum = 0.0
+        self.samples = 0
+        self.faded = False
+        self.calm = 0
+        self.snr_db = 0.0
+        self.ber = 0
+
+    def update(self, snr_db, ber):
+        # -> FADE_START / FADE_END when the state changes, else None
+        self.snr_db = snr_db
+        self.ber = ber
+        ber_log = log10(1 + ber)
+        self.samples += 1
+        if self.snr_base is None:
+            self.snr_base = snr_db
+            self.ber_base = ber_log
+            return None
+
+        snr_slack = self.snr_drop / 2.0
+        ber_slack = self.ber_rise / 2.0
+        self.snr_cusum = max(0.0, self.snr_cusum + (self.snr_base - snr_db) - snr_slack)
+        self.ber_cusum = max(0.0, self.ber_cusum + (ber_log - self.ber_base) - ber_slack)
+
+        if self.faded:
+            if snr_db >= self.snr_base - snr_slack and ber_log <= self.ber_base + ber_slack:
+                self.calm += 1
+                if self.calm >= FADE_RECOVER_SAMPLES:
+                    self.faded = False
+                    self.snr_cusum = self.ber_cusum = 0.0
+                    return FADE_END
+            else:
+                self.calm = 0
+            return None
+
+        if self.snr_cusum == 0.0 and self.ber_cusum == 0.0:
+            # In control: let the baselines follow slow changes. Frozen otherwise,
+            # so a developing fade does not drag its own reference down
+            self.snr_base += self.alpha * (snr_db - self.snr_base)
+            self.ber_base += self.alpha * (ber_log - self.ber_base)
+        if self.samples < FADE_WARMUP:
+            self.snr_cusum = self.ber_cusum = 0.0
+            return None
+        if self.snr_cusum > FADE_CUSUM_H * self.snr_drop or self.ber_cusum > FADE_CUSUM_H * self.ber_rise:
+            self.faded = True
+            self.calm = 0
+            return FADE_START
+        return None
+
+
+def writeEvent(line):
+    try:
+        if os.path.exists(EVENT_LOG) and os.path.getsize(EVENT_LOG) > EVENT_LOG_MAX:
+            os.replace(EVENT_LOG, EVENT_LOG + ".1")
+        else:
+            os.makedirs(os.path.dirname(EVENT_LOG), exist_ok=True)
+        with open(EVENT_LOG, "a") as f:
+            f.write(f"{strftime('%Y-%m-%d %H:%M:%S')} {line}\n")
+    except OSError as e:
+        log.error("Cannot write event to %s: %s", EVENT_LOG, e)
+
+
+class FadeMonitor(object):
+    # Takes a sample of the shared sampler every fade_interval seconds
+    def __init__(self, session):
+        self.session = session
+        self.sampler = getSampler(session.nav)
+        self.service = None
+        self.events = 0
+        self.detector = None
+        self.running = False
+        self.configure()
+        for element in (settings.fade_interval, settings.fade_snr_drop, settings.fade_ber_rise):
+            element.addNotifier(self.configure, initial_call=False)
+
+    def configure(self, configElement=None):
+        self.interval = int(settings.fade_interval.value)
+        self.detector = FadeDetector(self.interval, float(settings.fade_snr_drop.value), float(settings.fade_ber_rise.value))
+        if self.running:
+            self.start()
+
+    def start(self):
+        self.sampler.subscribe(self.sample, self.interval * 1000)
+        self.running = True
+
+    def stop(self):
+        self.sampler.unsubscribe(self.sample)
+        self.running = False
+
+    def sample(self, sample):
+        if sample.service != self.service:
+            # New service, new baseline
+            self.service = sample.service
+            self.detector.reset()
+        if sample.signal is None:
+            return
+        snr_db, snr_percent, agc, ber = sample.signal
+        event = self.detector.update(snr_db, ber)
+        if event is not None:
+            self.report(event)
+
+    def report(self, event):
+        detector = self.detector
+        self.events += 1
+        current = self.session.nav.getCurrentService()
+        info = current and current.info()
+        name = info.getName() if info else ""
+        text = "%s %s: SNR %.1f dB (baseline %.1f dB), BER %d" % (
+            event.upper(), name, detector.snr_db, detector.snr_base, detector.ber)
+        log.warning("%s", text)
+        writeEvent(f"{text} [{self.service}]")
+        if event == FADE_START and settings.fade_popup.value:
+            from Screens.MessageBox import MessageBox
+            from Tools.Notifications import AddPopup
+            AddPopup(f"Signal degradation on {name}\nSNR {detector.snr_db:.1f} dB, baseline {detector.snr_base:.1f} dB",
+                MessageBox.TYPE_WARNING, 15, "SatelliteAnalyzerFade")
+
+    def getInfo(self):
+        detector = self.detector
+        if detector.snr_base is None:
+            return []
+        state = "FADE" if detector.faded else ("warming up" if detector.samples < FADE_WARMUP else "OK")
+        return [
+            f"FADE MONITOR ({self.interval} s): {state}",
+            "   Baseline: %.1f dB, CUSUM SNR %.1f/%.1f, BER %.1f/%.1f" % (
+                detector.snr_base, detector.snr_cusum, FADE_CUSUM_H * detector.snr_drop,
+                detector.ber_cusum, FADE_CUSUM_H * detector.ber_rise),
+            f"   Events: {self.events}",
+        ]
+
+
+_monitor = None
+
+
+def startMonitor(session):
+    global _monitor
+    if _monitor is None:
+        _monitor = FadeMonitor(session)
+    if not _monitor.running:
+        _monitor.start()
+    return _monitor
+
+
+def stopMonitor():
+    if _monitor is not None:
+        _monitor.stop()
@@ -0,0 +1,180 @@
+# Lamedb.py
+# Transponder/service index from /etc/enigma2/lamedb (v4) or lamedb5 (v5).
+# The file is memory-mapped and read in one pass; the result is kept in memory
+# and cached on disk until the file's mtime/size change.
+import mmap
+import os
+
+from Plugins.Extensions.SatelliteAnalyzer.Cache import fileStamp, loadCache, saveCache
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+
+LAMEDB_FILES = ("/etc/enigma2/lamedb", "/etc/enigma2/lamedb5")
+
+_CACHE_NAME = "lamedb.idx"
+_CACHE_VERSION = 1
+
+SERVICE_TYPES = {
+    1: "TV",
+    2: "Radio",
+    3: "Teletext",
+    10: "Radio",
+    12: "Data",
+    17: "TV HD",
+    22: "TV",
+    25: "TV HD",
+    31: "TV UHD",
+    32: "TV UHD",
+}
+
+# Field order of the transponder parameter line per delivery system, named
+# like the keys of the frontend transponder data dict
+_PARAM_FIELDS = {
+    "s": ("DVB-S", ("frequency", "symbol_rate", "polarization", "fec_inner", "orbital_position",
+        "inversion", "flags", "system", "modulation", "rolloff", "pilot")),
+    "c": ("DVB-C", ("frequency", "symbol_rate", "inversion", "modulation", "fec_inner", "flags", "system")),
+    "t": ("DVB-T", ("frequency", "bandwidth", "code_rate_hp", "code_rate_lp", "constellation",
+        "transmission_mode", "guard_interval", "hierarchy_information", "inversion", "flags", "system", "plp_id")),
+    "a": ("ATSC", ("frequency", "inversion", "modulation", "flags", "system")),
+}
+
+# (transponders, services), both keyed by (namespace, onid, tsid):
+#   transponders[key] = raw frontend parameter string ("s 11778000:27500000:...")
+#   services[key] = [(sid, service_type, name, provider, caids), ...]
+_index = ({}, {})
+_stamp = None
+_path = None
+
+
+def _parseServiceData(data):
+    # "p:ARD,c:001401,c:011402,C:0d95,C:1830,f:01"
+    provider = ""
+    caids = []
+    for item in data.split(","):
+        tag = item[:2]
+        if tag == "p:":
+            provider = item[2:]
+        elif tag == "C:":
+            try:
+                caids.append(int(item[2:6], 16))
+            except ValueError:
+                pass
+    return provider, tuple(caids)
+
+
+def _addService(services, head, name, data):
+    # head: sid:namespace:tsid:onid:type:number[:source_id]
+    parts = head.split(b":")
+    key = (int(parts[1], 16), int(parts[3], 16), int(parts[2], 16))
+    provider, caids = _parseServiceData(data.decode("utf-8", "replace"))
+    service = (int(parts[0], 16), int(parts[4]), name.decode("utf-8", "replace"), provider, caids)
+    services.setdefault(key, []).append(service)
+
+
+def _transponderKey(head):
+    # namespace:tsid:onid
+    parts = head.split(b":")
+    return (int(parts[0], 16), int(parts[2], 16), int(parts[1], 16))
+
+
+def _parseV4(mm, transponders, services):
+    readline = mm.readline
+    section = None
+    while True:
+        line = readline()
+        if not line:
+            break
+        line = line.rstrip(b"\r\n")
+        if line == b"end":
+            section = None
+        elif line == b"transponders" or line == b"services":
+            section = line
+        elif section == b"transponders":
+            params = readline().strip()
+            readline()  # "/"
+            transponders[_transponderKey(line)] = params.decode("ascii", "replace")
+        elif section == b"services":
+            name = readline().rstrip(b"\r\n")
+            data = readline().rstrip(b"\r\n")
+            _addService(services, line, name, data)
+
+
+def _parseV5(mm, transponders, services):
+    readline = mm.readline
+    while True:
+        line = readline()
+        if not line:
+            break
+        line = line.rstrip(b"\r\n")
+        tag = line[:2]
+        if tag == b"t:":
+            head, _, params = line[2:].partition(b",")
+            # Same layout as the v4 parameter line, minus the space
+            params = params.decode("ascii", "replace")
+            transponders[_transponderKey(head)] = params[:1] + " " + params[2:]
+        elif tag == b"s:":
+            head, _, rest = line[2:].partition(b",")
+            end = rest.find(b'"', 1)
+            if rest[:1] != b'"' or end < 0:
+                continue
+            _addService(services, head, rest[1:end], rest[end + 2:])
+
+
+def parseLamedb(path):
+    transponders = {}
+    services = {}
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return transponders, services
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = mm.readline()
+            if b"/5/" in header:
+                _parseV5(mm, transponders, services)
+            else:
+                _parseV4(mm, transponders, services)
+    return transponders, services
+
+
+def getLamedbIndex():
+    global _index, _stamp, _path
+    path = next((p for p in LAMEDB_FILES if os.path.exists(p)), None)
+    stamp = path and fileStamp(path)
+    if stamp == _stamp and path == _path:
+        return _index
+    if not stamp:
+        _index, _stamp, _path = ({}, {}), None, None
+        return _index
+
+    index = loadCache(_CACHE_NAME, stamp + (path,), _CACHE_VERSION)
+    if index is None:
+        try:
+            index = parseLamedb(path)
+        except Exception as e:
+            log.error("Cannot parse %s: %s", path, e)
+            index = ({}, {})
+        else:
+            saveCache(_CACHE_NAME, stamp + (path,), _CACHE_VERSION, index)
+    _index, _stamp, _path = index, stamp, path
+    return _index
+
+
+def getTransponderServices(namespace, onid, tsid):
+    return getLamedbIndex()[1].get((namespace & 0xFFFFFFFF, onid, tsid), ())
+
+
+def getTransponderParams(namespace, onid, tsid):
+    return getLamedbIndex()[0].get((namespace & 0xFFFFFFFF, onid, tsid))
+
+
+def parseTransponderParams(params):
+    # "s 11778000:27500000:1:3:192:2:0:1:2:0:2" -> {"tuner_type": "DVB-S", "frequency": 11778000, ...}
+    kind, _, values = params.partition(" ")
+    tuner_type, fields = _PARAM_FIELDS.get(kind, (None, ()))
+    if tuner_type is None:
+        return {}
+    data = {"tuner_type": tuner_type}
+    for field, value in zip(fields, values.split(":")):
+        try:
+            data[field] = int(value)
+        except ValueError:
+            pass
+    return data
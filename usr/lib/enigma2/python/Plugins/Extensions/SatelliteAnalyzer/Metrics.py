@@ -0,0 +1,215 @@
+# Metrics.py
+# Optional HTTP endpoint for central monitoring: /metrics in the Prometheus text
+# format and /status.json. Both bodies are rebuilt once per sample and served as
+# prebuilt bytes, so a scrape costs no driver call and no formatting; it runs on
+# enigma2's own twisted reactor and never blocks the GUI.
+import json
+from time import time
+
+from enigma import iServiceInformation
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+try:
+    from twisted.internet import reactor
+    from twisted.web.resource import Resource
+    from twisted.web.server import Site
+except ImportError:
+    reactor = None
+    Resource = object
+
+METRICS_PREFIX = "satelliteanalyzer_"
+PROMETHEUS_TYPE = b"text/plain; version=0.0.4; charset=utf-8"
+JSON_TYPE = b"application/json"
+METRICS_PATHS = (b"/metrics", b"/status.json")
+
+# Gauges in output order; a value of None leaves the sample out
+_GAUGES = (
+    ("locked", "1 when the tuner is locked"),
+    ("snr_db", "Signal to noise ratio (dB)"),
+    ("snr_percent", "Signal quality (%)"),
+    ("agc_percent", "Signal power / AGC (%)"),
+    ("ber", "Bit error rate as reported by the driver"),
+    ("caid", "CAID of the last ECM, 0 for free-to-air"),
+    ("ecm_time_ms", "Response time of the last ECM (ms)"),
+    ("sample_timestamp_seconds", "Unix time of the sample"),
+)
+
+
+def escapeLabel(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def formatPrometheus(labels, values, samples):
+    label_text = ",".join(f'{key}="{escapeLabel(value)}"' for key, value in labels.items())
+    lines = []
+    for name, help_text in _GAUGES:
+        value = values.get(name)
+        if value is None:
+            continue
+        lines.append(f"# HELP {METRICS_PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {METRICS_PREFIX}{name} gauge")
+        lines.append(f"{METRICS_PREFIX}{name}{{{label_text}}} {value}")
+    lines.append(f"# HELP {METRICS_PREFIX}samples_total Samples taken since the endpoint started")
+    lines.append(f"# TYPE {METRICS_PREFIX}samples_total counter")
+    lines.append(f"{METRICS_PREFIX}samples_total {samples}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def formatStatus(labels, values, samples, reader):
+    status = dict(labels)
+    status.update(values)
+    status["reader"] = reader
+    status["samples"] = samples
+    return json.dumps(status, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+class MetricsCollector(object):
+    # Takes a sample of the shared sampler every metrics_interval seconds and prebuilds the responses
+    def __init__(self, session):
+        self.session = session
+        self.sampler = getSampler(session.nav)
+        self.running = False
+        self.service = None
+        self.labels = {}
+        self.samples = 0
+        # path -> (body, content type); replaced as a whole, so a scrape sees one sample
+        self.responses = {}
+        settings.metrics_interval.addNotifier(self.configure, initial_call=False)
+
+    def configure(self, configElement=None):
+        if self.running:
+            self.start()
+
+    def start(self):
+        # The last shared sample if there is one, otherwise the first tick fills the responses
+        if self.sampler.sample is not None:
+            self.sample(self.sampler.sample)
+        self.sampler.subscribe(self.sample, int(settings.metrics_interval.value) * 1000)
+        self.running = True
+
+    def stop(self):
+        self.sampler.unsubscribe(self.sample)
+        self.running = False
+
+    def sample(self, sample):
+        service = sample.service
+        if service != self.service:
+            # Service labels change only on a zap, so they are read only then
+            self.service = service
+            self.labels = self.readLabels(sample.ref)
+        self.samples += 1
+
+        values = dict.fromkeys(name for name, help_text in _GAUGES)
+        values["sample_timestamp_seconds"] = int(time())
+        if sample.signal is not None:
+            snr_db, snr_percent, agc, ber = sample.signal
+            values.update(snr_db=snr_db, snr_percent=snr_percent, agc_percent=agc, ber=ber,
+                locked=1 if sample.locked else 0)
+        elif service:
+            values["locked"] = 0
+        record = sample.ecm
+        reader = ""
+        if record is not None:
+            values["caid"] = record.caid
+            values["ecm_time_ms"] = record.ecm_time
+            reader = record.reader or record.source
+        elif service:
+            values["caid"] = 0
+        self.responses = {
+            b"/metrics": (formatPrometheus(self.labels, values, self.samples), PROMETHEUS_TYPE),
+            b"/status.json": (formatStatus(self.labels, values, self.samples, reader), JSON_TYPE),
+        }
+
+    def readLabels(self, ref):
+        if not ref:
+            return {}
+        labels = {
+            "sid": f"0x{ref.getUnsignedData(1):04X}",
+            "tsid": f"0x{ref.getUnsignedData(2):04X}",
+            "onid": f"0x{ref.getUnsignedData(3):04X}",
+            "namespace": f"0x{ref.getUnsignedData(4):08X}",
+            "service": "",
+            "provider": "",
+        }
+        service = self.session.nav.getCurrentService()
+        info = service and service.info()
+        if info:
+            try:
+                labels["service"] = info.getName() or ""
+                labels["provider"] = info.getInfoString(iServiceInformation.sProvider) or ""
+            except Exception as e:
+                log.warning("Cannot read service name for metrics: %s", e)
+        return labels
+
+
+class MetricsResource(Resource):
+    isLeaf = True
+
+    def __init__(self, collector):
+        Resource.__init__(self)
+        self.collector = collector
+
+    def render_GET(self, request):
+        response = self.collector.responses.get(request.path)
+        if response is None and request.path in METRICS_PATHS:
+            # Started, but the first sample has not arrived yet
+            request.setResponseCode(503)
+            return b"No sample yet\n"
+        if response is None:
+            request.setResponseCode(404)
+            return b"Not found\n"
+        body, content_type = response
+        request.setHeader(b"Content-Type", content_type)
+        return body
+
+
+_collector = None
+_port = None
+
+
+def listen():
+    global _port
+    port = int(settings.metrics_port.value)
+    site = Site(MetricsResource(_collector))
+    site.noisy = False
+    try:
+        _port = reactor.listenTCP(port, site)
+    except Exception as e:
+        log.error("Cannot start metrics endpoint on port %d: %s", port, e)
+        _port = None
+        return
+    log.info("Metrics endpoint listening on port %d", port)
+
+
+def portChanged(configElement):
+    global _port
+    if _port is not None:
+        _port.stopListening()
+        _port = None
+        listen()
+
+
+def startMetrics(session):
+    global _collector
+    if reactor is None:
+        log.error("twisted.web is not available, metrics endpoint disabled")
+        return None
+    if _collector is None:
+        _collector = MetricsCollector(session)
+        settings.metrics_port.addNotifier(portChanged, initial_call=False)
+    _collector.start()
+    if _port is None:
+        listen()
+    return _collector
+
+
+def stopMetrics():
+    global _port
+    if _port is not None:
+        _port.stopListening()
+        _port = None
+    if _collector is not None:
+        _collector.stop()
@@ -0,0 +1,104 @@
+# Render.py
+# Change-driven rendering for the analyzer screen. Panes are built from
+# precompiled line templates, and a line is formatted again only when one of
+# its own fields changed. Widgets are written only when their text or bar
+# value actually differs from what they already show.
+from operator import itemgetter
+from string import Formatter
+
+
+class LineTemplate(object):
+    __slots__ = ("fmt", "fields", "cache")
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        fields = []
+        for literal, field, spec, conversion in Formatter().parse(fmt):
+            if field and field not in fields:
+                fields.append(field)
+        self.fields = tuple(fields)
+        # (field values, text) swapped as one, so a reader never sees a half-updated pair
+        self.cache = ((), fmt.format()) if not fields else (None, None)
+
+    def fill(self, values):
+        # -> (text, True when it had to be formatted again)
+        args = tuple(values[field] for field in self.fields)
+        cached_args, text = self.cache
+        if args == cached_args:
+            return text, False
+        text = self.fmt.format_map(values)
+        self.cache = (args, text)
+        return text, True
+
+
+class TemplatePane(object):
+    # A block of LineTemplates joined with newlines
+    def __init__(self, lines):
+        self.lines = [LineTemplate(line) for line in lines]
+        # Static lines are formatted once, here
+        self.texts = [line.cache[1] for line in self.lines]
+        self.text = None
+        fields = []
+        for line in self.lines:
+            fields.extend(field for field in line.fields if field not in fields)
+        # All field values of the pane in one call; a pane with nothing changed is one comparison
+        self.getter = itemgetter(*fields) if fields else (lambda values: ())
+        self.args = None
+        self.filled = 0
+        self.reused = 0
+
+    def fill(self, values):
+        args = self.getter(values)
+        if args == self.args and self.text is not None:
+            self.reused += len(self.lines)
+            return self.text
+        self.args = args
+        changed = False
+        for index, line in enumerate(self.lines):
+            text, formatted = line.fill(values)
+            if formatted:
+                self.filled += 1
+                if text != self.texts[index]:
+                    self.texts[index] = text
+                    changed = True
+            else:
+                self.reused += 1
+        if changed or self.text is None:
+            self.text = "\n".join(self.texts)
+        return self.text
+
+
+class WidgetUpdater(object):
+    # setText/setValue on the screen's widgets, skipped when nothing would change
+    def __init__(self, screen):
+        self.screen = screen
+        self.shown = {}
+        self.performed = 0
+        self.skipped = 0
+
+    def setText(self, name, text):
+        if self.shown.get(name) == text:
+            self.skipped += 1
+            return False
+        self.shown[name] = text
+        self.screen[name].setText(text)
+        self.performed += 1
+        return True
+
+    def setValue(self, name, value):
+        # Bars are drawn in whole units, a smaller move would not change a pixel
+        value = int(value)
+        if self.shown.get(name) == value:
+            self.skipped += 1
+            return False
+        self.shown[name] = value
+        self.screen[name].setValue(value)
+        self.performed += 1
+        return True
+
+    def forget(self, name=None):
+        # The widget was changed behind our back; the next write goes through
+        if name is None:
+            self.shown.clear()
+        else:
+            self.shown.pop(name, None)
@@ -0,0 +1,199 @@
+# Sampler.py
+# Process-wide signal sampler shared by the analyzer screen, the background
+# monitors and the skin converter: one frontend status read per tick however
+# many subscribers there are, service-level data (satellite, CAIDs) read only
+# when the service changes. Ticks at the fastest subscriber's rate and stops
+# when the last subscriber leaves. The satellite name (satellites.xml, CAID
+# database) is looked up on a worker thread and shows up a tick later.
+from time import monotonic, perf_counter
+
+from enigma import eTimer, iPlayableService, iServiceInformation
+
+from Plugins.Extensions.SatelliteAnalyzer.CaidTable import loadCaidDatabase
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log, profiler
+from Plugins.Extensions.SatelliteAnalyzer.Decoders import getCaName, getSatelliteNameFromXML
+from Plugins.Extensions.SatelliteAnalyzer.EcmInfo import EcmMonitor
+from Plugins.Extensions.SatelliteAnalyzer.Snapshot import serviceStatus, signalFromStatus
+from Plugins.Extensions.SatelliteAnalyzer.Worker import Worker
+
+# ecm.info lives in tmpfs; it is stat()ed at most this often (s)
+ECM_POLL_INTERVAL = 1.0
+
+
+class Sample(object):
+    __slots__ = ("time", "service", "ref", "signal", "locked", "satellite", "caids", "ecm", "ecm_changed")
+
+    def __init__(self, time, service, ref, signal, locked, satellite, caids, ecm, ecm_changed):
+        self.time = time
+        # Service reference string, None when nothing is playing
+        self.service = service
+        self.ref = ref
+        # (snr_db, snr_percent, agc, ber) or None
+        self.signal = signal
+        self.locked = locked
+        self.satellite = satellite
+        self.caids = caids
+        # Latest EcmRecord or None
+        self.ecm = ecm
+        self.ecm_changed = ecm_changed
+
+    @property
+    def caid(self):
+        # The CAID being decoded, else the first one the service lists
+        if self.ecm is not None:
+            return self.ecm.caid
+        return self.caids[0] if self.caids else None
+
+    @property
+    def caName(self):
+        caid = self.caid
+        if caid is None:
+            return "FTA" if self.service else ""
+        return getCaName(caid) or f"0x{caid:04X}"
+
+
+class _Subscriber(object):
+    __slots__ = ("callback", "interval", "due")
+
+    def __init__(self, callback, interval):
+        self.callback = callback
+        self.interval = interval
+        self.due = 0.0
+
+
+class SignalSampler(object):
+    def __init__(self, nav):
+        self.nav = nav
+        self.ecm = EcmMonitor()
+        self.subscribers = []
+        self.interval = None
+        # Latest Sample, None before the first tick
+        self.sample = None
+        self.service = None
+        self.satellite = ""
+        self.caids = ()
+        self.ecm_due = 0.0
+        self.reads = 0
+        self.worker = Worker("SatelliteAnalyzerSampler")
+        self.timer = eTimer()
+        self.timer.callback.append(self.tick)
+
+    def __len__(self):
+        return len(self.subscribers)
+
+    def subscribe(self, callback, interval_ms):
+        # callback(sample) every interval_ms (rounded to the shared tick); one entry per callback
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber.callback != callback]
+        self.subscribers.append(_Subscriber(callback, interval_ms / 1000.0))
+        # A re-subscribing only subscriber finds the hook already there
+        if self.serviceEvent not in self.nav.event:
+            self.nav.event.append(self.serviceEvent)
+        self.arm()
+
+    def unsubscribe(self, callback):
+        self.subscribers = [subscriber for subscriber in self.subscribers if subscriber.callback != callback]
+        if not self.subscribers and self.serviceEvent in self.nav.event:
+            self.nav.event.remove(self.serviceEvent)
+        self.arm()
+
+    def arm(self):
+        if not self.subscribers:
+            self.timer.stop()
+            self.interval = None
+            self.worker.stop()
+            return
+        interval = min(subscriber.interval for subscriber in self.subscribers)
+        if interval != self.interval:
+            self.interval = interval
+            self.timer.start(int(interval * 1000), False)
+
+    def serviceEvent(self, event):
+        # The PMT (CAIDs) and transponder data arrive after the zap itself
+        if event in (iPlayableService.evStart, iPlayableService.evUpdatedInfo, iPlayableService.evTunedIn):
+            self.service = None
+
+    def tick(self):
+        sample = self.read()
+        now = monotonic()
+        # Half a tick of slack so a subscriber on the tick rate is never skipped by jitter
+        slack = self.interval / 2 if self.interval else 0
+        for subscriber in list(self.subscribers):
+            if subscriber.due <= now + slack:
+                subscriber.due = now + subscriber.interval
+                try:
+                    subscriber.callback(sample)
+                except Exception as e:
+                    log.error("Sampler subscriber %s failed: %s", subscriber.callback, e)
+
+    def read(self):
+        start = perf_counter()
+        self.reads += 1
+        service = self.nav.getCurrentService()
+        ref = self.nav.getCurrentlyPlayingServiceReference()
+        key = ref.toString() if ref and service else None
+        if key != self.service:
+            self.service = key
+            self.readService(service)
+        if not self.worker.idle or self.worker.mailbox.slots:
+            self.checkMailbox()
+        status = serviceStatus(service) if key else None
+        profiler.record("sample", start)
+
+        now = monotonic()
+        ecm_changed = False
+        if now >= self.ecm_due:
+            self.ecm_due = now + ECM_POLL_INTERVAL
+            start = perf_counter()
+            ecm_changed = self.ecm.poll()
+            profiler.record("ecm", start)
+        signal = signalFromStatus(status) if status is not None else None
+        locked = bool(status.get("tuner_locked")) if status is not None else False
+        self.sample = Sample(now, key, ref, signal, locked, self.satellite, self.caids, self.ecm.record, ecm_changed)
+        return self.sample
+
+    def readService(self, service):
+        self.satellite = ""
+        self.caids = ()
+        if not service:
+            return
+        frontendInfo = service.frontendInfo()
+        try:
+            data = frontendInfo and frontendInfo.getTransponderData(True)
+        except Exception:
+            data = None
+        if data:
+            tuner_type = data.get("tuner_type", "")
+            if tuner_type == "DVB-S":
+                self.submitLookup(self.service, data.get("orbital_position", 0))
+            else:
+                self.satellite = tuner_type
+        info = service.info()
+        try:
+            self.caids = tuple(info.getInfoObject(iServiceInformation.sCAIDs) or ()) if info else ()
+        except Exception:
+            self.caids = ()
+
+    def submitLookup(self, key, orbital_position):
+        def lookup():
+            loadCaidDatabase()
+            return key, getSatelliteNameFromXML(orbital_position)
+        self.worker.submit("service", lookup)
+
+    def checkMailbox(self):
+        result = self.worker.mailbox.take().get("service")
+        # A lookup for the service before the last zap is dropped
+        if result is not None and result[0] == self.service:
+            self.satellite = result[1]
+
+
+_sampler = None
+
+
+def getSampler(nav=None):
+    global _sampler
+    if _sampler is None:
+        if nav is None:
+            import NavigationInstance
+            nav = NavigationInstance.instance
+        _sampler = SignalSampler(nav)
+    return _sampler
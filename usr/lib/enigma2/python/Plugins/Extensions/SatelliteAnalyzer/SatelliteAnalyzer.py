@@ -1,14 +1,37 @@
 # SatelliteAnalyzer.py
-from enigma import eServiceCenter, eServiceReference, iServiceInformation, eTimer
+from enigma import eServiceCenter, eServiceReference, iPlayableService, ePoint
 from Tools.Directories import fileExists, resolveFilename, SCOPE_PLUGINS
 from Screens.Screen import Screen
+from Screens.MessageBox import MessageBox
 from Components.Pixmap import Pixmap
 from Components.Label import Label
 from Components.ScrollLabel import ScrollLabel
 from Components.ActionMap import ActionMap
 from Components.ProgressBar import ProgressBar
-import os
-import xml.etree.ElementTree as ET
+from Components.ServiceEventTracker import ServiceEventTracker
+from Plugins.Extensions.SatelliteAnalyzer.Snapshot import takeSnapshot
+from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+from Plugins.Extensions.SatelliteAnalyzer.SignalHistory import SignalHistory
+from Plugins.Extensions.SatelliteAnalyzer.Alignment import AlignmentMeter, readAlignment, ALIGN_INTERVAL
+from Plugins.Extensions.SatelliteAnalyzer.CaidTable import loadCaidDatabase
+from Plugins.Extensions.SatelliteAnalyzer.Decoders import (getCaName, getFec, getModulation, getSystem,
+    getPolarization, getSatelliteNameFromXML, convertOrbitalPos, decodeFrontend, frontendLabels, PLS_MODE)
+from Plugins.Extensions.SatelliteAnalyzer.SatelliteIndex import matchTransponder, MATCH_TOLERANCE
+from Plugins.Extensions.SatelliteAnalyzer.BouquetReport import BouquetReport, getCurrentBouquet
+from Plugins.Extensions.SatelliteAnalyzer.Lamedb import getTransponderServices, SERVICE_TYPES
+from Plugins.Extensions.SatelliteAnalyzer.Scheduler import RefreshScheduler
+from Plugins.Extensions.SatelliteAnalyzer.Worker import Worker
+from Plugins.Extensions.SatelliteAnalyzer.Render import TemplatePane, WidgetUpdater
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log, profiler, PROFILE_DUMP
+from Plugins.Extensions.SatelliteAnalyzer.TsAnalyzer import TsAnalyzer, TsFileSource, TsLiveSource, PCR_MAX_INTERVAL
+from Plugins.Extensions.SatelliteAnalyzer.FadeDetector import startMonitor, stopMonitor
+from Plugins.Extensions.SatelliteAnalyzer.SiTables import SiTables, formatDelivery, PAT_PID, NIT_PID, SDT_PID
+from time import monotonic, perf_counter
+
+
+def formatPid(pid):
+    return f"0x{pid:X}" if pid >= 0 else "Nema"
 
 
 class SatelliteAnalyzer(Screen):
@@ -29,20 +52,54 @@ class SatelliteAnalyzer(Screen):
                 backgroundColor="red" font="Regular;24" halign="center" valign="center" />
         <widget name="key_green" position="1440,600" size="320,40" 
                 backgroundColor="green" font="Regular;24" halign="center" valign="center" />
+        <widget name="key_yellow" position="1440,660" size="320,40" 
+                backgroundColor="yellow" foregroundColor="black" font="Regular;24" halign="center" valign="center" />
+        <widget name="key_blue" position="1440,720" size="320,40" 
+                backgroundColor="blue" font="Regular;24" halign="center" valign="center" />
         <!-- LEVO: Osnovni info -->
-        <widget name="info_left" position="20,20" size="680,800" 
+        <widget name="info_left" position="20,20" size="680,700" 
                 font="Console;24" transparent="1" />
         <!-- SREDINA: Kodiranje, Signal, SI/TS/ONID -->
-        <widget name="info_center" position="720,20" size="680,800" 
+        <widget name="info_center" position="720,20" size="680,700" 
                 font="Console;24" transparent="1" />
+        <!-- Podesavanje antene: veliki prikaz umesto panela -->
+        <widget name="align_info" position="20,20" size="1380,700" 
+                font="Regular;54" halign="center" valign="center" transparent="1" />
         <!-- DONJI DEO: SNR i AGC TRAKE -->
-        <widget name="snr_label" position="20,820" size="100,24" font="Regular;20" halign="left" valign="center" foregroundColor="white" />
-        <widget name="snr_bar" position="120,820" size="1180,24" pixmap="/usr/lib/enigma2/python/Plugins/Extensions/SatelliteAnalyzer/icon_snr.png" borderWidth="2" borderColor="green" />
-        <widget name="agc_label" position="20,864" size="100,24" font="Regular;20" halign="left" valign="center" foregroundColor="white" />
-        <widget name="agc_bar" position="120,864" size="1180,24" pixmap="/usr/lib/enigma2/python/Plugins/Extensions/SatelliteAnalyzer/icon_agc.png" borderWidth="2" borderColor="green" />
+        <widget name="snr_label" position="20,730" size="100,24" font="Regular;20" halign="left" valign="center" foregroundColor="white" />
+        <widget name="snr_bar" position="120,730" size="1180,24" pixmap="/usr/lib/enigma2/python/Plugins/Extensions/SatelliteAnalyzer/icon_snr.png" borderWidth="2" borderColor="green" />
+        <widget name="snr_graph" position="120,756" size="1180,36" font="Console;20" halign="right" valign="bottom" foregroundColor="green" transparent="1" />
+        <widget name="agc_label" position="20,806" size="100,24" font="Regular;20" halign="left" valign="center" foregroundColor="white" />
+        <widget name="agc_bar" position="120,806" size="1180,24" pixmap="/usr/lib/enigma2/python/Plugins/Extensions/SatelliteAnalyzer/icon_agc.png" borderWidth="2" borderColor="green" />
+        <widget name="agc_graph" position="120,832" size="1180,36" font="Console;20" halign="right" valign="bottom" foregroundColor="green" transparent="1" />
+        <widget name="snr_peak" position="118,726" size="4,32" backgroundColor="yellow" zPosition="2" />
+        <widget name="agc_peak" position="118,802" size="4,32" backgroundColor="yellow" zPosition="2" />
     </screen>
     """
 
+    # Number of sparkline columns under the SNR/AGC bars
+    GRAPH_WIDTH = 96
+    # Refresh cadences (ms) for the scheduler tasks
+    CLOCK_INTERVAL = 1000
+    CENTER_INTERVAL = 1000
+    # Background results are picked up this often while a job is outstanding
+    MAILBOX_INTERVAL = 40
+    # TS analysis page: packets are pulled every TS_INTERVAL ms, at most TS_BATCHES batches per tick
+    TS_INTERVAL = 500
+    TS_BATCHES = 4
+    # PIDs listed on the TS page besides the service's own
+    MAX_TS_PIDS = 12
+    # PSI/SI tables are read in the background; from a recording only the first SI_FILE_PACKETS
+    SI_INTERVAL = 1000
+    SI_BATCHES = 2
+    SI_FILE_PACKETS = 65536
+    # In alignment mode the AGC bar shows SNR dB, full scale = 100 / ALIGN_DB_SCALE dB
+    ALIGN_DB_SCALE = 5
+    # Bouquet report: one chunk of services per tick while it runs
+    REPORT_INTERVAL = 20
+    # Neighbour services listed from lamedb before "... and N more"
+    MAX_NEIGHBOURS = 30
+
     def __init__(self, session):
         Screen.__init__(self, session)
         self["info_left"] = ScrollLabel("")
@@ -50,6 +107,8 @@ class SatelliteAnalyzer(Screen):
         self["time"] = Label("")
         self["key_red"] = Label("Back")
         self["key_green"] = Label("Update")
+        self["key_yellow"] = Label("Alignment")
+        self["key_blue"] = Label("Bouquet report")
         self["background"] = Pixmap()
 
         # Trake
@@ -57,487 +116,792 @@ class SatelliteAnalyzer(Screen):
         self["snr_bar"] = ProgressBar()
         self["agc_label"] = Label("AGC:")
         self["agc_bar"] = ProgressBar()
-
-        self["actions"] = ActionMap(["OkCancelActions", "ColorActions", "DirectionActions"],
+        self["snr_graph"] = Label("")
+        self["agc_graph"] = Label("")
+        self["align_info"] = Label("")
+        self["snr_peak"] = Label("")
+        self["agc_peak"] = Label("")
+        for name in ("align_info", "snr_peak", "agc_peak"):
+            self[name].hide()
+
+        self["actions"] = ActionMap(["OkCancelActions", "ColorActions", "DirectionActions", "NumberActions", "MenuActions"],
             {
                 "ok": self.close,
                 "cancel": self.close,
                 "red": self.close,
                 "green": self.updateInfo,
+                "yellow": self.toggleAlignment,
+                "blue": self.startReport,
                 "up": self["info_left"].pageUp,
                 "down": self["info_left"].pageDown,
+                # Skrivena debug strana: 0 prikazuje profil, 9 ga snima u fajl
+                "0": self.toggleDebugPage,
+                "9": self.dumpProfile,
+                # 1: analiza transport strima (bitrate po PID-u, CC greske, PCR)
+                "1": self.toggleTsPage,
+                # Menu: podesavanja (monitor slabljenja, metrics, log signala)
+                "menu": self.openSetup,
             }, -2)
 
-        # Tajmer za vreme
-        self.time_update_timer = eTimer()
-        self.time_update_timer.callback.append(self.updateTime)
-        self.time_update_timer.start(1000)
-        self.onClose.append(self.time_update_timer.stop)
-
-        # Tajmer za signal
-        self.signal_update_timer = eTimer()
-        self.signal_update_timer.callback.append(self.updateAllInfo)
-        self.signal_update_timer.start(5000)
-        self.onClose.append(self.signal_update_timer.stop)
-
-        self.onLayoutFinish.append(self.updateInfo)
+        self.snapshot = None
+        self.neighbour_lines = []
+        self.signal = None
+        # Widgeti se crtaju samo kad se tekst ili vrednost trake stvarno promeni
+        self.widgets = WidgetUpdater(self)
+        self.basic_pane = TemplatePane(self.BASIC_LINES)
+        # tuner type -> pane of its tuning parameter lines
+        self.tuning_panes = {}
+        self.signal_pane = TemplatePane(self.SIGNAL_LINES)
+        self.ids_pane = TemplatePane(self.ID_LINES)
+        # Signal i ECM dolaze iz zajednickog samplera (isti koji koriste monitori i skin konverter)
+        self.sampler = getSampler(session.nav)
+        self.ecm = self.sampler.ecm
+        self.debug_page = False
+        self.ts_page = False
+        self.ts = None
+        self.ts_source = None
+        self.ts_service = None
+        self.ts_error = None
+        self.ts_started = 0.0
+        self.si = SiTables()
+        self.si_source = None
+        self.si_service = None
+        self.si_packets = 0
+        # Radi i dok je ekran otvoren; posle zatvaranja samo ako je ukljucen u podesavanjima
+        self.fade = startMonitor(session)
+        self.align = AlignmentMeter()
+        self.align_mode = False
+        self.align_frontend = None
+        self.peak_pixels = [None, None]
+        self.report = None
+        self.worker = Worker()
+
+        self.sample_interval = int(settings.sample_interval.value)
+        self.history = SignalHistory(self.sample_interval)
+
+        # Jedan tajmer za sve: signal brzo, ECM na promenu fajla,
+        # staticki podaci servisa/transpondera samo na promenu servisa
+        self.scheduler = RefreshScheduler()
+        self.scheduler.add("clock", self.CLOCK_INTERVAL, self.updateTime)
+        self.scheduler.add("center", self.CENTER_INTERVAL, self.updateCenter)
+        self.scheduler.add("service", 0, self.updateAllInfo)
+        self.scheduler.add("align", 0, self.sampleAlignment)
+        self.scheduler.add("report", 0, self.stepReport)
+        self.scheduler.add("ts", 0, self.sampleTs)
+        self.scheduler.add("si", 0, self.sampleSi)
+        self.scheduler.add("mailbox", 0, self.checkMailbox)
+
+        self.__event_tracker = ServiceEventTracker(screen=self, eventmap={
+            iPlayableService.evStart: self.serviceChanged,
+            iPlayableService.evTunedIn: self.serviceChanged,
+            iPlayableService.evUpdatedInfo: self.serviceChanged,
+        })
+
+        # Uzorkovanje staje dok je ekran sakriven ili ispod drugog dijaloga
+        self.onShow.append(self.resumeRefresh)
+        self.onHide.append(self.pauseRefresh)
+        self.onClose.append(self.pauseRefresh)
+        self.onClose.append(self.worker.stop)
+        self.onClose.append(self.abortReport)
+        self.onClose.append(self.stopTsAnalysis)
+        self.onClose.append(self.stopSiTables)
+        self.onClose.append(self.releaseFadeMonitor)
 
     def updateTime(self):
         try:
             import time
             t = time.strftime("%H:%M:%S")
-            self["time"].setText(t)
+            self.widgets.setText("time", t)
         except:
             pass
 
     def updateInfo(self):
-        self.updateAllInfo()
-
-    def updateAllInfo(self):
-        left_text = self.getBasicInfo()
-        center_text = self.getAdvancedInfo()
-        self["info_left"].setText(left_text)
-        self["info_center"].setText(center_text)
-        snr_db, snr_percent, ber, agc, is_crypted, sid, tsid, onid = self.getSignalFromFrontend()
-        self.updateSignalBars(snr_percent, agc)
-
-    def updateSignalBars(self, snr_percent, agc):
-        print(f"[SatelliteAnalyzer] Update signal bars: SNR={snr_percent}%, AGC={agc}%")
+        if self.align_mode:
+            self.align.reset()
+        else:
+            self.serviceChanged()
+
+    def openSetup(self):
+        from Plugins.Extensions.SatelliteAnalyzer.Setup import SatelliteAnalyzerSetup
+        self.session.open(SatelliteAnalyzerSetup)
+
+    def resumeRefresh(self):
+        # A zap may have happened while we were hidden
+        self.scheduler.trigger("service")
+        self.scheduler.start()
+        if not self.align_mode:
+            self.sampler.subscribe(self.sampleSignal, self.sample_interval)
+
+    def pauseRefresh(self):
+        self.scheduler.pause()
+        self.sampler.unsubscribe(self.sampleSignal)
+
+    def serviceChanged(self):
+        self.align_frontend = None
+        self.scheduler.trigger("service")
+
+    def toggleAlignment(self):
+        if self.align_mode:
+            self.stopAlignment()
+        else:
+            self.startAlignment()
+
+    def startAlignment(self):
+        self.align_mode = True
+        self.align.reset()
+        self.align_frontend = None
+        self.peak_pixels = [None, None]
+        for name in ("info_left", "info_center", "snr_graph", "agc_graph"):
+            self[name].hide()
+        for name in ("align_info", "snr_peak", "agc_peak"):
+            self[name].show()
+        self["snr_label"].setText("Q:")
+        self["agc_label"].setText("dB:")
+        self["key_green"].setText("Reset peak")
+        self["key_yellow"].setText("Info")
+        self.forgetAlignmentWidgets()
+        # Tekstualni paneli i istorija stoje, uzorkuje se samo kvalitet/SNR/lock
+        self.sampler.unsubscribe(self.sampleSignal)
+        self.scheduler.setInterval("center", 0)
+        self.scheduler.setInterval("align", ALIGN_INTERVAL)
+
+    def stopAlignment(self):
+        self.align_mode = False
+        for name in ("align_info", "snr_peak", "agc_peak"):
+            self[name].hide()
+        for name in ("info_left", "info_center", "snr_graph", "agc_graph"):
+            self[name].show()
+        self["snr_label"].setText("SNR:")
+        self["agc_label"].setText("AGC:")
+        self["key_green"].setText("Update")
+        self["key_yellow"].setText("Alignment")
+        self.forgetAlignmentWidgets()
+        self.scheduler.setInterval("align", 0)
+        self.sampler.subscribe(self.sampleSignal, self.sample_interval)
+        self.scheduler.setInterval("center", self.CENTER_INTERVAL)
+
+    def forgetAlignmentWidgets(self):
+        # Bars change scale and panels were hidden/shown behind the updater's back: next write goes through
+        for name in ("snr_bar", "agc_bar", "align_info", "info_left", "info_center", "snr_graph", "agc_graph"):
+            self.widgets.forget(name)
+
+    def sampleAlignment(self):
+        frontendInfo = self.align_frontend
+        if frontendInfo is None:
+            service = self.session.nav.getCurrentService()
+            frontendInfo = self.align_frontend = service and service.frontendInfo()
+            if not frontendInfo:
+                return
         try:
-            self["snr_bar"].setValue(int(snr_percent))
-            self["agc_bar"].setValue(int(agc))
+            quality, snr_db, locked = readAlignment(frontendInfo)
         except Exception as e:
-            print(f"[SatelliteAnalyzer] Error updating bars: {e}")
-
-    def getSignalFromFrontend(self):
+            log.warning("Alignment read failed: %s", e)
+            self.align_frontend = None
+            return
+        meter = self.align
+        meter.update(quality, snr_db, locked)
+
+        self.widgets.setValue("snr_bar", meter.quality)
+        self.widgets.setValue("agc_bar", min(100, meter.snr_db * self.ALIGN_DB_SCALE))
+        self.movePeakMarker(0, "snr_peak", "snr_bar", int(meter.peak_quality))
+        self.movePeakMarker(1, "agc_peak", "agc_bar", min(100, int(meter.peak_snr_db * self.ALIGN_DB_SCALE)))
+
+        text = "%s\nSNR %.1f dB   Q %d %%\nBest: %.1f dB   %d %%" % (
+            "LOCK" if meter.locked else "NO LOCK", meter.snr_db, meter.quality,
+            meter.peak_snr_db, meter.peak_quality)
+        self.widgets.setText("align_info", text)
+
+    def movePeakMarker(self, index, marker_name, bar_name, percent):
+        bar = self[bar_name].instance
+        marker = self[marker_name].instance
+        if bar is None or marker is None:
+            return
+        x = bar.position().x() + bar.size().width() * percent // 100 - marker.size().width() // 2
+        if x != self.peak_pixels[index]:
+            self.peak_pixels[index] = x
+            marker.move(ePoint(x, marker.position().y()))
+
+    def startReport(self):
+        if self.report is not None:
+            return
+        try:
+            self.report = BouquetReport(getCurrentBouquet(), settings.report_format.value)
+        except Exception as e:
+            log.error("Cannot start bouquet report: %s", e)
+            self.session.open(MessageBox, f"Cannot start bouquet report:\n{e}", MessageBox.TYPE_ERROR, timeout=10)
+            return
+        self.widgets.setText("key_blue", "Report: 0")
+        # Servisi se obradjuju u delovima, GUI ostaje responzivan
+        self.scheduler.setInterval("report", self.REPORT_INTERVAL)
+
+    def stepReport(self):
+        report = self.report
+        if report is None:
+            return
+        try:
+            more = report.step()
+        except Exception as e:
+            log.error("Bouquet report failed: %s", e)
+            self.abortReport()
+            self.session.open(MessageBox, f"Bouquet report failed:\n{e}", MessageBox.TYPE_ERROR, timeout=10)
+            return
+        if more:
+            self.widgets.setText("key_blue", f"Report: {report.count}")
+            return
+        self.report = None
+        self.scheduler.setInterval("report", 0)
+        self.widgets.setText("key_blue", "Bouquet report")
+        self.session.open(MessageBox, f"Bouquet report: {report.count} services\n{report.path}", MessageBox.TYPE_INFO, timeout=10)
+
+    def abortReport(self):
+        if self.report is not None:
+            self.report.abort()
+            self.report = None
+            self.scheduler.setInterval("report", 0)
+            self.widgets.setText("key_blue", "Bouquet report")
+
+    def submitJob(self, name, job):
+        self.worker.submit(name, job)
+        self.scheduler.setInterval("mailbox", self.MAILBOX_INTERVAL)
+
+    def checkMailbox(self):
+        idle = self.worker.idle
+        results = self.worker.mailbox.take()
+        if "service" in results and results["service"] is not None:
+            self.applyServiceInfo(results["service"])
+        if idle:
+            self.scheduler.setInterval("mailbox", 0)
+
+    def toggleDebugPage(self):
+        self.debug_page = not self.debug_page
+        if self.ts_page:
+            self.ts_page = False
+            self.stopTsAnalysis()
+        self.updateCenter()
+
+    def toggleTsPage(self):
+        self.ts_page = not self.ts_page
+        if self.ts_page:
+            self.debug_page = False
+            self.startTsAnalysis()
+        else:
+            self.stopTsAnalysis()
+        self.updateCenter()
+
+    def startTsAnalysis(self):
+        self.stopTsAnalysis()
+        snapshot = self.snapshot
+        self.ts = TsAnalyzer()
+        if snapshot is not None:
+            self.ts_service = (snapshot.namespace, snapshot.onid, snapshot.tsid, snapshot.sid)
+            if snapshot.pcrpid > 0:
+                self.ts.pcr_pid = snapshot.pcrpid
+        try:
+            self.ts_source = self.openTsSource()
+        except Exception as e:
+            log.warning("TS analysis unavailable: %s", e)
+            self.ts_error = f"Not available: {e}"
+            return
+        self.ts_started = monotonic()
+        self.scheduler.setInterval("ts", self.TS_INTERVAL)
+
+    def stopTsAnalysis(self):
+        self.scheduler.setInterval("ts", 0)
+        if self.ts_source is not None:
+            self.ts_source.close()
+            self.ts_source = None
+        self.ts_error = None
+
+    def openTsSource(self, pids=None):
+        # Playback of a recording: read the file; live TV: tap the service's PIDs
+        # (or the given ones) on its demux
+        ref = self.session.nav.getCurrentlyPlayingServiceReference()
+        path = ref and ref.getPath()
+        if path and path.endswith(".ts") and fileExists(path):
+            return TsFileSource(path)
         service = self.session.nav.getCurrentService()
+        stream = service and service.stream()
+        data = stream and stream.getStreamingData()
+        if not data or "demux" not in data:
+            raise ValueError("no demux for this service")
+        if pids is None:
+            pids = [pid[0] if isinstance(pid, (tuple, list)) else pid for pid in data.get("pids", ())]
+        return TsLiveSource(data["demux"], [pid for pid in pids if 0 <= pid < 0x2000] or [0])
+
+    def sampleTs(self):
+        source = self.ts_source
+        if source is None:
+            return
+        start = perf_counter()
+        for _ in range(self.TS_BATCHES):
+            batch = source.read()
+            if batch is None:
+                break
+            self.ts.feed(*batch)
+        if isinstance(source, TsLiveSource):
+            self.ts.elapsed = monotonic() - self.ts_started
+        profiler.record("ts", start)
+        self.updateCenter()
+
+    def releaseFadeMonitor(self):
+        if not settings.fade_monitor.value:
+            stopMonitor()
+
+    def startSiTables(self, snapshot):
+        self.stopSiTables()
+        self.si = SiTables()
+        self.si_service = (snapshot.namespace, snapshot.onid, snapshot.tsid, snapshot.sid)
+        self.si_packets = 0
+        if not snapshot.has_service:
+            return
+        pids = [PAT_PID, NIT_PID, SDT_PID]
+        if snapshot.pmtpid > 0:
+            pids.append(snapshot.pmtpid)
+        try:
+            self.si_source = self.openTsSource(pids)
+        except Exception as e:
+            log.debug("PSI/SI tables unavailable: %s", e)
+            return
+        self.scheduler.setInterval("si", self.SI_INTERVAL)
+
+    def stopSiTables(self):
+        self.scheduler.setInterval("si", 0)
+        if self.si_source is not None:
+            self.si_source.close()
+            self.si_source = None
+
+    def sampleSi(self):
+        source = self.si_source
+        if source is None:
+            return
+        start = perf_counter()
+        batch = None
+        for _ in range(self.SI_BATCHES):
+            batch = source.read()
+            if batch is None:
+                break
+            self.si.feed(*batch)
+            self.si_packets += batch[1]
+        profiler.record("si", start)
+        if isinstance(source, TsFileSource) and (batch is None or self.si_packets >= self.SI_FILE_PACKETS):
+            # Tabele se ponavljaju, ceo snimak nije potreban
+            self.stopSiTables()
+        if self.si.changed:
+            self.si.changed = False
+            self.scheduler.trigger("center")
+
+    def getSiInfo(self, snapshot):
+        si = self.si
+        lines = []
+        pmt = si.pmt(snapshot.sid)
+        if pmt is not None:
+            lines.append("STREAMS (PMT):")
+            for stream_type, pid, description, language, ca in pmt[2]:
+                lines.append(f"   0x{pid:04X} {description}" + (f" ({language})" if language else ""))
+        sdt = si.sdt(snapshot.tsid)
+        service = sdt and sdt[1].get(snapshot.sid)
         if service:
-            frontendInfo = service.frontendInfo()
-            if frontendInfo:
-                try:
-                    frontendData = frontendInfo.getAll(True)
-                    print(f"[SatelliteAnalyzer] Sirovi frontend podaci: {frontendData}")
-                    quality = frontendData.get("tuner_signal_quality", 0)
-                    snr_percent = min(100, quality // 655)
-                    snr_db = frontendData.get("tuner_signal_quality_db", 0) / 100.0
-                    ber = frontendData.get("tuner_bit_error_rate", 0)
-                    agc = min(100, frontendData.get("tuner_signal_power", 0) // 655)
-                    service_info = service.info()
-                    is_crypted = service_info.getInfo(iServiceInformation.sIsCrypted)
-                    sid = service_info.getInfo(iServiceInformation.sSID)
-                    tsid = service_info.getInfo(iServiceInformation.sTSID)
-                    onid = service_info.getInfo(iServiceInformation.sONID)
-                    print(
-                        f"[SatelliteAnalyzer] Frontend podaci: SNR_DB={snr_db}, SNR_PERCENT={snr_percent}, BER={ber}, AGC={agc}, Crypted={is_crypted}, SID={sid}, TSID={tsid}, ONID={onid}")
-                    return snr_db, snr_percent, ber, agc, is_crypted, sid, tsid, onid
-                except Exception as e:
-                    print(f"[SatelliteAnalyzer] Greška pri dohvatanju signala iz frontend-a: {e}")
-        return 0.0, 0, 0, 0, 0, 0, 0, 0
+            lines.append(f"SDT: {service[1]} / {service[2]}")
+        nit = si.nit()
+        if nit is not None:
+            lines.append(f"NIT: {nit[0]}")
+            delivery = nit[1].get((snapshot.tsid, snapshot.onid))
+            if delivery:
+                lines.append(f"   {formatDelivery(delivery)}")
+        if lines:
+            lines.insert(0, "")
+        return lines
+
+    def getTsPids(self, snapshot):
+        # The PIDs shown on the left pane, in the same order, plus the fixed SI PIDs
+        pids = {}
+        if snapshot is not None:
+            for pid, label in ((snapshot.vpid, "VIDEO"), (snapshot.apid, "AUDIO"), (snapshot.pcrpid, "PCR"),
+                    (snapshot.pmtpid, "PMT"), (snapshot.txtpid, "TXT")):
+                if pid > 0 and pid not in pids:
+                    pids[pid] = label
+        for pid, label in ((0x0000, "PAT"), (0x0010, "NIT"), (0x0011, "SDT"), (0x0012, "EIT"), (0x0014, "TDT"), (0x1FFF, "NULL")):
+            pids.setdefault(pid, label)
+        return pids
+
+    def getTsInfo(self, snapshot):
+        lines = ["TS ANALYSIS:"]
+        ts = self.ts
+        if self.ts_error:
+            lines.append(f"   {self.ts_error}")
+            return lines
+        if ts is None or not ts.total:
+            lines.append("   Waiting for packets...")
+            return lines
+        engine = "NumPy" if ts.vectorized else "Python"
+        lines.append(f"   Source: {self.ts_source.name if self.ts_source else '-'} ({engine})")
+        lines.append(f"   Total: {ts.bitrate() / 1e6:.2f} Mbit/s, {ts.total} pkts, {ts.duration:.1f} s")
+        lines.append(f"   Sync errors: {ts.sync_errors}")
+        if ts.pcr_count > 1:
+            late = " !" if ts.pcr_interval > PCR_MAX_INTERVAL else ""
+            lines.append(f"   PCR 0x{ts.pcr_pid:04X}: max gap {ts.pcr_interval * 1000:.1f} ms{late}, jitter {ts.pcr_jitter * 1e6:.1f} us")
+        lines.append("")
+        lines.append("   PID    TYPE    Mbit/s    CC  TEI  SCR")
+        known = self.getTsPids(snapshot)
+        shown = [pid for pid in known if ts.packets[pid]]
+        shown += [pid for pid in ts.pids() if pid not in known][:self.MAX_TS_PIDS]
+        for pid in shown:
+            packets, bitrate, cc_errors, tei, scrambled = ts.pidStats(pid)
+            lines.append(f"   0x{pid:04X} {known.get(pid, ''):<6} {bitrate / 1e6:7.2f} {cc_errors:5d} {tei:4d} {scrambled:4d}")
+        return lines
+
+    def dumpProfile(self):
+        if profiler.dump(extra=self.getDebugInfo()):
+            log.info("Profile written to %s", PROFILE_DUMP)
+
+    def getDebugInfo(self):
+        lines = profiler.report()
+        lines.append("")
+        if self.snapshot is not None:
+            lines.append(f"Driver calls per refresh: {self.snapshot.driver_calls}")
+        lines.append(f"Signal samples: {len(self.history)}")
+        lines.append(f"Background results dropped: {self.worker.mailbox.dropped}")
+        lines.append(f"Redraws performed/skipped: {self.widgets.performed}/{self.widgets.skipped}")
+        panes = (self.basic_pane, self.signal_pane, self.ids_pane) + tuple(self.tuning_panes.values())
+        lines.append(f"Template lines re-filled/reused: {sum(pane.filled for pane in panes)}/{sum(pane.reused for pane in panes)}")
+        return lines
+
+    def getEcmInfo(self):
+        record = self.ecm.record
+        if record is None:
+            return []
+        lines = ["ECM INFO:"]
+        line = f"   CAID: 0x{record.caid:04X}"
+        if record.pid is not None:
+            line += f"  PID: 0x{record.pid:04X}"
+        if record.prov is not None:
+            line += f"  PROV: 0x{record.prov:06X}"
+        lines.append(line)
+        if record.system:
+            lines.append(f"   System: {record.system}")
+        if record.reader:
+            lines.append(f"   Reader: {record.reader}")
+        if record.protocol:
+            lines.append(f"   Protocol: {record.protocol}")
+        if record.source:
+            lines.append(f"   Source: {record.source}")
+        if record.hops is not None:
+            lines.append(f"   Hops: {record.hops}")
+        if record.ecm_time is not None:
+            lines.append(f"   ECM time: {record.ecm_time} ms")
+        if self.ecm.latency:
+            lines.append("   Latency p50/p95:")
+            for reader in self.ecm.latency:
+                p50, p95, count = self.ecm.percentiles(reader)
+                lines.append(f"      {reader}: {p50}/{p95} ms (n={count})")
+        lines.append("")
+        return lines
+
+    def getCenterText(self, snapshot):
+        if self.debug_page:
+            return "\n".join(self.getDebugInfo())
+        if self.ts_page:
+            return "\n".join(self.getTsInfo(snapshot))
+        return self.getAdvancedInfo(snapshot)
+
+    def updateCenter(self):
+        if self.snapshot is None:
+            return
+        start = perf_counter()
+        center_text = self.getCenterText(self.snapshot)
+        profiler.record("format", start)
+        start = perf_counter()
+        self.widgets.setText("info_center", center_text)
+        profiler.record("widgets", start)
 
-    def getCaName(self, caid):
-        known = {
-            0x0500: "Viaccess",
-            0x0600: "Seca Mediaguard",
-            0x0900: "NDS Videoguard",
-            0x098D: "NDS Videoguard",
-            0x098C: "NDS Videoguard",
-            0x091F: "NDS Videoguard",
-            0x0911: "NDS Videoguard",
-            0x09CD: "NDS Videoguard",
-            0x09C4: "NDS Videoguard",
-            0x0963: "NDS Videoguard",
-            0x0961: "NDS Videoguard",
-            0x0960: "NDS Videoguard",
-            0x092B: "NDS Videoguard",
-            0x09BD: "NDS Videoguard",
-            0x09F0: "NDS Videoguard",
-            0x1813: "Nagravision",
-            0x1833: "Nagravision",
-            0x1834: "Nagravision",
-            0x1830: "Nagravision",
-            0x1817: "Nagravision",
-            0x1818: "Nagravision",
-            0x1878: "Nagravision",
-            0x1819: "Nagravision",
-            0x1880: "Nagravision",
-            0x1883: "Nagravision",
-            0x1884: "Nagravision",
-            0x1863: "Nagravision",
-            0x183D: "Nagravision",
-            0x1814: "Nagravision",
-            0x1810: "Nagravision",
-            0x1811: "Nagravision",
-            0x1802: "Nagravision",
-            0x1807: "Nagravision",
-            0x1843: "Nagravision",
-            0x1856: "Nagra Ma",
-            0x183E: "Nagra Ma",
-            0x1803: "Nagra Ma",
-            0x1861: "Nagra Ma",
-            0x181D: "Nagra Ma",
-            0x186C: "Nagra Ma",
-            0x1870: "Nagra Ma",
-            0x0E00: "PowerVu",
-            0x1700: "Drecrypt",
-            0x1800: "Tandberg",
-            0x2600: "Biss",
-            0x2700: "Bulcrypt",
-            0x0D98: "Cryptoworks",
-            0x0D97: "Cryptoworks",
-            0x0D95: "Cryptoworks",
-            0x0D00: "Cryptoworks",
-            0x0D01: "Cryptoworks",
-            0x0D02: "Cryptoworks",
-            0x0D03: "Cryptoworks",
-            0x0D04: "Cryptoworks",
-            0x0624: "Irdeto",
-            0x06E1: "Irdeto",
-            0x0653: "Irdeto",
-            0x0648: "Irdeto",
-            0x06D9: "Irdeto",
-            0x0656: "Irdeto",
-            0x0650: "Irdeto",
-            0x0D96: "Irdeto",
-            0x0629: "Irdeto",
-            0x0606: "Irdeto",
-            0x0664: "Irdeto",
-            0x06EE: "Irdeto",
-            0x06E2: "Irdeto",
-            0x0664: "Irdeto",
-            0x06F8: "Irdeto",
-            0x0604: "Irdeto",
-            0x069B: "Irdeto",
-            0x069F: "Irdeto",
-            0x0B01: "Conax",
-            0x0B02: "Conax",
-            0x0B00: "Conax",
-            0x4AEE: "Bulcrypt",
-            0x5581: "Bulcrypt",
-            0x1EC0: "CryptoGuard",
-            0x0100: "Seca/ Mediaguard",
-        }
-        return known.get(caid, None)
-
-    def getFec(self, fec):
-        return {0:"Auto",1:"1/2",2:"2/3",3:"3/4",4:"4/5",5:"5/6",7:"7/8",8:"8/9",9:"9/10"}.get(fec, "N/A")
-
-    def getModulation(self, mod):
-        return {0:"Auto",1:"QPSK",2:"8PSK",3:"64QAM",4:"16APSK",5:"32APSK"}.get(mod, "N/A")
-
-    def getSystem(self, tuner_type, sys):
-        if tuner_type == "DVB-S":
-            return {0: "DVB-S", 1: "DVB-S2"}.get(sys, "N/A")
-        elif tuner_type == "DVB-T":
-            return {0: "DVB-T", 1: "DVB-T2"}.get(sys, "N/A")
-        elif tuner_type == "DVB-C":
-            return {0: "DVB-C", 1: "DVB-C2"}.get(sys, "N/A")
+    def updateAllInfo(self):
+        if settings.background_io.value:
+            self.submitJob("service", self.collectServiceInfo)
         else:
-            return "N/A"
-
-    def getPolarization(self, pol):
-        return {0:"H",1:"V",2:"L",3:"R"}.get(pol, "N/A")
-
-    # Nove metode za DVB-T specifične parametre
-    def getBandwidth(self, bw):
-        return {6000000: "6 MHz", 7000000: "7 MHz", 8000000: "8 MHz"}.get(bw, f"{bw/1000000} MHz")
-
-    def getConstellation(self, constellation):
-        return {0: "QPSK", 1: "16QAM", 2: "64QAM", 3: "256QAM"}.get(constellation, "N/A")
-
-    def getTransmissionMode(self, mode):
-        return {0: "Auto", 1: "2K", 2: "8K", 3: "4K"}.get(mode, "N/A")
-
-    def getGuardInterval(self, gi):
-        return {0: "Auto", 1: "1/32", 2: "1/16", 3: "1/8", 4: "1/4"}.get(gi, "N/A")
-
-    def getHierarchy(self, hi):
-        return {0: "None", 1: "1", 2: "2", 3: "4", 4: "Auto"}.get(hi, "N/A")
-
-    def getSatelliteNameFromXML(self, orbital_position):
-        satellites_file = "/etc/tuxbox/satellites.xml"
-        if not os.path.exists(satellites_file):
-            return self.formatOrbitalPos(orbital_position)
+            self.applyServiceInfo(self.collectServiceInfo())
+
+    def collectServiceInfo(self):
+        # Worker thread: everything that can block, nothing that touches widgets or screen state
+        loadCaidDatabase()
+        snapshot = takeSnapshot(self.session)
+        neighbour_lines = self.getNeighbourInfo(snapshot)
+        start = perf_counter()
+        left_text = self.getBasicInfo(snapshot)
+        profiler.record("format", start)
+        return snapshot, neighbour_lines, left_text
+
+    def applyServiceInfo(self, result):
+        snapshot, self.neighbour_lines, left_text = result
+        self.snapshot = snapshot
+        if self.ts_page and (snapshot.namespace, snapshot.onid, snapshot.tsid, snapshot.sid) != self.ts_service:
+            # Drugi servis, drugi PID-ovi: analiza krece iz pocetka
+            self.startTsAnalysis()
+        if (snapshot.namespace, snapshot.onid, snapshot.tsid, snapshot.sid) != self.si_service:
+            self.startSiTables(snapshot)
+        start = perf_counter()
+        center_text = self.getCenterText(snapshot)
+        profiler.record("format", start)
+        start = perf_counter()
+        self.widgets.setText("info_left", left_text)
+        self.widgets.setText("info_center", center_text)
+        profiler.record("widgets", start)
+        snr_db, snr_percent, ber, agc, is_crypted, sid, tsid, onid = self.getSignalFromFrontend(snapshot)
+        self.updateSignalBars(snr_percent, agc)
+        log.debug("Driver calls this refresh: %d", snapshot.driver_calls)
+
+    def sampleSignal(self, sample):
+        if sample.ecm_changed:
+            self.scheduler.trigger("center")
+        signal = sample.signal
+        if signal is None:
+            return
+        self.signal = signal
+        self.history.add(*signal)
+        snr_db, snr_percent, agc, ber = signal
+        self.updateSignalBars(snr_percent, agc)
+        width = self.GRAPH_WIDTH
+        snr_graph = self.history.sparkline("snr_percent", width, 0, 100)
+        agc_graph = self.history.sparkline("agc", width, 0, 100)
+        start = perf_counter()
+        self.widgets.setText("snr_graph", snr_graph)
+        self.widgets.setText("agc_graph", agc_graph)
+        profiler.record("widgets", start)
+
+    def getHistoryInfo(self):
+        lines = ["SIGNAL HISTORY (min/max/avg/std):"]
+        for channel, label, unit in (("snr_db", "SNR", " dB"), ("agc", "AGC", " %")):
+            for index, seconds in enumerate(self.history.windows):
+                stats = self.history.stats(channel, index)
+                if stats is None:
+                    continue
+                lo, hi, mean, std = stats
+                lines.append(f"   {label} {seconds:>3}s: {lo:.1f}/{hi:.1f}/{mean:.1f}/{std:.2f}{unit}")
+        if len(lines) == 1:
+            return []
+        return lines
 
+    def updateSignalBars(self, snr_percent, agc):
         try:
-            tree = ET.parse(satellites_file)
-            root = tree.getroot()
-            sat_pos = self.convertOrbitalPos(orbital_position)
-            for sat in root.findall("sat"):
-                pos = int(sat.get("position", "0"))
-                if pos == sat_pos:
-                    return sat.get("name", self.formatOrbitalPos(orbital_position))
-            return self.formatOrbitalPos(orbital_position)
-        except:
-            return self.formatOrbitalPos(orbital_position)
-
-    def convertOrbitalPos(self, pos):
-        if pos > 1800:
-            return pos - 3600
-        else:
-            return pos
-
-    def formatOrbitalPos(self, pos):
-        pos = self.convertOrbitalPos(pos)
-        if pos < 0:
-            return f"{abs(pos) / 10.0:.1f}W"
-        else:
-            return f"{pos / 10.0:.1f}E"
+            if self.widgets.setValue("snr_bar", snr_percent) | self.widgets.setValue("agc_bar", agc):
+                log.debug("Update signal bars: SNR=%s%%, AGC=%s%%", snr_percent, agc)
+        except Exception as e:
+            log.error("Error updating bars: %s", e)
+
+    def getNeighbourInfo(self, snapshot):
+        if snapshot.onid < 0 or snapshot.tsid < 0:
+            return []
+        services = getTransponderServices(snapshot.namespace, snapshot.onid, snapshot.tsid)
+        if not services:
+            return []
+        lines = ["", f"SAME TRANSPONDER ({len(services)} services):"]
+        for sid, service_type, name, provider, caids in sorted(services)[:self.MAX_NEIGHBOURS]:
+            marker = "*" if sid == snapshot.sid else " "
+            type_str = SERVICE_TYPES.get(service_type, str(service_type))
+            caid_str = ",".join(f"{caid:04X}" for caid in caids) if caids else "FTA"
+            lines.append(f"  {marker}0x{sid:04X} {type_str:<7} {name[:18]:<18} {caid_str}")
+        if len(services) > self.MAX_NEIGHBOURS:
+            lines.append(f"   ... and {len(services) - self.MAX_NEIGHBOURS} more")
+        return lines
+
+    # Nominal satellites.xml values shown next to the tuned ones: (label, key, formatter)
+    NOMINAL_FIELDS = (
+        ("SR", "symbol_rate", lambda value: f"{value // 1000}k"),
+        ("FEC", "fec_inner", getFec),
+        ("System", "system", lambda value: getSystem("DVB-S", value)),
+        ("Modulation", "modulation", getModulation),
+        ("Input stream", "is_id", str),
+        ("PLS mode", "pls_mode", PLS_MODE.__getitem__),
+        ("PLS code", "pls_code", str),
+        ("T2MI PLP ID", "t2mi_plp_id", str),
+        ("T2MI PID", "t2mi_pid", lambda value: f"0x{value:X}"),
+    )
+
+    def getTransponderMatch(self, frontendData):
+        # Najblizi transponder iz satellites.xml; razlike u odnosu na tjunovane parametre oznacene sa ⚠
+        frequency = frontendData.get("frequency", 0)
+        entry = matchTransponder(convertOrbitalPos(frontendData.get("orbital_position", 0)),
+            frontendData.get("polarization", 0), frequency)
+        if entry is None:
+            return [f"   satellites.xml: no transponder within {MATCH_TOLERANCE // 1000} MHz"]
+        offset = (frequency - entry["frequency"]) / 1000.0
+        lines = [f"   satellites.xml: {entry['frequency'] // 1000} MHz {getPolarization(entry['polarization'])} ({offset:+.2f} MHz)"]
+        for label, key, formatter in self.NOMINAL_FIELDS:
+            nominal = entry[key]
+            if nominal < 0:
+                continue
+            measured = frontendData.get(key, -1)
+            if key == "symbol_rate":
+                # Drivers report the recovered rate; within 0.5% is the same transponder
+                mismatch = abs(measured - nominal) > nominal // 200
+            else:
+                # 0 is "Auto" for FEC and modulation
+                mismatch = measured != nominal and not (key in ("fec_inner", "modulation") and nominal == 0)
+            line = f"      {label}: {formatter(nominal)}"
+            if mismatch:
+                line += f"  ⚠ tuned {formatter(measured) if measured >= 0 else 'N/A'}"
+            lines.append(line)
+        return lines
+
+    def getSignalFromFrontend(self, snapshot):
+        frontendData = snapshot.frontend
+        if frontendData:
+            try:
+                log.debug("Sirovi frontend podaci: %s", frontendData)
+                quality = frontendData.get("tuner_signal_quality", 0)
+                snr_percent = min(100, quality // 655)
+                snr_db = frontendData.get("tuner_signal_quality_db", 0) / 100.0
+                ber = frontendData.get("tuner_bit_error_rate", 0)
+                agc = min(100, frontendData.get("tuner_signal_power", 0) // 655)
+                is_crypted = snapshot.is_crypted
+                sid = snapshot.sid
+                tsid = snapshot.tsid
+                onid = snapshot.onid
+                log.debug("Frontend podaci: SNR_DB=%s, SNR_PERCENT=%s, BER=%s, AGC=%s, Crypted=%s, SID=%s, TSID=%s, ONID=%s",
+                    snr_db, snr_percent, ber, agc, is_crypted, sid, tsid, onid)
+                return snr_db, snr_percent, ber, agc, is_crypted, sid, tsid, onid
+            except Exception as e:
+                log.error("Greška pri dohvatanju signala iz frontend-a: %s", e)
+        return 0.0, 0, 0, 0, 0, 0, 0, 0
 
-    def getBasicInfo(self):
-        service = self.session.nav.getCurrentService()
-        if not service:
+    # Pane templates, compiled once per screen; a line is formatted again only when its fields change.
+    # The tuning lines come from the tuner type's field table (Decoders.FRONTEND_SCHEMAS).
+    BASIC_LINES = (
+        "Channel: {name}",
+        "   Provider: {provider}",
+        "   {source_label}: {source}",
+        "{tuning}{match_params}",
+        "",
+        "   VIDEO PID: {vpid}",
+        "   AUDIO PID: {apid}",
+        "   PCR PID: {pcrpid}",
+        "   PMT PID: {pmtpid}",
+        "   TELETEXT PID: {txtpid}",
+    )
+    SIGNAL_LINES = (
+        "SIGNAL INFO:",
+        "   Strength: {snr_percent} %",
+        "   SNR: {snr_db:.2f} dB",
+        "   BER: {ber}",
+        "   AGC: {agc}",
+    )
+    ID_LINES = (
+        "SI / TS / ONID:",
+        "   SID: 0x{sid:04X}",
+        "   TSID: 0x{tsid:04X}",
+        "   ONID: 0x{onid:04X}",
+    )
+
+    def getTuningPane(self, tuner_type):
+        pane = self.tuning_panes.get(tuner_type)
+        if pane is None:
+            pane = self.tuning_panes[tuner_type] = TemplatePane(
+                tuple(f"   {label}: {{{attribute}}}" for attribute, label in frontendLabels(tuner_type)))
+        return pane
+
+    def getBasicInfo(self, snapshot):
+        # Runs on the worker thread (or inline), never on both at once: the panes have one user
+        if not snapshot.has_service:
             return "❌ Nema aktivnog servisa."
-        info = service.info()
-        if not info:
+        if not snapshot.has_info:
             return "❌ Ne mogu dohvatiti info objekat."
 
-        try:
-            name = info.getName() or "N/A"
-        except:
-            name = "N/A"
-        try:
-            provider = info.getInfoString(iServiceInformation.sProvider) or "N/A"
-        except:
-            provider = "N/A"
-
-        frontendInfo = service.frontendInfo()
-        frontendData = frontendInfo and frontendInfo.getAll(True)
+        frontendData = snapshot.frontend
         if not frontendData:
             return "❌ Ne mogu dohvatiti frontend podatke."
 
-        try:
-            freq = frontendData.get("frequency", 0) // 1000
-        except:
-            freq = 0
-        try:
-            sr = frontendData.get("symbol_rate", 0) // 1000
-        except:
-            sr = 0
-        try:
-            fec_inner = frontendData.get("fec_inner", 0)
-            fec_str = self.getFec(fec_inner)
-        except:
-            fec_str = "N/A"
-        try:
-            pol = frontendData.get("polarization", 0)
-            pol_str = self.getPolarization(pol)
-        except:
-            pol_str = "N/A"
-        try:
-            orbital_pos = frontendData.get("orbital_position", 0)
-            sat_name = self.getSatelliteNameFromXML(orbital_pos)
-        except:
-            sat_name = "Nepoznat satelit"
-
-        try:
-            mod = frontendData.get("modulation", 0)
-            mod_str = self.getModulation(mod)
-        except:
-            mod_str = "N/A"
-        try:
-            tuner_type = frontendData.get("tuner_type", "")
-            system_val = frontendData.get("system", 0)
-            system_str = self.getSystem(tuner_type, system_val)
-        except:
-            system_str = "N/A"
-        try:
-            pls_mode = frontendData.get("pls_mode", -1)
-            pls_mode_str = {0:"Root",1:"Gold",2:"Combo"}.get(pls_mode, str(pls_mode))
-        except:
-            pls_mode_str = "N/A"
-        try:
-            pls_code = frontendData.get("pls_code", -1)
-            pls_code_str = str(pls_code) if pls_code >= 0 else "N/A"
-        except:
-            pls_code_str = "N/A"
-        try:
-            t2mi_plp_id = frontendData.get("t2mi_plp_id", -1)
-            t2mi_plp_str = str(t2mi_plp_id) if t2mi_plp_id >= 0 else "N/A"
-        except:
-            t2mi_plp_str = "N/A"
-        try:
-            t2mi_pid = frontendData.get("t2mi_pid", -1)
-            t2mi_pid_str = f"0x{t2mi_pid:X}" if t2mi_pid >= 0 else "N/A"
-        except:
-            t2mi_pid_str = "N/A"
-
-        try:
-            vpid = info.getInfo(iServiceInformation.sVideoPID)
-            vpid_str = f"0x{vpid:X}" if vpid != -1 else "Nema"
-        except:
-            vpid_str = "Nema"
-        try:
-            apid = info.getInfo(iServiceInformation.sAudioPID)
-            apid_str = f"0x{apid:X}" if apid != -1 else "Nema"
-        except:
-            apid_str = "Nema"
-        try:
-            pcrpid = info.getInfo(iServiceInformation.sPCRPID)
-            pcr_str = f"0x{pcrpid:X}" if pcrpid != -1 else "Nema"
-        except:
-            pcr_str = "Nema"
-        try:
-            pmtpid = info.getInfo(iServiceInformation.sPMTPID)
-            pmt_str = f"0x{pmtpid:X}" if pmtpid != -1 else "Nema"
-        except:
-            pmt_str = "Nema"
-        try:
-            txt_pid = info.getInfo(iServiceInformation.sTXTPID)
-            txt_str = f"0x{txt_pid:X}" if txt_pid != -1 else "Nema"
-        except:
-            txt_str = "Nema"
-
-        # DVB-T specifični parametri
-        dvbt_params = ""
-        if tuner_type in ["DVB-T", "DVB-T2"]:
-            try:
-                bandwidth = frontendData.get("bandwidth", 0)
-                bandwidth_str = self.getBandwidth(bandwidth)
-            except:
-                bandwidth_str = "N/A"
-            try:
-                code_rate_hp = frontendData.get("code_rate_hp", 0)
-                code_rate_hp_str = self.getFec(code_rate_hp)
-            except:
-                code_rate_hp_str = "N/A"
-            try:
-                code_rate_lp = frontendData.get("code_rate_lp", 0)
-                code_rate_lp_str = self.getFec(code_rate_lp)
-            except:
-                code_rate_lp_str = "N/A"
-            try:
-                constellation = frontendData.get("constellation", 0)
-                constellation_str = self.getConstellation(constellation)
-            except:
-                constellation_str = "N/A"
-            try:
-                transmission_mode = frontendData.get("transmission_mode", 0)
-                transmission_mode_str = self.getTransmissionMode(transmission_mode)
-            except:
-                transmission_mode_str = "N/A"
+        start = perf_counter()
+        params = decodeFrontend(frontendData)
+        profiler.record("decode", start)
+        tuner_type = params.tuner_type
+        match_params = ""
+        if tuner_type == "DVB-S":
+            source_label = "Satellite"
             try:
-                guard_interval = frontendData.get("guard_interval", 0)
-                guard_interval_str = self.getGuardInterval(guard_interval)
-            except:
-                guard_interval_str = "N/A"
+                source = getSatelliteNameFromXML(params.orbital_position)
+            except Exception:
+                source = "Nepoznat satelit"
             try:
-                hierarchy = frontendData.get("hierarchy_information", 0)
-                hierarchy_str = self.getHierarchy(hierarchy)
-            except:
-                hierarchy_str = "N/A"
-
-            dvbt_params = f"""
-   Bandwidth: {bandwidth_str}
-   Code Rate HP: {code_rate_hp_str}
-   Code Rate LP: {code_rate_lp_str}
-   Constellation: {constellation_str}
-   Transmission Mode: {transmission_mode_str}
-   Guard Interval: {guard_interval_str}
-   Hierarchy: {hierarchy_str}
-            """
-
-        text = f"""
-   Channel: {name}
-   Provider: {provider}
-   Satellite: {sat_name}
-   Frequency: {freq} MHz
-   Polarization: {pol_str}
-   Symbol Rate: {sr}k
-   FEC: {fec_str}
-   Modulation: {mod_str}
-   SYSTEM: {system_str}
-   PLS MODE: {pls_mode_str}
-   PLS CODE: {pls_code_str}
-   T2MI PLP ID: {t2mi_plp_str}
-   T2MI PID: {t2mi_pid_str}
-{dvbt_params}
-   VIDEO PID: {vpid_str}
-   AUDIO PID: {apid_str}
-   PCR PID: {pcr_str}
-   PMT PID: {pmt_str}
-   TELETEXT PID: {txt_str}
-        """.strip()
-        return text
-
-    def getAdvancedInfo(self):
-        service = self.session.nav.getCurrentService()
-        if not service:
+                match_params = "\n" + "\n".join(self.getTransponderMatch(frontendData))
+            except Exception as e:
+                log.warning("Transponder match failed: %s", e)
+        else:
+            source_label, source = "Tuner", tuner_type or "N/A"
+
+        return self.basic_pane.fill({
+            "name": snapshot.name,
+            "provider": snapshot.provider,
+            "source_label": source_label,
+            "source": source,
+            "tuning": self.getTuningPane(tuner_type).fill(params),
+            "match_params": match_params,
+            "vpid": formatPid(snapshot.vpid),
+            "apid": formatPid(snapshot.apid),
+            "pcrpid": formatPid(snapshot.pcrpid),
+            "pmtpid": formatPid(snapshot.pmtpid),
+            "txtpid": formatPid(snapshot.txtpid),
+        })
+
+    def getAdvancedInfo(self, snapshot):
+        if not snapshot.has_service:
             return "No active service."
-        info = service.info()
-        if not info:
+        if not snapshot.has_info:
             return "Cannot retrieve info object."
 
-        try:
-            caids = info.getInfoObject(iServiceInformation.sCAIDs) or []
-        except:
-            caids = []
+        caids = snapshot.caids
 
-        active_caid = None
-        ecm_path = "/tmp/ecm.info"
-        if os.path.exists(ecm_path):
-            try:
-                with open(ecm_path, 'r') as f:
-                    for line in f:
-                        if line.startswith("caid:"):
-                            caid_str = line.split(":")[1].strip().replace("0x", "")
-                            try:
-                                active_caid = int(caid_str, 16)
-                                break
-                            except:
-                                pass
-            except:
-                pass
+        active_caid = self.ecm.record.caid if self.ecm.record else None
+
+        # ECM PID-ovi i provider ID-jevi iz PMT-a, kad je procitan
+        ecm_pids = self.si.caEcmPids(snapshot.sid)
 
         caid_list = []
-        if caids:
-            for caid in sorted(set(caids)):
-                name = self.getCaName(caid)
+        if caids or ecm_pids:
+            for caid in sorted(set(caids) | set(ecm_pids)):
+                name = getCaName(caid)
                 marker = "Active" if caid == active_caid else ""
                 if name:
                     caid_list.append(f"   {name} (0x{caid:04X}) {marker}")
                 else:
                     caid_list.append(f"   CAID: 0x{caid:04X} {marker}")
+                for ecm_pid, providers in ecm_pids.get(caid, ()):
+                    line = f"      ECM PID: 0x{ecm_pid:04X}"
+                    if providers:
+                        line += "  PROV: " + ", ".join(f"0x{provider:06X}" for provider in providers)
+                    caid_list.append(line)
         else:
             caid_list.append("No encryption")
 
         # --- SIGNAL INFO ---
-        frontendInfo = service.frontendInfo()
-        frontendData = frontendInfo and frontendInfo.getAll(True)
-        try:
-            snr_db = frontendData.get("tuner_signal_quality_db", 0) / 100.0
-            snr_percent = frontendData.get("tuner_signal_quality", 0) // 655
-            ber = frontendData.get("tuner_bit_error_rate", 0)
-            agc = frontendData.get("tuner_signal_power", 0) // 655
-        except:
-            snr_db, snr_percent, ber, agc = 0.0, 0, 0, 0
-
-        # --- SI/TS/ONID ---
-        try:
-            sid = info.getInfo(iServiceInformation.sSID)
-        except:
-            sid = -1
-        try:
-            tsid = info.getInfo(iServiceInformation.sTSID)
-        except:
-            tsid = -1
-        try:
-            onid = info.getInfo(iServiceInformation.sONID)
-        except:
-            onid = -1
+        if self.signal is not None:
+            snr_db, snr_percent, agc, ber = self.signal
+        else:
+            frontendData = snapshot.frontend
+            try:
+                snr_db = frontendData.get("tuner_signal_quality_db", 0) / 100.0
+                snr_percent = frontendData.get("tuner_signal_quality", 0) // 655
+                ber = frontendData.get("tuner_bit_error_rate", 0)
+                agc = frontendData.get("tuner_signal_power", 0) // 655
+            except:
+                snr_db, snr_percent, ber, agc = 0.0, 0, 0, 0
 
         right_text = [
             "Encryption:",
             *caid_list,
             "",
-            "SIGNAL INFO:",
-            f"   Strength: {snr_percent} %",
-            f"   SNR: {snr_db:.2f} dB",
-            f"   BER: {ber if ber != 0 else 'N/A'}",
-            f"   AGC: {agc if agc != 0 else 'N/A'}",
+            *self.getEcmInfo(),
+            self.signal_pane.fill({
+                "snr_percent": snr_percent,
+                "snr_db": snr_db,
+                "ber": ber if ber != 0 else "N/A",
+                "agc": agc if agc != 0 else "N/A",
+            }),
+            "",
+            *self.getHistoryInfo(),
+            *self.fade.getInfo(),
             "",
-            "SI / TS / ONID:",
-            f"   SID: 0x{sid:04X}",
-            f"   TSID: 0x{tsid:04X}",
-            f"   ONID: 0x{onid:04X}"
+            # --- SI/TS/ONID ---
+            self.ids_pane.fill({"sid": snapshot.sid, "tsid": snapshot.tsid, "onid": snapshot.onid}),
+            *self.getSiInfo(snapshot),
+            *self.neighbour_lines,
         ]
         return "\n".join(right_text)
\ No newline at end of file
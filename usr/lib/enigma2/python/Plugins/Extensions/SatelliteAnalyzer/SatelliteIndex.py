@@ -0,0 +1,205 @@
+# SatelliteIndex.py
+# Orbital position -> satellite name index for /etc/tuxbox/satellites.xml.
+# Parsed once with expat (no element tree, <transponder> children are skipped),
+# kept in memory and cached on disk until the file's mtime/size change.
+# The <transponder> entries get their own index, built only when a tuned
+# transponder is matched: per satellite, compact arrays sorted by
+# (polarization, frequency) for bisect lookups.
+from array import array
+from bisect import bisect_left
+from xml.parsers import expat
+
+from Plugins.Extensions.SatelliteAnalyzer.Cache import fileStamp, loadCache, saveCache
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+
+SATELLITES_XML = "/etc/tuxbox/satellites.xml"
+
+_CACHE_NAME = "satellites.idx"
+_CACHE_VERSION = 1
+
+_TRANSPONDER_CACHE_NAME = "transponders.idx"
+_TRANSPONDER_CACHE_VERSION = 1
+
+# Nearest-frequency match tolerance (kHz); LNB drift stays within a few MHz
+MATCH_TOLERANCE = 5000
+
+# Sort key: polarization in the bits above the frequency (kHz, < 33 GHz)
+_FREQUENCY_BITS = 25
+_FREQUENCY_MASK = (1 << _FREQUENCY_BITS) - 1
+
+# Per-transponder columns besides the key: satellites.xml attribute, array typecode, default
+_COLUMNS = (
+    ("symbol_rate", "I", 0),
+    ("fec_inner", "b", -1),
+    ("system", "b", -1),
+    ("modulation", "b", -1),
+    ("is_id", "h", -1),
+    ("pls_mode", "b", -1),
+    ("pls_code", "i", -1),
+    ("t2mi_plp_id", "h", -1),
+    ("t2mi_pid", "i", -1),
+)
+
+_index = {}
+_stamp = None
+
+# position -> tuple of column bytes, and the tables decoded from it so far
+_transponders = {}
+_transponder_stamp = None
+_tables = {}
+
+
+def _parseSatellites(path):
+    names = {}
+
+    def startElement(tag, attrs):
+        if tag != "sat":
+            return
+        try:
+            pos = int(attrs.get("position", "0"))
+        except ValueError:
+            return
+        # Same as before: the first <sat> with a given position wins
+        if pos not in names:
+            names[pos] = attrs.get("name", "")
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = startElement
+    with open(path, "rb") as f:
+        parser.ParseFile(f)
+    return names
+
+
+def getSatelliteIndex():
+    global _index, _stamp
+    stamp = fileStamp(SATELLITES_XML)
+    if stamp == _stamp:
+        return _index
+    if stamp is None:
+        _index, _stamp = {}, None
+        return _index
+
+    index = loadCache(_CACHE_NAME, stamp, _CACHE_VERSION)
+    if index is None:
+        try:
+            index = _parseSatellites(SATELLITES_XML)
+        except Exception as e:
+            log.error("Cannot parse %s: %s", SATELLITES_XML, e)
+            index = {}
+        else:
+            saveCache(_CACHE_NAME, stamp, _CACHE_VERSION, index)
+    _index, _stamp = index, stamp
+    return _index
+
+
+def getSatelliteName(position):
+    # position uses the satellites.xml convention (-1800..1800, tenths of a degree)
+    return getSatelliteIndex().get(position)
+
+
+class TransponderTable(object):
+    __slots__ = ("keys",) + tuple(name for name, typecode, default in _COLUMNS)
+
+    def __init__(self, columns):
+        for slot, typecode, data in zip(self.__slots__, ("I",) + tuple(typecode for name, typecode, default in _COLUMNS), columns):
+            column = array(typecode)
+            column.frombytes(data)
+            setattr(self, slot, column)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def nearest(self, polarization, frequency, tolerance=MATCH_TOLERANCE):
+        # Index of the closest entry with the same polarization within tolerance, or None
+        keys = self.keys
+        i = bisect_left(keys, (polarization << _FREQUENCY_BITS) | frequency)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(keys) and keys[j] >> _FREQUENCY_BITS == polarization:
+                delta = abs((keys[j] & _FREQUENCY_MASK) - frequency)
+                if delta <= tolerance and (best is None or delta < best[1]):
+                    best = (j, delta)
+        return best[0] if best else None
+
+    def entry(self, index):
+        key = self.keys[index]
+        entry = {"frequency": key & _FREQUENCY_MASK, "polarization": key >> _FREQUENCY_BITS}
+        for name, typecode, default in _COLUMNS:
+            entry[name] = getattr(self, name)[index]
+        return entry
+
+
+def _parseTransponders(path):
+    # -> {position: tuple of column bytes}, rows sorted by (polarization, frequency)
+    rows = {}
+    current = [None]
+
+    def startElement(tag, attrs):
+        if tag == "sat":
+            try:
+                pos = int(attrs.get("position", "0"))
+            except ValueError:
+                pos = None
+            # As for the names, the first <sat> with a given position wins
+            current[0] = None if pos is None or pos in rows else rows.setdefault(pos, [])
+        elif tag == "transponder" and current[0] is not None:
+            try:
+                frequency = int(attrs["frequency"])
+                polarization = int(attrs.get("polarization", "0"))
+                row = [(polarization << _FREQUENCY_BITS) | (frequency & _FREQUENCY_MASK)]
+                for name, typecode, default in _COLUMNS:
+                    row.append(int(attrs.get(name, default)))
+            except (KeyError, ValueError):
+                return
+            current[0].append(row)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = startElement
+    with open(path, "rb") as f:
+        parser.ParseFile(f)
+
+    typecodes = ("I",) + tuple(typecode for name, typecode, default in _COLUMNS)
+    index = {}
+    for pos, entries in rows.items():
+        entries.sort()
+        index[pos] = tuple(array(typecode, column).tobytes() for typecode, column in zip(typecodes, zip(*entries))) if entries else ()
+    return index
+
+
+def getTransponderTable(position):
+    # position in satellites.xml convention; None when the satellite has no transponders
+    global _transponders, _transponder_stamp, _tables
+    stamp = fileStamp(SATELLITES_XML)
+    if stamp != _transponder_stamp:
+        index = None
+        if stamp is not None:
+            index = loadCache(_TRANSPONDER_CACHE_NAME, stamp, _TRANSPONDER_CACHE_VERSION)
+            if index is None:
+                try:
+                    index = _parseTransponders(SATELLITES_XML)
+                except Exception as e:
+                    log.error("Cannot parse transponders from %s: %s", SATELLITES_XML, e)
+                    index = {}
+                else:
+                    saveCache(_TRANSPONDER_CACHE_NAME, stamp, _TRANSPONDER_CACHE_VERSION, index)
+        _transponders, _transponder_stamp, _tables = index or {}, stamp, {}
+    table = _tables.get(position)
+    if table is None:
+        columns = _transponders.get(position)
+        if not columns:
+            return None
+        table = _tables[position] = TransponderTable(columns)
+    return table
+
+
+def matchTransponder(position, polarization, frequency, tolerance=MATCH_TOLERANCE):
+    # Nominal satellites.xml entry closest to a tuned transponder, or None
+    table = getTransponderTable(position)
+    if table is None:
+        return None
+    index = table.nearest(polarization, frequency, tolerance)
+    if index is None:
+        return None
+    return table.entry(index)
@@ -0,0 +1,84 @@
+# Scheduler.py
+# One eTimer driving several refresh tasks, each with its own cadence.
+# Tasks with interval 0 run only when triggered (e.g. on a service change).
+from time import monotonic
+
+from enigma import eTimer
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+
+
+class _Task(object):
+    __slots__ = ("name", "interval", "callback", "due")
+
+    def __init__(self, name, interval, callback):
+        self.name = name
+        self.interval = interval
+        self.callback = callback
+        self.due = None
+
+
+class RefreshScheduler(object):
+    def __init__(self):
+        self.tasks = {}
+        self.running = False
+        self.timer = eTimer()
+        self.timer.callback.append(self.run)
+
+    def add(self, name, interval_ms, callback):
+        self.tasks[name] = _Task(name, interval_ms / 1000.0, callback)
+
+    def setInterval(self, name, interval_ms):
+        task = self.tasks[name]
+        task.interval = interval_ms / 1000.0
+        if self.running:
+            task.due = monotonic() if task.interval else None
+            self.arm()
+
+    def trigger(self, name):
+        self.tasks[name].due = monotonic()
+        if self.running:
+            self.arm(0)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        now = monotonic()
+        for task in self.tasks.values():
+            if task.interval:
+                task.due = now
+        self.run()
+
+    def pause(self):
+        self.running = False
+        self.timer.stop()
+
+    stop = pause
+
+    def run(self):
+        if not self.running:
+            return
+        now = monotonic()
+        try:
+            for task in list(self.tasks.values()):
+                if task.due is not None and task.due <= now:
+                    task.due = now + task.interval if task.interval else None
+                    try:
+                        task.callback()
+                    except Exception as e:
+                        # One failing task must not stop the others: the timer is single-shot
+                        log.error("Refresh task %s failed: %s", task.name, e)
+        finally:
+            # A task may have paused the scheduler (screen closed)
+            if self.running:
+                self.arm()
+
+    def arm(self, delay=None):
+        if delay is None:
+            pending = [task.due for task in self.tasks.values() if task.due is not None]
+            if not pending:
+                self.timer.stop()
+                return
+            delay = max(0, int((min(pending) - monotonic()) * 1000))
+        self.timer.start(delay, True)
@@ -0,0 +1,54 @@
+# Settings.py
+from Components.config import config, ConfigSubsection, ConfigSelection, ConfigYesNo, ConfigInteger
+
+config.plugins.SatelliteAnalyzer = ConfigSubsection()
+# Signal history sampling rate in ms, independent of the text panes
+config.plugins.SatelliteAnalyzer.sample_interval = ConfigSelection(
+    default="250",
+    choices=[("100", "100 ms"), ("250", "250 ms"), ("500", "500 ms"), ("1000", "1 s")],
+)
+# Log level for the enigma2 log; per-tick messages are "debug"
+config.plugins.SatelliteAnalyzer.log_level = ConfigSelection(
+    default="info",
+    choices=[("error", "Error"), ("warning", "Warning"), ("info", "Info"), ("debug", "Debug")],
+)
+# Output format of the bouquet report
+config.plugins.SatelliteAnalyzer.report_format = ConfigSelection(
+    default="csv",
+    choices=[("csv", "CSV"), ("json", "JSON")],
+)
+# Signal degradation (rain fade) monitor: keep sampling after the screen is closed,
+# sample period in seconds, SNR drop (dB) and BER rise (decades) that count as a fade
+config.plugins.SatelliteAnalyzer.fade_monitor = ConfigYesNo(default=False)
+config.plugins.SatelliteAnalyzer.fade_interval = ConfigSelection(
+    default="5",
+    choices=[("2", "2 s"), ("5", "5 s"), ("10", "10 s"), ("30", "30 s")],
+)
+config.plugins.SatelliteAnalyzer.fade_snr_drop = ConfigSelection(
+    default="2",
+    choices=[("1", "1 dB"), ("2", "2 dB"), ("3", "3 dB"), ("5", "5 dB")],
+)
+config.plugins.SatelliteAnalyzer.fade_ber_rise = ConfigSelection(
+    default="1",
+    choices=[("1", "10x"), ("2", "100x"), ("3", "1000x")],
+)
+config.plugins.SatelliteAnalyzer.fade_popup = ConfigYesNo(default=True)
+# Driver queries and file reads on a background thread. Off by default: the
+# snapshot calls enigma2's C++ service and frontend APIs, which are only safe
+# from the GUI thread on most images
+config.plugins.SatelliteAnalyzer.background_io = ConfigYesNo(default=False)
+# HTTP endpoint with /metrics (Prometheus) and /status.json for central monitoring
+config.plugins.SatelliteAnalyzer.metrics_server = ConfigYesNo(default=False)
+config.plugins.SatelliteAnalyzer.metrics_port = ConfigInteger(default=9120, limits=(1024, 65535))
+config.plugins.SatelliteAnalyzer.metrics_interval = ConfigSelection(
+    default="10",
+    choices=[("5", "5 s"), ("10", "10 s"), ("30", "30 s"), ("60", "60 s")],
+)
+# Long-term binary signal log (SignalLog.py), one record per interval
+config.plugins.SatelliteAnalyzer.signal_log = ConfigYesNo(default=False)
+config.plugins.SatelliteAnalyzer.signal_log_interval = ConfigSelection(
+    default="10",
+    choices=[("5", "5 s"), ("10", "10 s"), ("30", "30 s"), ("60", "60 s")],
+)
+
+settings = config.plugins.SatelliteAnalyzer
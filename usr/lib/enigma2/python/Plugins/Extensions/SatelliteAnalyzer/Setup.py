@@ -0,0 +1,56 @@
+# Setup.py
+# Settings screen for config.plugins.SatelliteAnalyzer. The background services
+# (fade monitor, metrics endpoint, signal log) follow their switches right away
+# through the notifiers registered at session start.
+from Components.ActionMap import ActionMap
+from Components.ConfigList import ConfigListScreen
+from Components.config import getConfigListEntry
+from Components.Label import Label
+from Screens.Screen import Screen
+
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+
+# (label, setting name) in display order
+SETUP_ENTRIES = (
+    ("Signal sample interval", "sample_interval"),
+    ("Bouquet report format", "report_format"),
+    ("Read drivers and files in the background", "background_io"),
+    ("Log level", "log_level"),
+    ("Fade monitor (also when the screen is closed)", "fade_monitor"),
+    ("Fade monitor interval", "fade_interval"),
+    ("Fade: SNR drop", "fade_snr_drop"),
+    ("Fade: BER rise", "fade_ber_rise"),
+    ("Fade: show popup", "fade_popup"),
+    ("Metrics endpoint (/metrics, /status.json)", "metrics_server"),
+    ("Metrics port", "metrics_port"),
+    ("Metrics interval", "metrics_interval"),
+    ("Signal log", "signal_log"),
+    ("Signal log interval", "signal_log_interval"),
+)
+
+
+class SatelliteAnalyzerSetup(Screen, ConfigListScreen):
+    skin = """
+    <screen name="SatelliteAnalyzerSetup" position="center,center" size="1000,660" title="Satellite Analyzer setup">
+        <widget name="config" position="20,20" size="960,560" font="Regular;26" itemHeight="40" scrollbarMode="showOnDemand" />
+        <widget name="key_red" position="20,600" size="300,40" backgroundColor="red" font="Regular;24" halign="center" valign="center" />
+        <widget name="key_green" position="340,600" size="300,40" backgroundColor="green" font="Regular;24" halign="center" valign="center" />
+    </screen>
+    """
+
+    def __init__(self, session):
+        Screen.__init__(self, session)
+        self.setTitle("Satellite Analyzer setup")
+        self["key_red"] = Label("Cancel")
+        self["key_green"] = Label("Save")
+        entries = [getConfigListEntry(label, getattr(settings, name)) for label, name in SETUP_ENTRIES]
+        ConfigListScreen.__init__(self, entries, session=session)
+        self["actions"] = ActionMap(["SetupActions", "ColorActions"],
+            {
+                "ok": self.keySave,
+                "save": self.keySave,
+                "green": self.keySave,
+                "cancel": self.keyCancel,
+                "red": self.keyCancel,
+            }, -2)
@@ -0,0 +1,396 @@
+# SiTables.py
+# PSI/SI sections (PAT, PMT, SDT actual, NIT actual) reassembled from TS packets.
+# Complete tables are kept per (table_id, extension, version_number); a section
+# of a version that is already complete is dropped on its 8 header bytes, before
+# the CRC or any parsing, so a stream repeating the same tables costs next to nothing.
+from Plugins.Extensions.SatelliteAnalyzer.TsAnalyzer import TS_PACKET, TS_SYNC
+
+PAT_PID = 0x0000
+NIT_PID = 0x0010
+SDT_PID = 0x0011
+
+PAT = 0x00
+PMT = 0x02
+NIT = 0x40
+SDT = 0x42
+
+STREAM_TYPES = {
+    0x01: "MPEG-1 video",
+    0x02: "MPEG-2 video",
+    0x03: "MPEG-1 audio",
+    0x04: "MPEG-2 audio",
+    0x05: "Private sections",
+    0x06: "Private PES",
+    0x0F: "AAC",
+    0x11: "AAC LATM",
+    0x1B: "H.264",
+    0x24: "HEVC",
+    0x81: "AC-3",
+}
+
+# Descriptors that say what a "Private PES" stream really carries
+_PES_DESCRIPTORS = {0x56: "Teletext", 0x59: "Subtitles", 0x6A: "AC-3", 0x7A: "E-AC-3", 0x7C: "AAC", 0x7F: "Extension"}
+
+# NIT satellite delivery descriptor enumerations (EN 300 468 6.2.13.2)
+_NIT_POLARIZATION = ("H", "V", "L", "R")
+_NIT_MODULATION = ("Auto", "QPSK", "8PSK", "16QAM")
+_NIT_FEC = {1: "1/2", 2: "2/3", 3: "3/4", 4: "5/6", 5: "7/8", 6: "8/9", 7: "3/5", 8: "4/5", 9: "9/10", 15: "None"}
+
+
+def _crcTable():
+    table = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return tuple(table)
+
+
+_CRC_TABLE = _crcTable()
+
+
+def crc32(data, crc=0xFFFFFFFF):
+    # CRC-32/MPEG-2; a section including its CRC_32 field yields 0
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ table[(crc >> 24) ^ byte]
+    return crc
+
+
+def _bcd(data):
+    value = 0
+    for byte in data:
+        value = value * 100 + (byte >> 4) * 10 + (byte & 0x0F)
+    return value
+
+
+def _text(data):
+    # DVB strings: an optional leading byte selects the character table
+    if not data:
+        return ""
+    if data[0] == 0x15:
+        return data[1:].decode("utf-8", "replace")
+    if data[0] == 0x10 and len(data) > 3:
+        try:
+            return data[3:].decode(f"iso8859-{data[2]}")
+        except LookupError:
+            return data[3:].decode("latin-1")
+    if data[0] < 0x20:
+        data = data[1:]
+    return data.decode("latin-1")
+
+
+def iterDescriptors(data):
+    offset = 0
+    end = len(data)
+    while offset + 2 <= end:
+        tag = data[offset]
+        length = data[offset + 1]
+        yield tag, data[offset + 2:offset + 2 + length]
+        offset += 2 + length
+
+
+def _caProviders(caid, private):
+    # Provider IDs a CA descriptor carries in its private bytes, where the layout is known
+    system = caid >> 8
+    if system == 0x05:
+        # Viaccess: TLVs, 0x14 / 0xB4 hold the 3 byte provider ident
+        providers = []
+        for tag, value in iterDescriptors(private):
+            if tag in (0x14, 0xB4) and len(value) >= 3:
+                providers.append((value[0] << 16 | value[1] << 8 | value[2]) & 0xFFFFF0)
+        return tuple(providers)
+    if system == 0x18 and len(private) == 3:
+        return (private[1] << 8 | private[2],)
+    if (system == 0x4A or caid == 0x2710) and private:
+        return (private[0],)
+    return ()
+
+
+def _caDescriptors(descriptors, into):
+    for tag, value in iterDescriptors(descriptors):
+        if tag == 0x09 and len(value) >= 4:
+            caid = value[0] << 8 | value[1]
+            ecm_pid = (value[2] & 0x1F) << 8 | value[3]
+            into.append((caid, ecm_pid, _caProviders(caid, value[4:])))
+
+
+def parsePat(sections):
+    # -> {program_number: PMT PID}; program 0 is the NIT PID
+    programs = {}
+    for section in sections:
+        for offset in range(8, len(section) - 4 - 3, 4):
+            programs[section[offset] << 8 | section[offset + 1]] = (section[offset + 2] & 0x1F) << 8 | section[offset + 3]
+    return programs
+
+
+def parsePmt(sections):
+    # -> (pcr_pid, [(caid, ecm_pid, providers)], [(stream_type, pid, description, language, [(caid, ecm_pid, providers)])])
+    section = sections[0]
+    pcr_pid = (section[8] & 0x1F) << 8 | section[9]
+    program_info = (section[10] & 0x0F) << 8 | section[11]
+    ca = []
+    _caDescriptors(section[12:12 + program_info], ca)
+    streams = []
+    offset = 12 + program_info
+    end = len(section) - 4
+    while offset + 5 <= end:
+        stream_type = section[offset]
+        pid = (section[offset + 1] & 0x1F) << 8 | section[offset + 2]
+        length = (section[offset + 3] & 0x0F) << 8 | section[offset + 4]
+        descriptors = section[offset + 5:offset + 5 + length]
+        description = STREAM_TYPES.get(stream_type, f"Type 0x{stream_type:02X}")
+        language = ""
+        for tag, value in iterDescriptors(descriptors):
+            if tag == 0x0A and len(value) >= 3:
+                language = value[:3].decode("latin-1")
+            elif stream_type == 0x06 and tag in _PES_DESCRIPTORS:
+                description = _PES_DESCRIPTORS[tag]
+        stream_ca = []
+        _caDescriptors(descriptors, stream_ca)
+        streams.append((stream_type, pid, description, language, stream_ca))
+        offset += 5 + length
+    return pcr_pid, ca, streams
+
+
+def parseSdt(sections):
+    # -> (original_network_id, {service_id: (service_type, provider, name)})
+    services = {}
+    onid = sections[0][8] << 8 | sections[0][9]
+    for section in sections:
+        offset = 11
+        end = len(section) - 4
+        while offset + 5 <= end:
+            sid = section[offset] << 8 | section[offset + 1]
+            length = (section[offset + 3] & 0x0F) << 8 | section[offset + 4]
+            for tag, value in iterDescriptors(section[offset + 5:offset + 5 + length]):
+                if tag == 0x48 and len(value) >= 3:
+                    provider_end = 2 + value[1]
+                    name_length = value[provider_end] if provider_end < len(value) else 0
+                    services[sid] = (value[0], _text(value[2:provider_end]),
+                        _text(value[provider_end + 1:provider_end + 1 + name_length]))
+            offset += 5 + length
+    return onid, services
+
+
+def _delivery(tag, value):
+    # Delivery descriptor -> dict named like the frontend transponder data
+    if tag == 0x43 and len(value) >= 11:
+        flags = value[6]
+        orbital = _bcd(value[4:6])
+        return {
+            "tuner_type": "DVB-S",
+            "frequency": _bcd(value[0:4]) * 10,  # 10 kHz -> kHz
+            "orbital_position": orbital if flags & 0x80 else -orbital,
+            "polarization": (flags >> 5) & 3,
+            "system": (flags >> 2) & 1,
+            "modulation": flags & 3,
+            "symbol_rate": _bcd(value[7:10]) * 1000 + (value[10] >> 4) * 100,  # 100 sym/s -> sym/s
+            "fec_inner": value[10] & 0x0F,
+        }
+    if tag == 0x44 and len(value) >= 11:
+        return {
+            "tuner_type": "DVB-C",
+            "frequency": _bcd(value[0:4]) // 10,  # 100 Hz -> kHz
+            "modulation": value[6],
+            "symbol_rate": _bcd(value[7:10]) * 1000 + (value[10] >> 4) * 100,
+            "fec_inner": value[10] & 0x0F,
+        }
+    if tag == 0x5A and len(value) >= 5:
+        return {
+            "tuner_type": "DVB-T",
+            "frequency": (value[0] << 24 | value[1] << 16 | value[2] << 8 | value[3]) // 100,  # 10 Hz -> kHz
+            "bandwidth": (8000000, 7000000, 6000000, 5000000)[value[4] >> 5] if value[4] >> 5 < 4 else 0,
+        }
+    return None
+
+
+def parseNit(sections):
+    # -> (network_name, {(tsid, onid): delivery dict})
+    name = ""
+    transports = {}
+    for section in sections:
+        length = (section[8] & 0x0F) << 8 | section[9]
+        for tag, value in iterDescriptors(section[10:10 + length]):
+            if tag == 0x40:
+                name = _text(value)
+        offset = 10 + length + 2
+        end = len(section) - 4
+        while offset + 6 <= end:
+            tsid = section[offset] << 8 | section[offset + 1]
+            onid = section[offset + 2] << 8 | section[offset + 3]
+            length = (section[offset + 4] & 0x0F) << 8 | section[offset + 5]
+            for tag, value in iterDescriptors(section[offset + 6:offset + 6 + length]):
+                delivery = _delivery(tag, value)
+                if delivery is not None:
+                    transports[(tsid, onid)] = delivery
+            offset += 6 + length
+    return name, transports
+
+
+def formatDelivery(delivery):
+    if delivery.get("tuner_type") == "DVB-S":
+        orbital = delivery["orbital_position"]
+        return "%d MHz %s %s %s %d ks/s FEC %s, %.1f%s" % (
+            delivery["frequency"] // 1000, _NIT_POLARIZATION[delivery["polarization"]],
+            ("DVB-S", "DVB-S2")[delivery["system"]], _NIT_MODULATION[delivery["modulation"]],
+            delivery["symbol_rate"] // 1000, _NIT_FEC.get(delivery["fec_inner"], "Auto"),
+            abs(orbital) / 10.0, "E" if orbital >= 0 else "W")
+    if delivery.get("tuner_type") == "DVB-C":
+        return "%d MHz %d ks/s" % (delivery["frequency"] // 1000, delivery["symbol_rate"] // 1000)
+    return "%d MHz %s" % (delivery["frequency"] // 1000, delivery.get("tuner_type", ""))
+
+
+_PARSERS = {PAT: parsePat, PMT: parsePmt, SDT: parseSdt, NIT: parseNit}
+
+
+class SectionAssembler(object):
+    # Sections of one PID, rebuilt across packet boundaries
+    __slots__ = ("buffer", "cc")
+
+    def __init__(self):
+        self.buffer = None
+        self.cc = -1
+
+    def push(self, packet, sections):
+        b3 = packet[3]
+        if not b3 & 0x10:
+            return
+        cc = b3 & 0x0F
+        if cc == self.cc:
+            return  # duplicate
+        if self.cc >= 0 and cc != (self.cc + 1) & 0x0F:
+            self.buffer = None  # a packet was lost, the partial section is useless
+        self.cc = cc
+        offset = 4
+        if b3 & 0x20:
+            offset += 1 + packet[4]
+        if offset >= TS_PACKET:
+            return
+        if packet[1] & 0x40:
+            pointer = packet[offset]
+            offset += 1
+            if self.buffer is not None:
+                self.buffer += packet[offset:offset + pointer]
+                self._collect(sections)
+            self.buffer = bytearray(packet[offset + pointer:])
+        elif self.buffer is not None:
+            self.buffer += packet[offset:]
+        else:
+            return
+        self._collect(sections)
+
+    def _collect(self, sections):
+        buffer = self.buffer
+        while len(buffer) >= 3:
+            if buffer[0] == 0xFF:
+                self.buffer = None  # stuffing up to the end of the packet
+                return
+            length = ((buffer[1] & 0x0F) << 8 | buffer[2]) + 3
+            if len(buffer) < length:
+                return
+            sections.append(bytes(buffer[:length]))
+            del buffer[:length]
+
+
+class SiTables(object):
+    def __init__(self):
+        self.assemblers = {}
+        # (table_id, extension) -> [version, {section_number: section}, last_section_number]
+        self.pending = {}
+        # (table_id, extension, version) -> parsed table; only the current version is kept
+        self.tables = {}
+        # (table_id, extension) -> version of the complete table
+        self.current = {}
+        self.pmt_pids = {}
+        self.wanted = {PAT_PID, NIT_PID, SDT_PID}
+        self.changed = False
+        self.sections = 0
+        self.skipped = 0
+        self.crc_errors = 0
+
+    def feed(self, data, count):
+        # `count` TS packets from offset 0; only the PSI/SI PIDs are looked at
+        size = count * TS_PACKET
+        wanted = self.wanted
+        assemblers = self.assemblers
+        sections = []
+        for index, (b0, b1, b2) in enumerate(zip(data[0:size:TS_PACKET], data[1:size:TS_PACKET], data[2:size:TS_PACKET])):
+            pid = (b1 & 0x1F) << 8 | b2
+            if pid not in wanted or b0 != TS_SYNC or b1 & 0x80:
+                continue
+            assembler = assemblers.get(pid)
+            if assembler is None:
+                assembler = assemblers[pid] = SectionAssembler()
+            offset = index * TS_PACKET
+            assembler.push(data[offset:offset + TS_PACKET], sections)
+        for section in sections:
+            self.addSection(section)
+
+    def addSection(self, section):
+        table_id = section[0]
+        if table_id not in _PARSERS or len(section) < 12 or not section[1] & 0x80 or not section[5] & 1:
+            return
+        self.sections += 1
+        key = (table_id, section[3] << 8 | section[4])
+        version = (section[5] >> 1) & 0x1F
+        if self.current.get(key) == version:
+            self.skipped += 1
+            return
+        number = section[6]
+        pending = self.pending.get(key)
+        if pending is None or pending[0] != version:
+            pending = self.pending[key] = [version, {}, section[7]]
+        if number in pending[1]:
+            self.skipped += 1
+            return
+        if crc32(section):
+            self.crc_errors += 1
+            return
+        pending[1][number] = section
+        if len(pending[1]) <= pending[2]:
+            return
+        del self.pending[key]
+        table = _PARSERS[table_id]([pending[1][n] for n in sorted(pending[1])])
+        old = self.current.get(key)
+        if old is not None:
+            del self.tables[key + (old,)]
+        self.tables[key + (version,)] = table
+        self.current[key] = version
+        self.changed = True
+        if table_id == PAT:
+            self.pmt_pids = table
+            self.wanted = {PAT_PID, NIT_PID, SDT_PID} | set(table.values())
+
+    def table(self, table_id, extension):
+        version = self.current.get((table_id, extension))
+        return None if version is None else self.tables[(table_id, extension, version)]
+
+    def pmt(self, sid):
+        return self.table(PMT, sid)
+
+    def sdt(self, tsid):
+        return self.table(SDT, tsid)
+
+    def nit(self):
+        # NIT actual; its extension is the network_id, which we don't know up front
+        for (table_id, extension), version in self.current.items():
+            if table_id == NIT:
+                return self.tables[(table_id, extension, version)]
+        return None
+
+    def caEcmPids(self, sid):
+        # {caid: [(ecm_pid, providers)]} from the program and stream level CA descriptors
+        pmt = self.pmt(sid)
+        if pmt is None:
+            return {}
+        result = {}
+        entries = list(pmt[1])
+        for stream in pmt[2]:
+            entries.extend(stream[4])
+        for caid, ecm_pid, providers in entries:
+            pids = result.setdefault(caid, [])
+            if (ecm_pid, providers) not in pids:
+                pids.append((ecm_pid, providers))
+        return result
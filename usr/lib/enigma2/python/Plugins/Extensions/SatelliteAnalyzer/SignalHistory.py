@@ -0,0 +1,142 @@
+# SignalHistory.py
+# Fixed-capacity signal history (SNR dB, SNR %, AGC, BER) with O(1) rolling
+# min/max/mean/stddev over several windows and text sparklines for the screen.
+from array import array
+from collections import deque
+from math import sqrt
+
+CHANNELS = ("snr_db", "snr_percent", "agc", "ber")
+# Rolling windows in seconds
+WINDOWS = (10, 60, 300)
+
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+
+class RingBuffer(object):
+    __slots__ = ("capacity", "data", "seq")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array("f", bytes(4 * capacity))
+        # Number of samples ever appended; seq % capacity is the next slot
+        self.seq = 0
+
+    def __len__(self):
+        return min(self.seq, self.capacity)
+
+    def append(self, value):
+        self.data[self.seq % self.capacity] = value
+        self.seq += 1
+
+    def at(self, seq):
+        return self.data[seq % self.capacity]
+
+    def last(self, n):
+        n = min(n, len(self))
+        start = self.seq - n
+        return [self.data[i % self.capacity] for i in range(start, self.seq)]
+
+
+class RollingWindow(object):
+    __slots__ = ("ring", "size", "total", "total_sq", "mins", "maxs")
+
+    def __init__(self, ring, size):
+        # The ring must still hold the sample that falls out of the window
+        assert ring.capacity > size
+        self.ring = ring
+        self.size = size
+        self.total = 0.0
+        self.total_sq = 0.0
+        # Monotonic deques of sequence numbers, front is the current min/max
+        self.mins = deque()
+        self.maxs = deque()
+
+    def push(self):
+        ring = self.ring
+        seq = ring.seq - 1
+        # Use the stored (float32) value so additions and removals cancel exactly
+        value = ring.at(seq)
+        old = seq - self.size
+        if old >= 0:
+            if seq % self.size == 0:
+                # Re-sum once per window length so rounding drift stays bounded
+                values = ring.last(self.size)
+                self.total = sum(values)
+                self.total_sq = sum(v * v for v in values)
+            else:
+                dropped = ring.at(old)
+                self.total += value - dropped
+                self.total_sq += value * value - dropped * dropped
+        else:
+            self.total += value
+            self.total_sq += value * value
+
+        mins = self.mins
+        while mins and ring.at(mins[-1]) >= value:
+            mins.pop()
+        mins.append(seq)
+        if mins[0] <= old:
+            mins.popleft()
+
+        maxs = self.maxs
+        while maxs and ring.at(maxs[-1]) <= value:
+            maxs.pop()
+        maxs.append(seq)
+        if maxs[0] <= old:
+            maxs.popleft()
+
+    def count(self):
+        return min(self.ring.seq, self.size)
+
+    def stats(self):
+        n = self.count()
+        if not n:
+            return None
+        mean = self.total / n
+        variance = max(0.0, self.total_sq / n - mean * mean)
+        return self.ring.at(self.mins[0]), self.ring.at(self.maxs[0]), mean, sqrt(variance)
+
+
+class SignalHistory(object):
+    def __init__(self, interval_ms=250, windows=WINDOWS):
+        self.interval_ms = interval_ms
+        self.windows = windows
+        sizes = [max(1, seconds * 1000 // interval_ms) for seconds in windows]
+        capacity = max(sizes) + 1
+        self.rings = {}
+        self.rolling = {}
+        for channel in CHANNELS:
+            ring = RingBuffer(capacity)
+            self.rings[channel] = ring
+            self.rolling[channel] = tuple(RollingWindow(ring, size) for size in sizes)
+
+    def __len__(self):
+        return len(self.rings[CHANNELS[0]])
+
+    def add(self, snr_db, snr_percent, agc, ber):
+        for channel, value in zip(CHANNELS, (snr_db, snr_percent, agc, ber)):
+            self.rings[channel].append(value)
+            for window in self.rolling[channel]:
+                window.push()
+
+    def stats(self, channel, window_index):
+        return self.rolling[channel][window_index].stats()
+
+    def sparkline(self, channel, width, lo=None, hi=None):
+        values = self.rings[channel].last(width)
+        if not values:
+            return ""
+        if lo is None:
+            lo = min(values)
+        if hi is None:
+            hi = max(values)
+        span = hi - lo
+        top = len(SPARK_CHARS) - 1
+        if span <= 0:
+            return SPARK_CHARS[top // 2] * len(values)
+        scale = top / span
+        chars = []
+        for value in values:
+            level = int((value - lo) * scale + 0.5)
+            chars.append(SPARK_CHARS[min(top, max(0, level))])
+        return "".join(chars)
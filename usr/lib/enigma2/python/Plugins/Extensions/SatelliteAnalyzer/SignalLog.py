@@ -0,0 +1,262 @@
+# SignalLog.py
+# Long-term signal log on flash: fixed-width binary records (18 bytes each)
+# buffered in memory and appended in large batches, split into size-limited
+# segments with the oldest deleted first. Records within a segment are in time
+# order, so range queries binary-search the memory-mapped file; the CSV export
+# and the NumPy loader are for offline analysis.
+import csv
+import mmap
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from time import localtime, strftime, time
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+from Plugins.Extensions.SatelliteAnalyzer.Sampler import getSampler
+from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SIGNAL_LOG_DIR = "/etc/enigma2/SatelliteAnalyzer/signal"
+# Records kept in memory before one write; an hour at the default 10 s interval
+SIGNAL_LOG_BATCH = 360
+# A segment is closed once a write takes it past this size; 8 are kept, ~54 days at 10 s
+SIGNAL_LOG_SEGMENT = 1024 * 1024
+SIGNAL_LOG_SEGMENTS = 8
+
+# Receivers boot with the clock at 1970/2000 until NTP or the transponder sets it
+MIN_VALID_TIME = 1577836800
+
+# Segment header: magic, format version, record size
+HEADER = struct.Struct("<4sHH")
+MAGIC = b"SASL"
+VERSION = 1
+# timestamp (s), SNR (centi-dB), SNR %, AGC %, BER, ONID, TSID, SID
+RECORD = struct.Struct("<IhBBIHHH")
+FIELDS = ("timestamp", "snr_db", "snr_percent", "agc", "ber", "onid", "tsid", "sid")
+
+if numpy is not None:
+    # Same layout as RECORD; snr_cdb is SNR in 1/100 dB
+    RECORD_DTYPE = numpy.dtype([("timestamp", "<u4"), ("snr_cdb", "<i2"), ("snr_percent", "u1"), ("agc", "u1"),
+        ("ber", "<u4"), ("onid", "<u2"), ("tsid", "<u2"), ("sid", "<u2")])
+
+
+def segmentName(timestamp):
+    # Named after the first record, or one past the newest segment if the clock stepped
+    # back, so segments always list in the order they were written
+    return f"signal-{timestamp:010d}.bin"
+
+
+def segmentStart(path):
+    return int(os.path.basename(path)[7:-4])
+
+
+def listSegments(directory=SIGNAL_LOG_DIR):
+    try:
+        names = sorted(name for name in os.listdir(directory)
+            if name.startswith("signal-") and name.endswith(".bin") and name[7:-4].isdigit())
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+
+class _Timestamps(object):
+    # Sequence view of the record timestamps of a mapped segment, for bisect
+    __slots__ = ("mm", "count")
+
+    def __init__(self, mm, count):
+        self.mm = mm
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        return struct.unpack_from("<I", self.mm, HEADER.size + index * RECORD.size)[0]
+
+
+def readSegment(path, start, end):
+    # -> bytes of the records with start <= timestamp <= end
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            count = (size - HEADER.size) // RECORD.size
+            if count <= 0:
+                return b""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if HEADER.unpack_from(mm) != (MAGIC, VERSION, RECORD.size):
+                    log.warning("Skipping %s: not a signal log segment", path)
+                    return b""
+                timestamps = _Timestamps(mm, count)
+                if timestamps[0] > end or timestamps[count - 1] < start:
+                    return b""
+                first = bisect_left(timestamps, start)
+                last = bisect_right(timestamps, end)
+                return mm[HEADER.size + first * RECORD.size:HEADER.size + last * RECORD.size]
+    except (OSError, ValueError) as e:
+        log.warning("Cannot read %s: %s", path, e)
+        return b""
+
+
+def iterRange(start=0, end=0xFFFFFFFF, directory=SIGNAL_LOG_DIR):
+    # Records as tuples in FIELDS order, SNR in dB
+    for path in listSegments(directory):
+        for record in RECORD.iter_unpack(readSegment(path, start, end)):
+            yield (record[0], record[1] / 100.0) + record[2:]
+
+
+def exportCsv(path, start=0, end=0xFFFFFFFF, directory=SIGNAL_LOG_DIR):
+    count = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(("time",) + FIELDS)
+        for timestamp, snr_db, snr_percent, agc, ber, onid, tsid, sid in iterRange(start, end, directory):
+            writer.writerow((strftime("%Y-%m-%d %H:%M:%S", localtime(timestamp)), timestamp, f"{snr_db:.2f}",
+                snr_percent, agc, ber, f"0x{onid:04X}", f"0x{tsid:04X}", f"0x{sid:04X}"))
+            count += 1
+    return count
+
+
+def loadNumpy(start=0, end=0xFFFFFFFF, directory=SIGNAL_LOG_DIR):
+    # One structured array (RECORD_DTYPE) over all segments, read straight from the record bytes
+    if numpy is None:
+        raise ImportError("NumPy is not installed")
+    chunks = [readSegment(path, start, end) for path in listSegments(directory)]
+    return numpy.frombuffer(b"".join(chunks), dtype=RECORD_DTYPE)
+
+
+class SignalRecorder(object):
+    def __init__(self, directory=SIGNAL_LOG_DIR, batch=SIGNAL_LOG_BATCH, segment_size=SIGNAL_LOG_SEGMENT,
+            segments=SIGNAL_LOG_SEGMENTS):
+        self.directory = directory
+        self.batch = batch
+        self.segment_size = segment_size
+        self.segments = segments
+        self.buffer = bytearray()
+        self.pending = 0
+        self.first = None
+        self.last = 0
+        self.path = None
+        self.written = 0
+
+    def add(self, timestamp, snr_db, snr_percent, agc, ber, onid, tsid, sid):
+        timestamp = int(timestamp)
+        if timestamp < MIN_VALID_TIME:
+            return
+        if timestamp < self.last:
+            # Clock stepped back: what is buffered goes out, the rest starts a new segment
+            self.flush()
+            self.path = None
+        self.buffer += RECORD.pack(timestamp, max(-32768, min(32767, int(round(snr_db * 100)))),
+            min(255, snr_percent), min(255, agc), min(0xFFFFFFFF, ber), onid & 0xFFFF, tsid & 0xFFFF, sid & 0xFFFF)
+        if self.first is None:
+            self.first = timestamp
+        self.last = timestamp
+        self.pending += 1
+        if self.pending >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        try:
+            self.write()
+        except OSError as e:
+            log.error("Cannot write signal log to %s: %s", self.directory, e)
+        self.buffer = bytearray()
+        self.pending = 0
+        self.first = None
+
+    def write(self):
+        if self.path is None:
+            self.path = self.openSegment()
+        with open(self.path, "ab") as f:
+            f.write(self.buffer)
+            size = f.tell()
+        self.written += self.pending
+        if size >= self.segment_size:
+            self.path = None
+
+    def openSegment(self):
+        # The newest segment is continued if it has room and ends before the buffer starts
+        os.makedirs(self.directory, exist_ok=True)
+        existing = listSegments(self.directory)
+        if existing:
+            path = existing[-1]
+            size = os.path.getsize(path)
+            count = (size - HEADER.size) // RECORD.size
+            if count > 0 and size < self.segment_size:
+                with open(path, "r+b") as f:
+                    header = HEADER.unpack(f.read(HEADER.size))
+                    f.seek(HEADER.size + (count - 1) * RECORD.size)
+                    last = RECORD.unpack(f.read(RECORD.size))[0]
+                    if header == (MAGIC, VERSION, RECORD.size) and last <= self.first:
+                        # Drop a record torn by a power cut
+                        f.truncate(HEADER.size + count * RECORD.size)
+                        return path
+        start = self.first
+        if existing:
+            start = max(start, segmentStart(existing[-1]) + 1)
+        path = os.path.join(self.directory, segmentName(start))
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self.prune(existing + [path])
+        return path
+
+    def prune(self, existing):
+        # Oldest names first; the segment just opened is always the last one kept
+        for path in sorted(existing)[:-self.segments]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class SignalLogger(object):
+    # Records a sample of the shared sampler every signal_log_interval seconds
+    def __init__(self, session):
+        self.sampler = getSampler(session.nav)
+        self.recorder = SignalRecorder()
+        self.running = False
+        settings.signal_log_interval.addNotifier(self.configure, initial_call=False)
+
+    def configure(self, configElement=None):
+        if self.running:
+            self.start()
+
+    def start(self):
+        self.sampler.subscribe(self.sample, int(settings.signal_log_interval.value) * 1000)
+        self.running = True
+
+    def stop(self):
+        self.sampler.unsubscribe(self.sample)
+        self.running = False
+        self.recorder.flush()
+
+    def sample(self, sample):
+        ref = sample.ref
+        if sample.signal is None or not ref:
+            return
+        snr_db, snr_percent, agc, ber = sample.signal
+        self.recorder.add(time(), snr_db, snr_percent, agc, ber,
+            ref.getUnsignedData(3), ref.getUnsignedData(2), ref.getUnsignedData(1))
+
+
+_logger = None
+
+
+def startLogger(session):
+    global _logger
+    if _logger is None:
+        _logger = SignalLogger(session)
+    _logger.start()
+    return _logger
+
+
+def stopLogger():
+    # Also called at shutdown, so the last batch reaches the flash
+    if _logger is not None:
+        _logger.stop()
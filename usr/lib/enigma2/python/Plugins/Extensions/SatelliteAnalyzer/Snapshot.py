@@ -0,0 +1,152 @@
+# Snapshot.py
+# One immutable record per refresh cycle with everything the renderers need
+# from the current service and its frontend, so the driver is asked only once per tick.
+from types import MappingProxyType
+
+from time import perf_counter
+
+from enigma import iServiceInformation
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log, profiler
+
+_EMPTY = MappingProxyType({})
+
+
+class ServiceSnapshot(object):
+    __slots__ = (
+        "has_service", "has_info", "name", "provider", "frontend",
+        "sid", "tsid", "onid", "namespace", "vpid", "apid", "pcrpid", "pmtpid", "txtpid",
+        "caids", "is_crypted", "driver_calls",
+    )
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, fields.get(slot, _DEFAULTS[slot]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ServiceSnapshot is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("ServiceSnapshot is read-only")
+
+
+_DEFAULTS = {
+    "has_service": False,
+    "has_info": False,
+    "name": "N/A",
+    "provider": "N/A",
+    "frontend": _EMPTY,
+    "sid": -1,
+    "tsid": -1,
+    "onid": -1,
+    "namespace": 0,
+    "vpid": -1,
+    "apid": -1,
+    "pcrpid": -1,
+    "pmtpid": -1,
+    "txtpid": -1,
+    "caids": (),
+    "is_crypted": 0,
+    "driver_calls": 0,
+}
+
+_INT_INFO = (
+    ("sid", iServiceInformation.sSID),
+    ("tsid", iServiceInformation.sTSID),
+    ("onid", iServiceInformation.sONID),
+    ("namespace", iServiceInformation.sNamespace),
+    ("vpid", iServiceInformation.sVideoPID),
+    ("apid", iServiceInformation.sAudioPID),
+    ("pcrpid", iServiceInformation.sPCRPID),
+    ("pmtpid", iServiceInformation.sPMTPID),
+    ("txtpid", iServiceInformation.sTXTPID),
+    ("is_crypted", iServiceInformation.sIsCrypted),
+)
+
+
+def takeSnapshot(session):
+    start = perf_counter()
+    calls = 1
+    service = session.nav.getCurrentService()
+    profiler.record("service", start)
+    if not service:
+        return ServiceSnapshot(driver_calls=calls)
+
+    fields = {"has_service": True}
+
+    start = perf_counter()
+    frontendInfo = service.frontendInfo()
+    calls += 1
+    if frontendInfo:
+        try:
+            frontend = frontendInfo.getAll(True)
+        except Exception as e:
+            log.warning("Cannot read frontend data: %s", e)
+            frontend = None
+        calls += 1
+        if frontend:
+            fields["frontend"] = MappingProxyType(frontend)
+    profiler.record("frontend", start)
+
+    start = perf_counter()
+    info = service.info()
+    calls += 1
+    if info:
+        fields["has_info"] = True
+        try:
+            fields["name"] = info.getName() or "N/A"
+        except:
+            pass
+        calls += 1
+        try:
+            fields["provider"] = info.getInfoString(iServiceInformation.sProvider) or "N/A"
+        except:
+            pass
+        calls += 1
+        for key, what in _INT_INFO:
+            try:
+                fields[key] = info.getInfo(what)
+            except:
+                pass
+            calls += 1
+        try:
+            fields["caids"] = tuple(info.getInfoObject(iServiceInformation.sCAIDs) or ())
+        except:
+            pass
+        calls += 1
+    profiler.record("service", start)
+
+    fields["driver_calls"] = calls
+    return ServiceSnapshot(**fields)
+
+
+def readStatus(session):
+    # Raw frontend status dict of the playing service, or None; one driver call
+    return serviceStatus(session.nav.getCurrentService())
+
+
+def serviceStatus(service):
+    frontendInfo = service and service.frontendInfo()
+    if not frontendInfo:
+        return None
+    try:
+        return frontendInfo.getFrontendStatus() or None
+    except Exception:
+        return None
+
+
+def signalFromStatus(status):
+    # -> (snr_db, snr_percent, agc, ber)
+    snr_db = status.get("tuner_signal_quality_db", 0) / 100.0
+    snr_percent = min(100, status.get("tuner_signal_quality", 0) // 655)
+    agc = min(100, status.get("tuner_signal_power", 0) // 655)
+    ber = status.get("tuner_bit_error_rate", 0)
+    return snr_db, snr_percent, agc, ber
+
+
+def readSignal(session):
+    # Status-only read for high-rate sampling: (snr_db, snr_percent, agc, ber) or None
+    status = readStatus(session)
+    if status is None:
+        return None
+    return signalFromStatus(status)
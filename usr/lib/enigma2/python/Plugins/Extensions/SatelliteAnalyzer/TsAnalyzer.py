@@ -0,0 +1,366 @@
+# TsAnalyzer.py
+# Transport stream header analysis: per-PID packet counts and bitrate,
+# continuity counter errors, TEI and scrambling flags, PCR interval and jitter.
+# Packets come in batches from a memory-mapped recording or from the live demux;
+# with NumPy a batch is decoded column-wise in a few array operations, without
+# it the header bytes are still sliced out in C and only the counting loops.
+import fcntl
+import mmap
+import os
+import platform
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TS_PACKET = 188
+TS_SYNC = 0x47
+NULL_PID = 0x1FFF
+PID_COUNT = 0x2000
+
+# Packets per batch, ~1.5 MB
+BATCH_PACKETS = 8192
+
+PCR_CLOCK = 27000000
+PCR_WRAP = (1 << 33) * 300
+# A PCR step larger than this is a discontinuity (zap, file splice), not an interval
+PCR_MAX_STEP = PCR_CLOCK
+# ETSI TR 101 290 PCR repetition limit (s)
+PCR_MAX_INTERVAL = 0.04
+
+# Demux kernel buffer for the live tap; a full second of a 60 Mbit/s mux is ~7.5 MB,
+# filtered to one service it's well under this
+LIVE_BUFFER = 2 * 1024 * 1024
+
+# linux/dvb/dmx.h
+DMX_IN_FRONTEND = 0
+DMX_OUT_TSDEMUX_TAP = 3
+DMX_PES_OTHER = 20
+DMX_IMMEDIATE_START = 4
+
+
+def _ioc(direction, nr, size):
+    # MIPS boxes use a different ioctl number layout than ARM/x86
+    if platform.machine().startswith("mips"):
+        return ({"none": 1, "write": 4}[direction] << 29) | (size << 16) | (ord("o") << 8) | nr
+    return ({"none": 0, "write": 1}[direction] << 30) | (size << 16) | (ord("o") << 8) | nr
+
+
+_PES_FILTER = struct.Struct("HiiiI")  # dmx_pes_filter_params
+DMX_STOP = _ioc("none", 42, 0)
+DMX_SET_PES_FILTER = _ioc("write", 44, _PES_FILTER.size)
+DMX_SET_BUFFER_SIZE = _ioc("none", 45, 0)
+DMX_ADD_PID = _ioc("write", 51, 2)
+
+
+def findSync(data, start=0):
+    # Offset of the first packet start confirmed by two more sync bytes, or -1
+    end = len(data) - 2 * TS_PACKET
+    offset = data.find(b"\x47", start)
+    while 0 <= offset < end:
+        if data[offset + TS_PACKET] == TS_SYNC and data[offset + 2 * TS_PACKET] == TS_SYNC:
+            return offset
+        offset = data.find(b"\x47", offset + 1)
+    return -1
+
+
+def alignedPackets(data, offset, count):
+    # How many of `count` packets from offset stay aligned. A lone bad sync byte is
+    # kept (the analyzer counts it), two in a row mean the stream shifted there
+    syncs = data[offset:offset + count * TS_PACKET:TS_PACKET]
+    # Never look past the end of the data
+    count = min(count, len(syncs))
+    if syncs.count(TS_SYNC) == count:
+        return count
+    for index in range(1, count):
+        if syncs[index] != TS_SYNC and (index + 1 == count or syncs[index + 1] != TS_SYNC):
+            return index
+    return count
+
+
+def _decodePcr(b6, b7, b8, b9, b10, b11):
+    base = (b6 << 25) | (b7 << 17) | (b8 << 9) | (b9 << 1) | (b10 >> 7)
+    return base * 300 + (((b10 & 1) << 8) | b11)
+
+
+class TsAnalyzer(object):
+    def __init__(self, vectorized=True):
+        self.vectorized = vectorized and numpy is not None
+        self.pcr_pid = None
+        self.reset()
+
+    def reset(self):
+        if self.vectorized:
+            self.packets = numpy.zeros(PID_COUNT, numpy.int64)
+            self.cc_errors = numpy.zeros(PID_COUNT, numpy.int64)
+            self.tei = numpy.zeros(PID_COUNT, numpy.int64)
+            self.scrambled = numpy.zeros(PID_COUNT, numpy.int64)
+            self.last_cc = numpy.full(PID_COUNT, -1, numpy.int16)
+        else:
+            self.packets = [0] * PID_COUNT
+            self.cc_errors = [0] * PID_COUNT
+            self.tei = [0] * PID_COUNT
+            self.scrambled = [0] * PID_COUNT
+            self.last_cc = [-1] * PID_COUNT
+        self.total = 0
+        self.sync_errors = 0
+        # PCR bookkeeping on the reference PID only
+        self.pcr_last = None  # (packet position, pcr)
+        self.pcr_count = 0
+        self.pcr_discontinuities = 0
+        self.span_ticks = 0
+        self.span_packets = 0
+        self.pcr_interval = 0.0
+        self.pcr_jitter = 0.0
+        # Wall clock seconds, used for the bitrate when there is no PCR
+        self.elapsed = 0.0
+
+    def feed(self, data, count):
+        # data holds `count` packets starting at offset 0
+        if count <= 0:
+            return
+        if self.vectorized:
+            self._feedVectorized(data, count)
+        else:
+            self._feedPython(data, count)
+
+    def _feedVectorized(self, data, count):
+        np = numpy
+        packets = np.frombuffer(data, np.uint8, count * TS_PACKET).reshape(count, TS_PACKET)
+        base = self.total
+        self.total += count
+        positions = None
+        good = packets[:, 0] == TS_SYNC
+        if not good.all():
+            positions = np.flatnonzero(good)
+            self.sync_errors += count - len(positions)
+            packets = packets[positions]
+
+        b1 = packets[:, 1]
+        b3 = packets[:, 3]
+        pid = ((b1 & 0x1F).astype(np.intp) << 8) | packets[:, 2]
+        self.packets += np.bincount(pid, minlength=PID_COUNT)
+        self.tei += np.bincount(pid[b1 >= 0x80], minlength=PID_COUNT)
+        self.scrambled += np.bincount(pid[b3 >= 0x40], minlength=PID_COUNT)
+
+        adaptation = ((b3 & 0x20) != 0) & (packets[:, 4] > 0)
+        flags = packets[:, 5]
+
+        # Continuity: group payload packets by PID (stable, so stream order is kept
+        # inside a group) and compare each counter with its predecessor
+        selected = np.flatnonzero(((b3 & 0x10) != 0) & (pid != NULL_PID))
+        if len(selected):
+            order = selected[np.argsort(pid[selected], kind="stable")]
+            p = pid[order]
+            cc = (b3[order] & 0x0F).astype(np.int16)
+            discontinuity = adaptation[order] & ((flags[order] & 0x80) != 0)
+            first = np.ones(len(p), bool)
+            first[1:] = p[1:] != p[:-1]
+            previous = np.empty(len(p), np.int16)
+            previous[1:] = cc[:-1]
+            previous[first] = self.last_cc[p[first]]
+            step = (cc - previous) & 0x0F
+            bad = (previous >= 0) & (step > 1) & ~discontinuity
+            self.cc_errors += np.bincount(p[bad], minlength=PID_COUNT)
+            last = np.ones(len(p), bool)
+            last[:-1] = first[1:]
+            self.last_cc[p[last]] = cc[last]
+
+        rows = np.flatnonzero(adaptation & (packets[:, 4] >= 7) & ((flags & 0x10) != 0))
+        if len(rows):
+            fields = packets[rows, 6:12].tolist()
+            rows_at = positions[rows] if positions is not None else rows
+            self._addPcrs(zip((rows_at + base).tolist(), pid[rows].tolist(), (_decodePcr(*f) for f in fields)))
+
+    def _feedPython(self, data, count):
+        size = count * TS_PACKET
+        if len(data) != size:
+            data = bytes(data[:size])
+        packets = self.packets
+        tei = self.tei
+        scrambled = self.scrambled
+        cc_errors = self.cc_errors
+        last_cc = self.last_cc
+        base = self.total
+        self.total += count
+        syncs = data[0:size:TS_PACKET]
+        sync_ok = syncs.count(TS_SYNC) == count
+        if not sync_ok:
+            self.sync_errors += count - syncs.count(TS_SYNC)
+        pcrs = []
+        # Header columns are extracted in C, the loop only counts
+        for index, (b1, b2, b3) in enumerate(zip(data[1:size:TS_PACKET], data[2:size:TS_PACKET], data[3:size:TS_PACKET])):
+            if not sync_ok and syncs[index] != TS_SYNC:
+                continue
+            pid = (b1 & 0x1F) << 8 | b2
+            packets[pid] += 1
+            if b1 & 0x80:
+                tei[pid] += 1
+            if b3 & 0xC0:
+                scrambled[pid] += 1
+            discontinuity = False
+            if b3 & 0x20:
+                offset = index * TS_PACKET
+                length = data[offset + 4]
+                if length:
+                    flags = data[offset + 5]
+                    discontinuity = flags & 0x80
+                    if flags & 0x10 and length >= 7:
+                        pcrs.append((base + index, pid, _decodePcr(*data[offset + 6:offset + 12])))
+            if b3 & 0x10 and pid != NULL_PID:
+                cc = b3 & 0x0F
+                previous = last_cc[pid]
+                if previous >= 0 and not discontinuity and (cc - previous) & 0x0F > 1:
+                    cc_errors[pid] += 1
+                last_cc[pid] = cc
+        if pcrs:
+            self._addPcrs(pcrs)
+
+    def _addPcrs(self, pcrs):
+        # pcrs: (packet position, pid, pcr) in stream order; a few dozen per batch
+        for position, pid, pcr in pcrs:
+            if self.pcr_pid is None:
+                self.pcr_pid = pid
+            elif pid != self.pcr_pid:
+                continue
+            self.pcr_count += 1
+            last = self.pcr_last
+            self.pcr_last = (position, pcr)
+            if last is None:
+                continue
+            packets = position - last[0]
+            ticks = (pcr - last[1]) % PCR_WRAP
+            if ticks > PCR_MAX_STEP or packets <= 0:
+                self.pcr_discontinuities += 1
+                continue
+            interval = ticks / PCR_CLOCK
+            if interval > self.pcr_interval:
+                self.pcr_interval = interval
+            # Deviation from the average rate so far; PCR accuracy on a
+            # constant-rate mux, an upper bound on a filtered (VBR) stream
+            if self.span_packets:
+                jitter = abs(ticks - packets * self.span_ticks / self.span_packets) / PCR_CLOCK
+                if jitter > self.pcr_jitter:
+                    self.pcr_jitter = jitter
+            self.span_ticks += ticks
+            self.span_packets += packets
+
+    @property
+    def duration(self):
+        if self.span_ticks:
+            return self.span_ticks / PCR_CLOCK * self.total / self.span_packets
+        return self.elapsed
+
+    def bitrate(self, pid=None):
+        # bit/s for one PID or the whole stream
+        duration = self.duration
+        if not duration:
+            return 0.0
+        packets = self.total if pid is None else int(self.packets[pid])
+        return packets * TS_PACKET * 8 / duration
+
+    def pidStats(self, pid):
+        # (packets, bit/s, CC errors, TEI, scrambled)
+        return (int(self.packets[pid]), self.bitrate(pid), int(self.cc_errors[pid]),
+            int(self.tei[pid]), int(self.scrambled[pid]))
+
+    def pids(self):
+        # PIDs seen so far, busiest first
+        if self.vectorized:
+            seen = numpy.flatnonzero(self.packets).tolist()
+        else:
+            seen = [pid for pid, count in enumerate(self.packets) if count]
+        return sorted(seen, key=lambda pid: -self.packets[pid])
+
+
+class TsFileSource(object):
+    # Packets of a recording, read through mmap in BATCH_PACKETS slices
+    def __init__(self, path):
+        self.name = os.path.basename(path)
+        self.file = open(path, "rb")
+        self.mm = None
+        self.offset = -1
+        self.resyncs = 0
+        if os.fstat(self.file.fileno()).st_size:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.offset = findSync(self.mm)
+
+    def read(self, max_packets=BATCH_PACKETS):
+        # -> (bytes, packet count), None at the end of the file
+        mm = self.mm
+        if mm is None or self.offset < 0 or self.offset + TS_PACKET > len(mm):
+            return None
+        # One packet of look-ahead, if the file has one left
+        lookahead = min(2, (len(mm) - self.offset) // TS_PACKET)
+        if mm[self.offset] != TS_SYNC and alignedPackets(mm, self.offset, lookahead) < lookahead:
+            # Lost sync (stray bytes in the recording), look for the next packet start
+            self.resyncs += 1
+            self.offset = findSync(mm, self.offset)
+            if self.offset < 0:
+                return None
+        count = min(max_packets, (len(mm) - self.offset) // TS_PACKET)
+        if count <= 0:
+            return None
+        count = alignedPackets(mm, self.offset, count)
+        start = self.offset
+        self.offset += count * TS_PACKET
+        return mm[start:self.offset], count
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        self.file.close()
+
+
+class TsLiveSource(object):
+    # The service's PIDs tapped from the demux the service is decoded on
+    def __init__(self, demux, pids, adapter=0):
+        self.name = f"demux{demux}"
+        self.pending = b""
+        self.overflows = 0
+        self.resyncs = 0
+        self.fd = os.open(f"/dev/dvb/adapter{adapter}/demux{demux}", os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(self.fd, DMX_SET_BUFFER_SIZE, LIVE_BUFFER)
+            fcntl.ioctl(self.fd, DMX_SET_PES_FILTER, _PES_FILTER.pack(
+                pids[0], DMX_IN_FRONTEND, DMX_OUT_TSDEMUX_TAP, DMX_PES_OTHER, DMX_IMMEDIATE_START))
+            for pid in pids[1:]:
+                fcntl.ioctl(self.fd, DMX_ADD_PID, struct.pack("H", pid))
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def read(self, max_packets=BATCH_PACKETS):
+        # -> (bytes, packet count) of what is buffered, None when nothing is
+        try:
+            data = os.read(self.fd, max_packets * TS_PACKET)
+        except BlockingIOError:
+            return None
+        except OSError:
+            # EOVERFLOW: the kernel buffer filled up between two reads
+            self.overflows += 1
+            return None
+        data = self.pending + data
+        offset = 0
+        if data[:1] != b"\x47":
+            self.resyncs += 1
+            offset = findSync(data)
+            if offset < 0:
+                self.pending = data[-2 * TS_PACKET:]
+                return None
+        count = alignedPackets(data, offset, (len(data) - offset) // TS_PACKET)
+        end = offset + count * TS_PACKET
+        self.pending = data[end:]
+        return data[offset:end], count
+
+    def close(self):
+        if self.fd is not None:
+            try:
+                fcntl.ioctl(self.fd, DMX_STOP)
+            except OSError:
+                pass
+            os.close(self.fd)
+            self.fd = None
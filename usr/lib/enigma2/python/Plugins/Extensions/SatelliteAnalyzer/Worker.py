@@ -0,0 +1,92 @@
+# Worker.py
+# Blocking reads (driver queries, satellites.xml/lamedb, ecm.info) run on one
+# background thread. Each job has a single-slot mailbox: a newer result replaces
+# an unread one, so the GUI thread only ever swaps in the latest.
+import threading
+
+from Plugins.Extensions.SatelliteAnalyzer.Debug import log
+
+
+class Mailbox(object):
+    __slots__ = ("lock", "slots", "dropped")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slots = {}
+        # Results replaced before the GUI thread picked them up
+        self.dropped = 0
+
+    def put(self, name, result):
+        with self.lock:
+            if name in self.slots:
+                self.dropped += 1
+            self.slots[name] = result
+
+    def take(self):
+        # -> {job name: newest result}, emptied
+        with self.lock:
+            slots, self.slots = self.slots, {}
+        return slots
+
+
+class Worker(object):
+    def __init__(self, name="SatelliteAnalyzer"):
+        self.name = name
+        self.mailbox = Mailbox()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        # job name -> callable; a job submitted again before it ran is only run once
+        self.jobs = {}
+        # Jobs submitted whose result is not in the mailbox yet
+        self.queued = 0
+        self.thread = None
+        # Bumped by stop(); a thread (and its job) from an older generation no longer counts
+        self.generation = 0
+
+    def submit(self, name, job):
+        with self.lock:
+            if name not in self.jobs:
+                self.queued += 1
+            self.jobs[name] = job
+            if self.thread is None:
+                self.wakeup = threading.Event()
+                self.thread = threading.Thread(target=self.run, args=(self.generation, self.wakeup), name=self.name)
+                self.thread.daemon = True
+                self.thread.start()
+            self.wakeup.set()
+
+    def run(self, generation, wakeup):
+        while True:
+            wakeup.wait()
+            wakeup.clear()
+            with self.lock:
+                if generation != self.generation:
+                    return
+                jobs, self.jobs = self.jobs, {}
+            for name, job in jobs.items():
+                try:
+                    result = job()
+                except Exception as e:
+                    log.error("Background job %s failed: %s", name, e)
+                    result = None
+                with self.lock:
+                    if generation != self.generation:
+                        # Stopped while the job ran: the result and the count belong to nobody
+                        return
+                    self.mailbox.put(name, result)
+                    self.queued -= 1
+
+    @property
+    def idle(self):
+        # Check before taking the mailbox: once idle, every result is already in it
+        return self.queued == 0
+
+    def stop(self):
+        # Not joined: a read stuck on slow flash must not hold up the GUI, the
+        # thread exits after it and its result is never taken
+        with self.lock:
+            self.generation += 1
+            self.jobs.clear()
+            self.queued = 0
+            self.thread = None
+            self.wakeup.set()
@@ -1,19 +1,83 @@
 # plugin.py
+import sys
+
 from Plugins.Plugin import PluginDescriptor
-from Screens.MessageBox import MessageBox
-from Plugins.Extensions.SatelliteAnalyzer.SatelliteAnalyzer import SatelliteAnalyzer
 
 
 PLUGIN_VERSION = "1.0"
 
 def main(session, **kwargs):
+    # Ekran (i njegovi XML/ECM podsistemi) se ucitava tek kad ga korisnik otvori,
+    # a ne pri svakom skeniranju pluginova tokom starta enigma2
+    from Plugins.Extensions.SatelliteAnalyzer.SatelliteAnalyzer import SatelliteAnalyzer
     session.open(SatelliteAnalyzer)
 
+def setup(session, **kwargs):
+    from Plugins.Extensions.SatelliteAnalyzer.Setup import SatelliteAnalyzerSetup
+    session.open(SatelliteAnalyzerSetup)
+
+def sessionstart(reason, session=None, **kwargs):
+    # Pozadinski servisi (monitor slabljenja, metrics endpoint, log signala) ucitavaju se samo ako su ukljuceni
+    if reason != 0 or session is None:
+        return
+    from Plugins.Extensions.SatelliteAnalyzer.Settings import settings
+
+    def fadeMonitorChanged(configElement):
+        from Plugins.Extensions.SatelliteAnalyzer.FadeDetector import startMonitor, stopMonitor
+        if configElement.value:
+            startMonitor(session)
+        else:
+            stopMonitor()
+
+    def metricsServerChanged(configElement):
+        from Plugins.Extensions.SatelliteAnalyzer.Metrics import startMetrics, stopMetrics
+        if configElement.value:
+            startMetrics(session)
+        else:
+            stopMetrics()
+
+    def signalLogChanged(configElement):
+        from Plugins.Extensions.SatelliteAnalyzer.SignalLog import startLogger, stopLogger
+        if configElement.value:
+            startLogger(session)
+        else:
+            stopLogger()
+
+    for element, notifier in ((settings.fade_monitor, fadeMonitorChanged), (settings.metrics_server, metricsServerChanged),
+            (settings.signal_log, signalLogChanged)):
+        if element.value:
+            notifier(element)
+        element.addNotifier(notifier, initial_call=False)
+
+def autostart(reason, **kwargs):
+    # Pri gasenju upisuje poslednju seriju zapisa signala, ako je log uopste ucitan
+    if reason == 1:
+        signal_log = sys.modules.get("Plugins.Extensions.SatelliteAnalyzer.SignalLog")
+        if signal_log is not None:
+            signal_log.stopLogger()
+
 def Plugins(**kwargs):
-    return PluginDescriptor(
-        name="SatelliteAnalyzer",
-        description=f"Show all information about the current channel (Version {PLUGIN_VERSION})",
-        where=PluginDescriptor.WHERE_PLUGINMENU,
-        icon="satellite.png",
-        fnc=main,
-    )
\ No newline at end of file
+    return [
+        PluginDescriptor(
+            name="SatelliteAnalyzer",
+            description=f"Show all information about the current channel (Version {PLUGIN_VERSION})",
+            where=PluginDescriptor.WHERE_PLUGINMENU,
+            icon="satellite.png",
+            fnc=main,
+        ),
+        PluginDescriptor(
+            name="SatelliteAnalyzer setup",
+            description="Fade monitor, metrics endpoint, signal log and other settings",
+            where=PluginDescriptor.WHERE_PLUGINMENU,
+            icon="satellite.png",
+            fnc=setup,
+        ),
+        PluginDescriptor(
+            where=PluginDescriptor.WHERE_SESSIONSTART,
+            fnc=sessionstart,
+        ),
+        PluginDescriptor(
+            where=PluginDescriptor.WHERE_AUTOSTART,
+            fnc=autostart,
+        ),
+    ]